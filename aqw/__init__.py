@@ -0,0 +1,6 @@
+# aqw/__init__.py
+from .client import AQWClient, aqw_client
+from .charpage import CharPage, extract_ccid, extract_name, parse_char_page
+from .inventory import InventoryIndex
+
+__all__ = ["AQWClient", "aqw_client", "CharPage", "extract_ccid", "extract_name", "parse_char_page", "InventoryIndex"]
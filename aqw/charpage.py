@@ -0,0 +1,117 @@
+# aqw/charpage.py
+"""
+Parser for account.aq.com CharPage HTML.
+
+Only the character card is parsed: a SoupStrainer restricts BeautifulSoup to
+the <div class="card"> subtree, and everything before the card's opening tag
+(head, navigation) is not even tokenized. The CCID and the character name
+are read with regexes over the raw HTML and never need the tree at all.
+"""
+import html as html_lib
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup, SoupStrainer
+
+CCID_PATTERN = re.compile(r"var\s+ccid\s*=\s*(\d+)")
+NAME_PATTERN = re.compile(
+    r"""<div\s[^>]*class=["'](?:[^"']*\s)?card-header[\s"'][^>]*>\s*<h1[^>]*>(.*?)</h1>""", re.S
+)
+CARD_START = re.compile(r"""<div\s[^>]*class=["'](?:[^"']*\s)?card[\s"']""")
+# Matched against the raw class attribute, which may list other classes too
+CARD_STRAINER = SoupStrainer("div", class_=re.compile(r"(?:^|\s)card(?:\s|$)"))
+EQUIPMENT_CLASS = "d-flex flex-rows flex-wrap justify-content-around"
+
+
+@dataclass
+class CharPage:
+    """Data extracted from one CharPage."""
+
+    name: Optional[str] = None
+    ccid: Optional[int] = None
+    # "Label: value" lines of the profile block, in page order
+    details: Dict[str, str] = field(default_factory=dict)
+    # Names of the equipped items shown on the page
+    equipped: List[str] = field(default_factory=list)
+    # Card body text when there is no profile (disabled, AFK, locked...)
+    status: str = ""
+
+    @property
+    def found(self) -> bool:
+        """Whether the page shows a character profile."""
+        return bool(self.details)
+
+
+def extract_ccid(html: str) -> Optional[int]:
+    """
+    Reads the character ID from the CharPage's inline script.
+
+    Args:
+        html (str): Raw CharPage HTML.
+
+    Returns:
+        Optional[int]: The CCID, or None if the page has none.
+    """
+    match = CCID_PATTERN.search(html)
+    return int(match.group(1)) if match else None
+
+
+def extract_name(html: str) -> Optional[str]:
+    """
+    Reads the character name from the card header, without parsing the page.
+
+    Args:
+        html (str): Raw CharPage HTML.
+
+    Returns:
+        Optional[str]: The name as AQ displays it, or None if the page has no
+            card header. Pages without a character ("Not Found!") still have
+            one, so check extract_ccid first.
+    """
+    match = NAME_PATTERN.search(html)
+    if not match:
+        return None
+    return html_lib.unescape(match.group(1)).strip() or None
+
+
+def parse_char_page(html: str) -> CharPage:
+    """
+    Parses a CharPage.
+
+    Args:
+        html (str): Raw CharPage HTML.
+
+    Returns:
+        CharPage: Extracted data. Fields are empty when the page has no
+            character card.
+    """
+    page = CharPage(ccid=extract_ccid(html))
+    start = CARD_START.search(html)
+    soup = BeautifulSoup(html[start.start() if start else 0:], "html.parser", parse_only=CARD_STRAINER)
+
+    name_tag = soup.select_one(".card-header h1")
+    if name_tag:
+        page.name = name_tag.get_text().strip()
+
+    details = soup.select_one(".card-body .row")
+    if details:
+        for line in details.get_text().strip().split("\n"):
+            if ":" not in line:
+                continue
+            key, value = map(str.strip, line.split(":", 1))
+            if value:
+                page.details[key] = value
+
+    if not page.details:
+        body = soup.select_one(".card-body")
+        page.status = body.get_text().strip() if body else ""
+        return page
+
+    equipment = soup.find("div", class_=EQUIPMENT_CLASS)
+    if equipment:
+        for slot in equipment.find_all("div", style="line-height: 85%"):
+            for link in slot.find_all("a"):
+                item_name = link.get_text(strip=True)
+                if item_name:
+                    page.equipped.append(item_name)
+    return page
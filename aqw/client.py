@@ -0,0 +1,388 @@
+# aqw/client.py
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+from urllib.parse import quote_plus, urlsplit
+import aiohttp
+from cache import TTLCache
+from ratelimit import PriorityRateLimiter
+from .inventory import InventoryIndex
+import config
+
+ACCOUNT_URL = "https://account.aq.com"
+GAME_URL = "https://game.aq.com"
+
+# Statuses worth retrying: throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Asks AQ (and any proxy in between) for a freshly rendered page
+NO_CACHE_HEADERS = {"Cache-Control": "no-cache", "Pragma": "no-cache"}
+
+
+class AQWClient:
+    """
+    Shared HTTP client for account.aq.com and game.aq.com.
+
+    A single aiohttp session keeps one keep-alive connection pool with DNS
+    caching for every cog. Requests have a total timeout, transient failures
+    are retried with exponential backoff and full jitter, and each host has
+    its own concurrency cap on top of the pool's.
+
+    Inventory and badge lookups are cached per CCID. Entries younger than
+    cache_ttl are served directly; older ones, up to cache_stale_ttl, are
+    served stale while a background refresh fetches the new version.
+
+    Concurrent requests for the same URL are coalesced: the first caller
+    starts the request and later callers await that same result.
+
+    Requests to account.aq.com go through a priority token bucket. Commands
+    use the "interactive" lane; cache refreshes and sweeps use "background"
+    and only get the tokens interactive callers leave over.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10,
+        retries: int = 3,
+        pool_size: int = 32,
+        per_host_limit: int = 8,
+        dns_ttl: int = 300,
+        backoff: float = 0.5,
+        cache_size: int = 512,
+        cache_ttl: float = 120,
+        cache_stale_ttl: float = 600,
+        rate_limit: float = 5,
+        rate_burst: int = 10,
+        account_url: str = ACCOUNT_URL,
+        game_url: str = GAME_URL
+    ):
+        """
+        Configures the client. The session is created on first use, inside
+        the running event loop.
+
+        Args:
+            timeout (float): Total seconds allowed per attempt.
+            retries (int): Extra attempts after the first one fails.
+            pool_size (int): Maximum open connections overall.
+            per_host_limit (int): Maximum concurrent requests per host.
+            dns_ttl (int): Seconds DNS results are cached.
+            backoff (float): Base delay for the exponential backoff.
+            cache_size (int): Maximum cached inventory/badge responses.
+            cache_ttl (float): Seconds a cached response is served as fresh.
+            cache_stale_ttl (float): Seconds after cache_ttl during which a
+                stale response is still served while it is refreshed.
+            rate_limit (float): Requests per second allowed to account.aq.com,
+                or 0 to disable the limiter.
+            rate_burst (int): Requests allowed back to back after idling.
+            account_url (str): Base URL for CharPage lookups. Point it and
+                game_url at aqw.fake_server to run without the live site.
+            game_url (str): Base URL for the game API.
+        """
+        self.account_url = account_url.rstrip("/")
+        self.game_url = game_url.rstrip("/")
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.pool_size = pool_size
+        self.per_host_limit = per_host_limit
+        self.dns_ttl = dns_ttl
+        self.backoff = backoff
+        self.logger = logging.getLogger(__name__)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.cache_ttl = cache_ttl
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl + cache_stale_ttl)
+        self._refreshing: Set[Hashable] = set()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.requests_sent = 0
+        self.requests_coalesced = 0
+        self.limiter = PriorityRateLimiter(rate_limit, rate_burst) if rate_limit > 0 else None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.per_host_limit,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={"User-Agent": "UltraHub Discord Bot"}
+            )
+        return self._session
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).hostname or ""
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    async def request(
+        self,
+        url: str,
+        as_json: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        lane: str = "interactive"
+    ) -> Any:
+        """
+        GETs url and returns its body. Joins an identical request already in
+        flight in the same lane instead of sending a new one.
+
+        Args:
+            url (str): Absolute URL.
+            as_json (bool): Decode the body as JSON instead of returning text.
+            headers (Optional[Dict[str, str]]): Extra request headers.
+            lane (str): Rate limiter lane, "interactive" or "background".
+
+        Returns:
+            Any: Response text, or the decoded JSON.
+
+        Raises:
+            aiohttp.ClientError: The request failed after every retry, or
+                returned a non-retryable error status.
+            asyncio.TimeoutError: The last attempt timed out.
+        """
+        # Per lane: an interactive caller must never wait on a background
+        # request queued behind the rate limiter
+        key = (url, as_json, tuple(sorted(headers.items())) if headers else None, lane)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._send(url, as_json, headers, lane))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._request_done(key, done))
+            self.requests_sent += 1
+        else:
+            self.requests_coalesced += 1
+        # A cancelled caller must not cancel the request for everyone else
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: Hashable, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        # Mark the error as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _send(self, url: str, as_json: bool, headers: Optional[Dict[str, str]], lane: str) -> Any:
+        session = self._get_session()
+        limited = self.limiter is not None and urlsplit(url).netloc == urlsplit(self.account_url).netloc
+        for attempt in range(self.retries + 1):
+            if limited:
+                await self.limiter.acquire(lane)
+            try:
+                async with self._host_limit(url):
+                    async with session.get(url, headers=headers) as resp:
+                        if resp.status in RETRY_STATUSES and attempt < self.retries:
+                            raise aiohttp.ClientResponseError(
+                                resp.request_info, resp.history, status=resp.status
+                            )
+                        resp.raise_for_status()
+                        if as_json:
+                            # AQ serves some JSON endpoints as text/html
+                            return await resp.json(content_type=None)
+                        return await resp.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRY_STATUSES
+                if not retryable or attempt == self.retries:
+                    raise
+                delay = random.uniform(0, self.backoff * 2 ** attempt)
+                self.logger.warning(f"Retrying {url} in {delay:.2f}s after {type(e).__name__}: {e}")
+                await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns request, coalescing and cache counters.
+
+        Returns:
+            Dict[str, Any]: requests_sent, requests_coalesced, in_flight, the
+                cache stats under "cache" and the per-lane rate limiter stats
+                under "lanes" (empty when the limiter is disabled).
+        """
+        return {
+            "requests_sent": self.requests_sent,
+            "requests_coalesced": self.requests_coalesced,
+            "in_flight": len(self._inflight),
+            "cache": self.cache.stats(),
+            "lanes": self.limiter.stats() if self.limiter else {},
+        }
+
+    async def get_text(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        lane: str = "interactive"
+    ) -> str:
+        """
+        GETs url and returns the body as text.
+
+        Args:
+            url (str): Absolute URL.
+            headers (Optional[Dict[str, str]]): Extra request headers.
+            lane (str): Rate limiter lane.
+        """
+        return await self.request(url, headers=headers, lane=lane)
+
+    async def get_json(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        lane: str = "interactive"
+    ) -> Any:
+        """
+        GETs url and returns the decoded JSON body.
+
+        Args:
+            url (str): Absolute URL.
+            headers (Optional[Dict[str, str]]): Extra request headers.
+            lane (str): Rate limiter lane.
+        """
+        return await self.request(url, as_json=True, headers=headers, lane=lane)
+
+    async def cached(
+        self,
+        key: Hashable,
+        fetch: Callable[[str], Awaitable[Any]],
+        fresh: bool = False,
+        lane: str = "interactive"
+    ) -> Any:
+        """
+        Returns the cached value for key, fetching it on a miss.
+
+        Args:
+            key (Hashable): Cache key.
+            fetch (Callable[[str], Awaitable[Any]]): Fetches the current
+                value; receives the rate limiter lane to use.
+            fresh (bool): Skip the cache and fetch now. The result still
+                replaces the cached value.
+            lane (str): Rate limiter lane for a fetch on a miss. Stale
+                refreshes always run in the background lane.
+        """
+        entry = None if fresh else self.cache.get_entry(key)
+        if entry is None:
+            value = await fetch(lane)
+            self.cache.set(key, value)
+            return value
+
+        value, age = entry
+        if age > self.cache_ttl and key not in self._refreshing:
+            self._refreshing.add(key)
+            task = asyncio.create_task(self._refresh(key, fetch))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+        return value
+
+    async def _refresh(self, key: Hashable, fetch: Callable[[str], Awaitable[Any]]):
+        try:
+            self.cache.set(key, await fetch("background"))
+        except Exception as e:
+            self.logger.warning(f"Background refresh of {key} failed: {type(e).__name__}: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    # ==========================================================
+    # ===================== AQW ENDPOINTS ======================
+    # ==========================================================
+
+    def char_page_url(self, identifier) -> str:
+        """
+        Returns the CharPage URL for a nickname or CCID.
+
+        Args:
+            identifier: Character nickname or CCID.
+        """
+        return f"{self.account_url}/CharPage?id={quote_plus(str(identifier).strip())}"
+
+    def inventory_url(self, ccid) -> str:
+        """
+        Returns the CharPage inventory endpoint for a CCID.
+
+        Args:
+            ccid: Character ID.
+        """
+        return f"{self.account_url}/CharPage/Inventory?ccid={ccid}"
+
+    def badges_url(self, ccid) -> str:
+        """
+        Returns the CharPage badges endpoint for a CCID.
+
+        Args:
+            ccid: Character ID.
+        """
+        return f"{self.account_url}/CharPage/Badges?ccid={ccid}"
+
+    async def char_page(self, identifier, fresh: bool = False, lane: str = "interactive") -> str:
+        """
+        Fetches the CharPage HTML for a nickname or CCID.
+
+        Args:
+            identifier: Character nickname or CCID.
+            fresh (bool): Ask AQ for an uncached page, e.g. right after the
+                player changed their equipment.
+            lane (str): Rate limiter lane.
+        """
+        headers = NO_CACHE_HEADERS if fresh else None
+        return await self.get_text(self.char_page_url(identifier), headers=headers, lane=lane)
+
+    async def inventory(self, ccid, fresh: bool = False, lane: str = "interactive") -> InventoryIndex:
+        """
+        Fetches a character's inventory, served from the CCID cache when possible.
+
+        Args:
+            ccid: Character ID.
+            fresh (bool): Bypass the cache and don't join a regular request
+                already in flight, e.g. right after the player changed items.
+            lane (str): Rate limiter lane.
+
+        Returns:
+            InventoryIndex: The items as returned by AQ (strName, strType,
+                intCount...), indexed once per fetch.
+        """
+        url = self.inventory_url(ccid)
+        # Fresh fetches get their own in-flight key, like char_page(fresh=True)
+        headers = NO_CACHE_HEADERS if fresh else None
+
+        async def fetch(lane: str) -> InventoryIndex:
+            return InventoryIndex(await self.get_json(url, headers=headers, lane=lane))
+
+        return await self.cached(("inventory", int(ccid)), fetch, fresh, lane)
+
+    async def badges(self, ccid, fresh: bool = False, lane: str = "interactive") -> List[Dict]:
+        """
+        Fetches a character's badges, served from the CCID cache when possible.
+
+        Args:
+            ccid: Character ID.
+            fresh (bool): Bypass the cache and don't join a regular request
+                already in flight.
+            lane (str): Rate limiter lane.
+
+        Returns:
+            List[Dict]: Badges as returned by AQ (badgeID, sTitle...).
+        """
+        url = self.badges_url(ccid)
+        headers = NO_CACHE_HEADERS if fresh else None
+        return await self.cached(
+            ("badges", int(ccid)), lambda lane: self.get_json(url, headers=headers, lane=lane), fresh, lane
+        )
+
+    async def servers(self) -> List[Dict]:
+        """
+        Fetches the game server list.
+
+        Returns:
+            List[Dict]: Servers as returned by AQ (sName, iCount, iMax, bOnline...).
+        """
+        return await self.get_json(f"{self.game_url}/game/api/data/servers")
+
+    async def close(self):
+        """
+        Closes the shared session and its connection pool.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+# Shared client used by every cog
+aqw_client = AQWClient(**config.AQW_HTTP)
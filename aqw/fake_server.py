@@ -0,0 +1,202 @@
+# aqw/fake_server.py
+"""
+Local stand-in for account.aq.com and game.aq.com.
+
+Serves recorded CharPage HTML, Inventory/Badges JSON and the server list from
+benchmarks/fixtures, with optional latency and injected 503s, so the AQW cogs
+and AQWClient can be exercised without the live site.
+
+In-process (tests, benchmarks):
+    async with FakeAQWServer(latency=0.05) as server:
+        client = AQWClient(account_url=server.url, game_url=server.url)
+
+Standalone, for running the bot against it (set AQW_ACCOUNT_URL and
+AQW_GAME_URL in settings.yaml to the printed URL):
+    python -m aqw.fake_server [--port 8080] [--latency 0.1] [--jitter 0.05] [--error-rate 0.05]
+"""
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional
+from aiohttp import web
+from .charpage import parse_char_page
+
+FIXTURES = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+
+
+class FakeAQWServer:
+    """
+    aiohttp application mimicking the AQW endpoints the bot uses.
+
+    CharPages are looked up by character name (case-insensitive) or CCID,
+    both read from the fixtures themselves; unknown characters get
+    charpage/not_found.html. Inventory and badges come from
+    inventory/<ccid>.json and badges/<ccid>.json, or an empty list.
+    """
+
+    def __init__(
+        self,
+        fixtures: Path = FIXTURES,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Loads the fixtures. The server starts on start() or when entering
+        the async context.
+
+        Args:
+            fixtures (Path): Directory with charpage/, inventory/, badges/
+                and servers.json.
+            host (str): Interface to bind.
+            port (int): Port to bind; 0 picks a free one.
+            latency (float): Seconds added to every response.
+            jitter (float): Up to this many extra seconds, chosen at random
+                per request.
+            error_rate (float): Fraction of requests answered with a 503.
+            seed (Optional[int]): Seed for jitter and error injection, for
+                reproducible runs.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        # Requests received per path, including injected errors
+        self.hits: Counter = Counter()
+        self.errors = 0
+        self._runner: Optional[web.AppRunner] = None
+
+        self.pages: Dict[str, str] = {}
+        for path in sorted((fixtures / "charpage").glob("*.html")):
+            html = path.read_text(encoding="utf-8")
+            page = parse_char_page(html)
+            if page.found:
+                self.pages[page.name.lower()] = html
+                if page.ccid:
+                    self.pages[str(page.ccid)] = html
+            elif page.name:
+                # Locked/disabled pages still carry the character's name
+                self.pages[page.name.lower()] = html
+        not_found = fixtures / "charpage" / "not_found.html"
+        self.not_found = not_found.read_text(encoding="utf-8") if not_found.exists() else "<html></html>"
+
+        self.inventories = self._load_json_dir(fixtures / "inventory")
+        self.badges = self._load_json_dir(fixtures / "badges")
+        servers = fixtures / "servers.json"
+        self.servers = json.loads(servers.read_text(encoding="utf-8")) if servers.exists() else []
+
+    @staticmethod
+    def _load_json_dir(directory: Path) -> Dict[str, Any]:
+        return {path.stem: json.loads(path.read_text(encoding="utf-8")) for path in directory.glob("*.json")}
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    def build_app(self) -> web.Application:
+        """
+        Returns the aiohttp application with the AQW routes.
+        """
+        app = web.Application(middlewares=[self._conditions])
+        app.router.add_get("/CharPage", self.handle_char_page)
+        app.router.add_get("/CharPage/Inventory", self.handle_inventory)
+        app.router.add_get("/CharPage/Badges", self.handle_badges)
+        app.router.add_get("/game/api/data/servers", self.handle_servers)
+        return app
+
+    @web.middleware
+    async def _conditions(self, request: web.Request, handler):
+        self.hits[request.path] += 1
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            raise web.HTTPServiceUnavailable()
+        return await handler(request)
+
+    async def handle_char_page(self, request: web.Request) -> web.Response:
+        identifier = request.query.get("id", "").strip().lower()
+        html = self.pages.get(identifier, self.not_found)
+        return web.Response(text=html, content_type="text/html")
+
+    async def handle_inventory(self, request: web.Request) -> web.Response:
+        return web.json_response(self.inventories.get(request.query.get("ccid", ""), []))
+
+    async def handle_badges(self, request: web.Request) -> web.Response:
+        return web.json_response(self.badges.get(request.query.get("ccid", ""), []))
+
+    async def handle_servers(self, request: web.Request) -> web.Response:
+        return web.json_response(self.servers)
+
+    async def start(self) -> str:
+        """
+        Starts serving.
+
+        Returns:
+            str: Base URL of the server.
+        """
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Resolve the port picked by the OS when port=0
+        self.port = self._runner.addresses[0][1]
+        return self.url
+
+    async def stop(self):
+        """
+        Stops serving and releases the port.
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeAQWServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+
+async def serve(server: FakeAQWServer):
+    """Runs server until interrupted."""
+    async with server:
+        print(f"Fake AQW server on {server.url} "
+              f"({len(server.pages)} CharPage keys, {len(server.inventories)} inventories)")
+        await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES)
+    args = parser.parse_args()
+
+    server = FakeAQWServer(
+        fixtures=args.fixtures, host=args.host, port=args.port, latency=args.latency,
+        jitter=args.jitter, error_rate=args.error_rate, seed=args.seed
+    )
+    try:
+        asyncio.run(serve(server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
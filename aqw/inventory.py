@@ -0,0 +1,145 @@
+# aqw/inventory.py
+"""
+Precomputed views over a CharPage inventory for requirement checks.
+
+Requirement checks ask "how many items contain this text?" for several
+names at once. InventoryIndex answers all of them in a single pass over the
+distinct item names, using an Aho-Corasick automaton built from the
+requested names, instead of one scan of the inventory per requirement.
+"""
+from collections import defaultdict, deque
+from typing import Any, Dict, Iterable, Iterator, List, Set
+
+
+class SubstringMatcher:
+    """Aho-Corasick automaton over a fixed set of lowercase patterns."""
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Builds the automaton.
+
+        Args:
+            patterns (Iterable[str]): Substrings to look for. Matching is
+                case-insensitive.
+        """
+        self.patterns: List[str] = list(dict.fromkeys(p.lower() for p in patterns))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        # The empty pattern is a substring of everything
+        self._always = [i for i, p in enumerate(self.patterns) if not p]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = nxt
+            if pattern:
+                self._output[state].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def search(self, text: str) -> Set[int]:
+        """
+        Returns the indexes (into self.patterns) of every pattern found in text.
+
+        Args:
+            text (str): Text to scan, already lowercased.
+        """
+        found = set(self._always)
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                found.update(self._output[state])
+        return found
+
+
+class InventoryIndex:
+    """
+    Inventory as returned by CharPage/Inventory, indexed for lookups.
+
+    Iterating over the index yields the raw item dicts, so it can be used
+    anywhere the plain list was.
+    """
+
+    def __init__(self, inventory: List[Dict[str, Any]]):
+        """
+        Indexes an inventory.
+
+        Args:
+            inventory (List[Dict[str, Any]]): Items with strName, strType
+                and intCount. Anything other than a list is treated as empty.
+        """
+        self.items: List[Dict[str, Any]] = inventory if isinstance(inventory, list) else []
+        # Lowercased name -> total quantity across stacks
+        self.counts: Dict[str, int] = defaultdict(int)
+        # Lowercased type -> lowercased names of that type
+        self.types: Dict[str, Set[str]] = defaultdict(set)
+
+        for item in self.items:
+            name = item.get("strName", "").lower()
+            self.counts[name] += int(item.get("intCount", 1) or 0)
+            self.types[item.get("strType", "").lower()].add(name)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def classes(self) -> Set[str]:
+        """Lowercased names of every class in the inventory."""
+        return self.types.get("class", set())
+
+    def class_names(self) -> List[str]:
+        """Original names of every class in the inventory, in inventory order."""
+        return [item["strName"] for item in self.items if item.get("strType", "").lower() == "class"]
+
+    def count(self, name: str) -> int:
+        """
+        Returns the quantity of the item with exactly this name (case-insensitive).
+
+        Args:
+            name (str): Item name.
+        """
+        return self.counts.get(name.lower(), 0)
+
+    def count_matching(self, patterns: Iterable[str]) -> Dict[str, int]:
+        """
+        Sums the quantity of every item whose name contains each pattern.
+
+        All patterns are matched in a single pass over the distinct names.
+
+        Args:
+            patterns (Iterable[str]): Substrings to look for (case-insensitive).
+
+        Returns:
+            Dict[str, int]: Total quantity per pattern, as given; 0 when absent.
+        """
+        patterns = list(patterns)
+        matcher = SubstringMatcher(patterns)
+        totals = [0] * len(matcher.patterns)
+        for name, quantity in self.counts.items():
+            for index in matcher.search(name):
+                totals[index] += quantity
+        by_pattern = dict(zip(matcher.patterns, totals))
+        return {pattern: by_pattern[pattern.lower()] for pattern in patterns}
@@ -0,0 +1,128 @@
+# benchmarks/bench_aqw_client.py
+"""
+Load-tests AQWClient against the local fake AQW server.
+
+Each scenario fires --requests lookups with --concurrency in flight, the way
+the cogs issue them:
+    char       /char: CharPage fetch + parse
+    verificar  /verificar: fresh inventory and CharPage together
+    insignia   /insignia: inventory and badges, then requirement counts
+    raid       raid class check: inventory classes
+
+Every scenario gets a fresh client, so cache and coalescing numbers are per
+scenario. Injected errors exercise the retry path.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_aqw_client [--requests 200] [--concurrency 50]
+        [--latency 0.05] [--jitter 0.05] [--error-rate 0.02] [--rate-limit 0]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from aqw import AQWClient, parse_char_page
+from aqw.fake_server import FakeAQWServer
+
+CHARACTER = "Artix Tester"
+CCID = 12345678
+REQUIREMENTS = ["Treasure Potion", "Token of Digital Awesomeness", "Legion"]
+
+
+async def char(client: AQWClient):
+    return parse_char_page(await client.char_page(CHARACTER))
+
+
+async def verificar(client: AQWClient):
+    inventory, html = await asyncio.gather(client.inventory(CCID, fresh=True), client.char_page(CCID, fresh=True))
+    return inventory.classes, parse_char_page(html).equipped
+
+
+async def insignia(client: AQWClient):
+    inventory, badges = await asyncio.gather(client.inventory(CCID), client.badges(CCID))
+    return inventory.count_matching(REQUIREMENTS), {badge["badgeID"] for badge in badges}
+
+
+async def raid(client: AQWClient):
+    return (await client.inventory(CCID)).class_names()
+
+
+SCENARIOS = {"char": char, "verificar": verificar, "insignia": insignia, "raid": raid}
+
+
+async def run_scenario(name: str, server: FakeAQWServer, args) -> dict:
+    """Runs one scenario and returns its timings and client counters."""
+    client = AQWClient(
+        account_url=server.url, game_url=server.url, backoff=0.05,
+        rate_limit=args.rate_limit, rate_burst=args.rate_burst
+    )
+    server.hits.clear()
+    server.errors = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await SCENARIOS[name](client)
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    stats = client.stats()
+    await client.close()
+
+    latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "failures": failures,
+        "sent": stats["requests_sent"],
+        "coalesced": stats["requests_coalesced"],
+        "server_hits": sum(server.hits.values()),
+        "injected": server.errors,
+    }
+
+
+async def run(args):
+    async with FakeAQWServer(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed
+    ) as server:
+        print(f"{args.requests} lookups per scenario, {args.concurrency} concurrent, "
+              f"latency {args.latency}s+{args.jitter}s, error rate {args.error_rate:.0%}")
+        print(f"{'scenario':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'sent':>6} "
+              f"{'coalesced':>10} {'hits':>6} {'503s':>5} {'failed':>7}")
+        for name in args.scenarios:
+            r = await run_scenario(name, server, args)
+            print(f"{name:<10} {args.requests / r['elapsed']:>8.1f} {r['p50']:>8.1f} {r['p95']:>8.1f} "
+                  f"{r['sent']:>6} {r['coalesced']:>10} {r['server_hits']:>6} {r['injected']:>5} "
+                  f"{r['failures']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--rate-limit", type=float, default=0,
+                        help="requests/s to the fake account host; 0 disables the limiter")
+    parser.add_argument("--rate-burst", type=int, default=10)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    # Injected 503s would otherwise print one retry warning each
+    logging.getLogger("aqw.client").setLevel(logging.ERROR)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
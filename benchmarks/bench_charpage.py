@@ -0,0 +1,80 @@
+# benchmarks/bench_charpage.py
+"""
+Compares CharPage parsing before and after aqw.charpage.
+
+"legacy" is what the cogs did before: a full html.parser parse of the page,
+then CSS selects for the profile and a regex over every <script> for the
+CCID. "parser" is aqw.charpage.parse_char_page; "ccid only" compares the
+old full parse used by /vincular with the regex fast path.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_charpage [--rounds 200] [--fixtures DIR]
+"""
+import argparse
+import re
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from aqw.charpage import extract_ccid, parse_char_page
+
+FIXTURES = Path(__file__).parent / "fixtures" / "charpage"
+
+
+def legacy_parse(html: str) -> dict:
+    """Previous behaviour of AQChar.char: parse everything, then select."""
+    soup = BeautifulSoup(html, "html.parser")
+    name_tag = soup.select_one(".card-header h1")
+    details = soup.select_one(".card-body .row")
+    ccid = None
+    for script in soup.find_all("script"):
+        match = re.search(r"var ccid = (\d+)", script.string or "")
+        if match:
+            ccid = match.group(1)
+            break
+    return {"name": name_tag.text.strip() if name_tag else None, "details": details, "ccid": ccid}
+
+
+def legacy_ccid(html: str):
+    """Previous behaviour of /vincular: full parse to read one script."""
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup.find_all("script"):
+        match = re.search(r"var ccid = (\d+)", script.string or "")
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def time_per_page(func, html: str, rounds: int) -> float:
+    """Returns the mean milliseconds func takes on html."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(html)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES)
+    args = parser.parse_args()
+
+    pages = sorted(args.fixtures.glob("*.html"))
+    if not pages:
+        parser.error(f"no .html fixtures in {args.fixtures}")
+
+    print(f"{'fixture':<16} {'KB':>5} {'legacy ms':>10} {'parser ms':>10} {'speedup':>8} "
+          f"{'ccid legacy ms':>15} {'ccid regex ms':>14}")
+    for page in pages:
+        html = page.read_text(encoding="utf-8")
+        legacy = time_per_page(legacy_parse, html, args.rounds)
+        fast = time_per_page(parse_char_page, html, args.rounds)
+        ccid_legacy = time_per_page(legacy_ccid, html, args.rounds)
+        ccid_fast = time_per_page(extract_ccid, html, args.rounds)
+        print(f"{page.stem:<16} {len(html) / 1024:>5.1f} {legacy:>10.3f} {fast:>10.3f} "
+              f"{legacy / fast:>7.1f}x {ccid_legacy:>15.3f} {ccid_fast:>14.4f}")
+
+
+if __name__ == "__main__":
+    main()
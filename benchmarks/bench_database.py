@@ -0,0 +1,142 @@
+# benchmarks/bench_database.py
+"""
+Compares DatabaseHandler throughput before and after the connection tuning.
+
+"legacy" opens a fresh, untuned connection for every call (the previous
+behaviour); "tuned" uses the persistent per-thread connection configured by
+config.DB_TUNING.
+
+get_user is timed twice: with the user cache invalidated before every call,
+so each lookup reaches the connection, and again with every user cached.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_database [--users 2000]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import config
+from database import DatabaseHandler
+
+
+class FakeDiscordUser:
+    """Minimal stand-in for discord.Member with the fields add_user reads."""
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.bot = False
+        self.mention = f"<@{user_id}>"
+        self.display_name = f"user{user_id}"
+        self.created_at = datetime.now(timezone.utc)
+
+    def __str__(self):
+        return f"user{self.id}"
+
+
+class LegacyDatabaseHandler(DatabaseHandler):
+    """Previous behaviour: a new untuned connection on every call."""
+
+    _legacy_conn = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # Every handler method uses a single connection and the benchmark
+        # makes one call at a time, so the previous call's one can be closed
+        if self._legacy_conn is not None:
+            self._legacy_conn.close()
+        self._legacy_conn = sqlite3.connect(self.db_path)
+        self._legacy_conn.row_factory = sqlite3.Row
+        return self._legacy_conn
+
+    def close(self):
+        if self._legacy_conn is not None:
+            self._legacy_conn.close()
+            self._legacy_conn = None
+        super().close()
+
+
+def run(handler: DatabaseHandler, users: int) -> dict:
+    """Times add_user and get_user over `users` distinct members, then closes handler."""
+    members = [FakeDiscordUser(10_000 + i) for i in range(users)]
+
+    start = time.perf_counter()
+    for member in members:
+        handler.add_user(member)
+    add_elapsed = time.perf_counter() - start
+
+    # The invalidation is part of the timing, but costs far less than a query
+    start = time.perf_counter()
+    for member in members:
+        handler.user_cache.invalidate(member.id)
+        handler.get_user(member.id)
+    get_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for member in members:
+        handler.get_user(member.id)
+    cached_elapsed = time.perf_counter() - start
+
+    handler.close()
+    return {
+        "add_user": users / add_elapsed,
+        "get_user": users / get_elapsed,
+        "get_user (cached)": users / cached_elapsed,
+    }
+
+
+def bench_sync(members: int) -> dict:
+    """Times bulk_upsert_users for a first sync and an unchanged re-sync."""
+    handler = DatabaseHandler("sync.db", config.DB_TUNING)
+    guild = [FakeDiscordUser(1_000_000 + i) for i in range(members)]
+    timings = {}
+
+    start = time.perf_counter()
+    handler.bulk_upsert_users(guild, only_changed=True)
+    timings["first sync (inserts)"] = time.perf_counter() - start
+
+    for member in guild[::100]:
+        member.display_name += " (renamed)"
+    start = time.perf_counter()
+    handler.bulk_upsert_users(guild, only_changed=True)
+    timings["re-sync (1% changed)"] = time.perf_counter() - start
+    handler.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--sync-members", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        results = {
+            "legacy": run(LegacyDatabaseHandler("legacy.db"), args.users),
+            "tuned": run(DatabaseHandler("tuned.db", config.DB_TUNING), args.users),
+        }
+        sync_timings = bench_sync(args.sync_members)
+
+    print(f"{'operation':<18} {'legacy ops/s':>14} {'tuned ops/s':>14} {'speedup':>8}")
+    for op in ("add_user", "get_user"):
+        legacy, tuned = results["legacy"][op], results["tuned"][op]
+        print(f"{op:<18} {legacy:>14,.0f} {tuned:>14,.0f} {tuned / legacy:>7.1f}x")
+
+    # Both handlers share the user cache, so a cache hit is only compared to a miss
+    print()
+    print(f"{'get_user':<18} {'uncached ops/s':>14} {'cached ops/s':>14} {'speedup':>8}")
+    for name, ops in results.items():
+        uncached, cached = ops["get_user"], ops["get_user (cached)"]
+        print(f"{name:<18} {uncached:>14,.0f} {cached:>14,.0f} {cached / uncached:>7.1f}x")
+
+    print()
+    print(f"{'sync':<24} {'members':>8} {'seconds':>8}")
+    for label, seconds in sync_timings.items():
+        print(f"{label:<24} {args.sync_members:>8} {seconds:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after a fixed TTL."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 300):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of entries. The least recently used
+                entry is evicted once the cap is reached.
+            ttl (Optional[float]): Seconds an entry stays valid, or None to
+                keep entries until they are evicted or invalidated.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the cached value for key, or default on a miss.
+
+        Args:
+            key (Hashable): Cache key.
+            default (Any): Value returned when the key is missing or expired.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._expired(entry):
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        Returns the cached value for key together with its age.
+
+        Args:
+            key (Hashable): Cache key.
+
+        Returns:
+            Optional[Tuple[Any, float]]: (value, seconds since it was stored),
+                or None on a miss.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._expired(entry):
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0], time.monotonic() - entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Stores value under key, evicting the least recently used entry if the
+        cache is full.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to store.
+        """
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """
+        Removes key from the cache if present.
+
+        Args:
+            key (Hashable): Cache key.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def sweep(self) -> int:
+        """
+        Removes every expired entry. Lookups only drop the expired entry they
+        hit, so caches with many one-off keys should be swept periodically.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            expired = [key for key, entry in self._data.items() if self._expired(entry)]
+            for key in expired:
+                del self._data[key]
+            self.expirations += len(expired)
+            return len(expired)
+
+    def clear(self):
+        """
+        Removes every entry. Counters are kept.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss counters and the current size.
+
+        Returns:
+            Dict[str, Any]: hits, misses, evictions, expirations, hit_rate,
+                size and maxsize.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def _expired(self, entry: tuple) -> bool:
+        return self.ttl is not None and time.monotonic() - entry[1] > self.ttl
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry)
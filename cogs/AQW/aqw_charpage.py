@@ -1,28 +1,15 @@
 import discord
 from discord.ext import commands
-from bs4 import BeautifulSoup
-import aiohttp
-import re
+from aqw import aqw_client
+from database import async_db
+from aqw.charpage import CharPage, parse_char_page
 
 class AQChar(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    async def fetch_html(self, session, url):
-        async with session.get(url) as resp:
-            return BeautifulSoup(await resp.text(), 'html.parser')
-
-    async def fetch_json(self, session, url):
-        async with session.get(url) as resp:
-            return await resp.json()
-
-    def extract_ccid(self, scripts):
-        script_texts = [s.string for s in scripts if s and s.string]
-        for script in script_texts:
-            match = re.search(r"var ccid = (\d+)", script)
-            if match:
-                return match.group(1)
-        return "????"
+    async def fetch_html(self, url) -> CharPage:
+        return parse_char_page(await aqw_client.get_text(url))
 
     def parse_status_warning(self, bodyinfo):
         status_map = {
@@ -39,12 +26,7 @@ class AQChar(commands.Cog):
     def build_char_info(self, details):
         char_infos = {}
         excluded = ["Level", "Faction", "Guild"]
-        for line in details.text.strip().split("\n"):
-            if ":" not in line:
-                continue
-            key, value = map(str.strip, line.split(":", 1))
-            if not value:
-                continue
+        for key, value in details.items():
             if key in excluded:
                 char_infos[key] = value
             else:
@@ -72,46 +54,44 @@ class AQChar(commands.Cog):
     async def char(self, ctx: discord.ApplicationContext, character_name: discord.Option(str, "Nome do personagem")):
         await ctx.defer()
         args = character_name.strip()
-        player_url = f"https://account.aq.com/CharPage?id={args.replace(' ', '+')}"
-
-        async with aiohttp.ClientSession() as session:
-            soup = await self.fetch_html(session, player_url)
-
-            name_tag = soup.select_one(".card-header h1")
-            player_name = name_tag.text.strip() if name_tag else args
-            safe_name = player_name.replace("__", "\\_")
-
-            details = soup.select_one(".card-body .row")
-            if not details or not details.text.strip():
-                bodyinfo = soup.select_one('.card-body').text.strip() if soup.select_one('.card-body') else ""
-                if not bodyinfo:
-                    embed = discord.Embed(
-                        title=safe_name,
-                        url=player_url,
-                        description="Character not found.",
-                        color=discord.Color.red()
-                    )
-                    embed.set_author(name="Character Profile")
-                    embed.set_thumbnail(url="https://cdn.aq.com/resources/images/not_found.png")
-                    return await ctx.respond(embed=embed)
-
-                warn = self.parse_status_warning(bodyinfo)
+        player_url = aqw_client.char_page_url(args)
+
+        page = await self.fetch_html(player_url)
+
+        player_name = page.name or args
+        safe_name = player_name.replace("__", "\\_")
+
+        if not page.found:
+            bodyinfo = page.status
+            if not bodyinfo:
                 embed = discord.Embed(
                     title=safe_name,
                     url=player_url,
-                    description=warn,
-                    color=discord.Color.orange()
+                    description="Character not found.",
+                    color=discord.Color.red()
                 )
                 embed.set_author(name="Character Profile")
-                embed.set_thumbnail(url="https://cdn.aq.com/resources/images/lock.png")
+                embed.set_thumbnail(url="https://cdn.aq.com/resources/images/not_found.png")
                 return await ctx.respond(embed=embed)
 
-            char_infos = self.build_char_info(details)
-
-            scripts = soup.find_all('script')
-            ccid = self.extract_ccid(scripts)
-            inventory_url = f"https://account.aq.com/CharPage/Inventory?ccid={ccid}"
-            inv_data = await self.fetch_json(session, inventory_url)
+            warn = self.parse_status_warning(bodyinfo)
+            embed = discord.Embed(
+                title=safe_name,
+                url=player_url,
+                description=warn,
+                color=discord.Color.orange()
+            )
+            embed.set_author(name="Character Profile")
+            embed.set_thumbnail(url="https://cdn.aq.com/resources/images/lock.png")
+            return await ctx.respond(embed=embed)
+
+        char_infos = self.build_char_info(page.details)
+        if page.ccid and page.name:
+            await async_db.remember_character(page.ccid, page.name)
+
+        ccid = page.ccid or "????"
+        inventory_url = aqw_client.inventory_url(ccid)
+        inv_data = await aqw_client.inventory(ccid) if page.ccid else []
 
         # Organiza o Embed
         embed = discord.Embed(
@@ -153,5 +133,27 @@ class AQChar(commands.Cog):
 
         await ctx.respond(embed=embed)
 
+    @discord.slash_command(name="aqwstats", description="Mostra estatísticas das requisições ao AQW")
+    @commands.has_permissions(administrator=True)
+    async def aqwstats(self, ctx: discord.ApplicationContext):
+        stats = aqw_client.stats()
+        cache = stats["cache"]
+        embed = discord.Embed(title="🌐 AQW Client", color=discord.Color.blurple())
+        embed.add_field(name="📤 Requests", value=str(stats["requests_sent"]), inline=True)
+        embed.add_field(name="🔗 Coalesced", value=str(stats["requests_coalesced"]), inline=True)
+        embed.add_field(name="⏳ In Flight", value=str(stats["in_flight"]), inline=True)
+        embed.add_field(name="📈 Cache Hit Rate", value=f"{cache['hit_rate']:.1%}", inline=True)
+        embed.add_field(name="📦 Cache Size", value=f"{cache['size']}/{cache['maxsize']}", inline=True)
+        for lane, lane_stats in stats["lanes"].items():
+            embed.add_field(
+                name=f"🚦 {lane.capitalize()}",
+                value=(
+                    f"Fila: {lane_stats['waiting']} (máx. {lane_stats['max_waiting']})\n"
+                    f"Espera média: {lane_stats['avg_wait']:.2f}s (máx. {lane_stats['max_wait']:.2f}s)"
+                ),
+                inline=False
+            )
+        await ctx.respond(embed=embed, ephemeral=True)
+
 def setup(bot):
     bot.add_cog(AQChar(bot))
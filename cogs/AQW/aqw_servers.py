@@ -1,21 +1,70 @@
 import discord
 from discord.ext import commands
-import aiohttp
+from aqw import aqw_client
+from collections import deque
 from datetime import datetime
+import asyncio
+import time
 import pytz
 import math
+import config
+
+# Janela do histórico usado para pico e média
+HISTORY_WINDOW = 24 * 60 * 60
 
 class AQServers(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.poll_interval = config.AQW_SERVERS_POLL_INTERVAL
+        self.server_data = None
+        self.updated_at = None
+        # Ring buffers de (timestamp, jogadores): um por servidor e um do total
+        self.history_size = max(1, HISTORY_WINDOW // self.poll_interval)
+        self.history = {}
+        self.total_history = deque(maxlen=self.history_size)
+        self.poll_task = self.bot.loop.create_task(self.poll_servers())
+
+    def cog_unload(self):
+        self.poll_task.cancel()
+
+    async def poll_servers(self):
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"⚠️ Erro ao atualizar servidores do AQW: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def refresh(self):
+        """Busca a lista de servidores e registra a população no histórico"""
+        server_data = await aqw_client.servers()
+        now = time.time()
+        total = 0
+        for server in server_data:
+            count = int(server["iCount"])
+            total += count
+            self.history.setdefault(server["sName"], deque(maxlen=self.history_size)).append((now, count))
+        self.total_history.append((now, total))
+        self.server_data = server_data
+        self.updated_at = now
+
+    def trend(self, samples):
+        """Retorna (pico, média) das amostras das últimas 24h"""
+        cutoff = time.time() - HISTORY_WINDOW
+        counts = [count for timestamp, count in samples if timestamp >= cutoff]
+        if not counts:
+            return 0, 0
+        return max(counts), round(sum(counts) / len(counts))
 
     @commands.slash_command(name="servers", description="Mostra os servidores online do AQWorlds")
     async def servers(self, ctx: discord.ApplicationContext):
         await ctx.defer()
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://game.aq.com/game/api/data/servers") as resp:
-                server_data = await resp.json()
+        # Só vai à rede se o poller ainda não tiver nenhum snapshot
+        if self.server_data is None:
+            await self.refresh()
+        server_data = self.server_data
 
         total_players = 0
         online_servers = 0
@@ -29,7 +78,8 @@ class AQServers(commands.Cog):
             is_online = server["bOnline"] == 1 or server["bOnline"] == "1"
             status = "🟢" if is_online else "🔴"
             fill = f"{count}/{max_players}"
-            servers.append((count, f"{status} {name}: **{fill}**"))
+            peak, average = self.trend(self.history.get(name, ()))
+            servers.append((count, f"{status} {name}: **{fill}** (24h: pico {peak} · média {average})"))
 
             if is_online:
                 total_players += count
@@ -43,15 +93,20 @@ class AQServers(commands.Cog):
         col1 = "\n".join([s[1] for s in servers[:half]])
         col2 = "\n".join([s[1] for s in servers[half:]])
 
-        # Hora atual no fuso do jogo
-        now = datetime.now(pytz.timezone("America/New_York"))
+        peak_total, avg_total = self.trend(self.total_history)
+
+        # Hora da última atualização no fuso do jogo
+        now = datetime.fromtimestamp(self.updated_at, pytz.timezone("America/New_York"))
         time_str = now.strftime("%m/%d/%Y %I:%M %p")
 
         # Embed formatado
         embed = discord.Embed(
             title="🌐 AQW Servers",
             color=discord.Color.dark_purple(),
-            description=f"**Server Info**:\n```yaml\nPlayers: {total_players}\nServers: {online_servers} / {len(server_data)}```"
+            description=(
+                f"**Server Info**:\n```yaml\nPlayers: {total_players}\nServers: {online_servers} / {len(server_data)}\n"
+                f"Peak (24h): {peak_total}\nAverage (24h): {avg_total}```"
+            )
         )
         embed.set_thumbnail(url="https://jix-aqw.github.io/site/logo.png")
         embed.add_field(name="Servidor", value=col1 or "N/A", inline=True)
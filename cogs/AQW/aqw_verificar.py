@@ -1,11 +1,12 @@
 import discord
 from discord.ext import commands
-from bs4 import BeautifulSoup
-import aiohttp
-import json
+import asyncio
 import random
 import re
 import unicodedata
+from database import async_db
+from aqw import aqw_client
+from aqw.charpage import parse_char_page
 
 # ID do cargo de verificação (substitua pelo real)
 VERIFIED_ROLE_ID = 1234567890
@@ -23,23 +24,10 @@ def normalize(text: str) -> str:
     cleaned = re.sub(r'[^a-zA-Z0-9 -]', '', ascii_text)  # Mantém espaços e hifens
     return cleaned.strip().lower()
 
-def extract_equipped_items(soup: BeautifulSoup) -> tuple[list[str], BeautifulSoup | None]:
-    """Extrai itens equipados da nova estrutura HTML."""
-    equipped = []
-    equipment_block = soup.find("div", class_="d-flex flex-rows flex-wrap justify-content-around")
-    
-    if equipment_block:
-        # Encontra todas as divs que contêm os slots de equipamento
-        slots = equipment_block.find_all("div", style="line-height: 85%")
-        for slot in slots:
-            # Extrai todos os links <a> dentro do slot (ignorando labels)
-            item_links = slot.find_all("a")
-            for item_link in item_links:
-                raw_name = item_link.get_text(strip=True)
-                if raw_name:  # Evita strings vazias
-                    equipped.append(normalize(raw_name))
-    
-    return equipped, equipment_block
+def extract_equipped_items(html: str) -> list[str]:
+    """Extrai os nomes normalizados dos itens equipados na CharPage."""
+    return [normalize(name) for name in parse_char_page(html).equipped]
+
 class VerificationView(discord.ui.View):
     def __init__(
         self,
@@ -69,12 +57,8 @@ class VerificationView(discord.ui.View):
             )
 
         # Rebusca a página sem cache
-        headers = {"Cache-Control": "no-cache", "Pragma": "no-cache"}
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(f"https://account.aq.com/CharPage?id={self.ccid}") as resp:
-                html = await resp.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                equipped, equipment_block = extract_equipped_items(soup)
+        html = await aqw_client.char_page(self.ccid, fresh=True)
+        equipped = extract_equipped_items(html)
 
         # Verificação final
         if self.normalized_target in equipped:
@@ -101,22 +85,13 @@ class VerificationView(discord.ui.View):
             f"**Debug:**\n"
             f"Target (Raw): {self.target_item}\n"
             f"Target (Norm): {self.normalized_target}\n"
-            f"Equipped (Norm): {equipped}\n"
-            f"HTML Block: {str(equipment_block)[:200]}..."  # Mostra parte do HTML analisado
+            f"Equipped (Norm): {equipped}"
         )
         
 
 class VincularCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.users_file = "data/users.json"
-
-    def load_users(self) -> dict:
-        try:
-            with open(self.users_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
 
     @discord.slash_command(
         name="verificar",
@@ -129,8 +104,7 @@ class VincularCog(commands.Cog):
     ):
         await ctx.defer(ephemeral=True)
 
-        users = self.load_users()
-        data = users.get(str(ctx.author.id))
+        data = await async_db.get_aqw_link(ctx.author.id)
         if not data:
             return await ctx.respond(
                 "❌ Você não está vinculado a uma conta! Use /vincular primeiro.",
@@ -138,52 +112,46 @@ class VincularCog(commands.Cog):
             )
 
         ccid = data.get("ccid")
-        async with aiohttp.ClientSession() as session:
-            try:
-                # Inventário
-                inv_url = f"https://account.aq.com/CharPage/Inventory?ccid={ccid}"
-                async with session.get(inv_url) as resp:
-                    inventory = await resp.json()
-
-                # Página do personagem
-                char_url = f"https://account.aq.com/CharPage?id={ccid}"
-                async with session.get(char_url) as resp:
-                    soup = BeautifulSoup(await resp.text(), 'html.parser')
-
-                equipped_items = extract_equipped_items(soup)
-
-                # Itens elegíveis para verificação
-                candidates = []
-                for item in inventory:
-                    name = item.get("strName", "")
-                    t = normalize(name)
-                    if (
-                        t not in equipped_items
-                        and item.get("strType") not in IGNORED_TYPES
-                        and str(item.get("bUpgrade")).lower() != "true"
-                    ):
-                        candidates.append(name)
-
-                if not candidates:
-                    return await ctx.respond(
-                        "❌ Nenhum item disponível para verificação. Tente novamente depois.",
-                        ephemeral=True
-                    )
-
-                target = random.choice(candidates)
-                embed = discord.Embed(
-                    title="🔐 Verificação de Conta",
-                    description=f"Equipe o seguinte item no seu personagem:\n\n**{target}**",
-                    color=discord.Color.blue()
+        try:
+            # Inventário e página do personagem
+            inventory, html = await asyncio.gather(
+                aqw_client.inventory(ccid),
+                aqw_client.char_page(ccid)
+            )
+            equipped_items = extract_equipped_items(html)
+
+            # Itens elegíveis para verificação
+            candidates = []
+            for item in inventory:
+                name = item.get("strName", "")
+                t = normalize(name)
+                if (
+                    t not in equipped_items
+                    and item.get("strType") not in IGNORED_TYPES
+                    and str(item.get("bUpgrade")).lower() != "true"
+                ):
+                    candidates.append(name)
+
+            if not candidates:
+                return await ctx.respond(
+                    "❌ Nenhum item disponível para verificação. Tente novamente depois.",
+                    ephemeral=True
                 )
-                embed.set_footer(text="Você tem até 5 minutos para confirmar.")
 
-                view = VerificationView(target, ccid, ctx.author.id, VERIFIED_ROLE_ID)
-                msg = await ctx.respond(embed=embed, view=view)
-                view.message = await msg.original_response()
+            target = random.choice(candidates)
+            embed = discord.Embed(
+                title="🔐 Verificação de Conta",
+                description=f"Equipe o seguinte item no seu personagem:\n\n**{target}**",
+                color=discord.Color.blue()
+            )
+            embed.set_footer(text="Você tem até 5 minutos para confirmar.")
+
+            view = VerificationView(target, ccid, ctx.author.id, VERIFIED_ROLE_ID)
+            msg = await ctx.respond(embed=embed, view=view)
+            view.message = await msg.original_response()
 
-            except Exception as e:
-                await ctx.respond(f"❌ Erro ao processar verificação: {e}", ephemeral=True)
+        except Exception as e:
+            await ctx.respond(f"❌ Erro ao processar verificação: {e}", ephemeral=True)
 
 
 def setup(bot):
@@ -1,40 +1,34 @@
 import discord
+from typing import Optional, Tuple
 from discord.ext import commands
 from discord.commands import SlashCommandGroup, Option
-import aiohttp
-from bs4 import BeautifulSoup
-import json
-import os
-import re
+from database import async_db
+from aqw import aqw_client
+from aqw.charpage import extract_ccid, extract_name
 
 class VincularCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.data_path = "data/users.json"
         self.allowed_roles_ids = [1361379753503883516, 1361379753503883516, 1361222701259296778]  # 🛠 Substitua pelos IDs dos cargos permitidos
 
-        os.makedirs(os.path.dirname(self.data_path), exist_ok=True)
+    async def get_ccid_from_nickname(self, nickname: str, refresh: bool = False) -> Tuple[Optional[int], Optional[str]]:
+        """Retorna (CCID, nome como aparece na CharPage), ou (None, None) se o personagem não existir."""
+        # Nicknames do AQW não diferenciam maiúsculas: "Foo" e "foo" usam a mesma chave
+        key = nickname.strip().lower()
+        # Nicknames já resolvidos não precisam baixar a CharPage de novo
+        if not refresh:
+            ccid = await async_db.get_ccid_by_nickname(key)
+            if ccid:
+                return ccid, await async_db.get_nickname_by_ccid(ccid)
 
-    async def get_ccid_from_nickname(self, nickname: str) -> int:
-        url = f"https://account.aq.com/CharPage?id={nickname.replace(' ', '+')}"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                html = await resp.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                scripts = soup.find_all('script')
-                ccid_match = re.search(r"var ccid = (\d+)", scripts[6].string or "")
-                return int(ccid_match.group(1)) if ccid_match else None
-
-    def load_users(self):
-        try:
-            with open(self.data_path, "r") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
-    def save_users(self, users):
-        with open(self.data_path, "w") as f:
-            json.dump(users, f, indent=4)
+        html = await aqw_client.char_page(key)
+        ccid = extract_ccid(html)
+        if not ccid:
+            return None, None
+        # Guarda o nome como aparece na CharPage, não como foi digitado
+        name = extract_name(html) or nickname.strip()
+        await async_db.remember_character(ccid, name)
+        return ccid, name
 
     def has_allowed_role(self, member: discord.Member) -> bool:
         return any(role.id in self.allowed_roles_ids for role in member.roles)
@@ -58,35 +52,29 @@ class VincularCog(commands.Cog):
         if not self.has_allowed_role(ctx.author):
             return await ctx.respond("❌ Você não tem permissão para usar este comando!", ephemeral=True)
         
-        users = self.load_users()
         ccid = None
+        # Nome canônico do personagem; None deixa o banco usar o último nome conhecido do CCID
+        nickname = None
 
         if identifier.isdigit() and not force_ccid:
             ccid = int(identifier)
         else:
-            ccid = await self.get_ccid_from_nickname(identifier)
+            ccid, nickname = await self.get_ccid_from_nickname(identifier, refresh=force_ccid)
             if not ccid:
                 return await ctx.respond(f"❌ Nickname '{identifier}' não encontrado!", ephemeral=True)
 
-        existing = next((u for u in users.values() if u["ccid"] == ccid), None)
-        if existing:
+        existing = await async_db.get_aqw_link_by_ccid(ccid)
+        if existing and existing["discord_id"] != member.id:
             return await ctx.respond(
                 f"⚠️ CCID {ccid} já vinculado a <@{existing['discord_id']}>!",
                 ephemeral=True
             )
 
-        user_data = {
-            "discord_id": member.id,
-            "ccid": ccid,
-            "nickname": identifier if not identifier.isdigit() else None,
-            "matchmaking": {"available": False, "queue": None}
-        }
-
-        users[str(member.id)] = user_data
-        self.save_users(users)
+        if not await async_db.link_aqw_account(member.id, ccid, nickname):
+            return await ctx.respond("❌ Falha ao salvar a vinculação!", ephemeral=True)
 
         try:
-            await member.edit(nick=identifier)
+            await member.edit(nick=nickname or await async_db.get_nickname_by_ccid(ccid) or identifier.strip())
             role = ctx.guild.get_role(1361235200918556692)
             await member.add_roles(role)
             await ctx.respond(
@@ -100,5 +88,21 @@ class VincularCog(commands.Cog):
                 ephemeral=True
             )
 
+    @vincular_group.command(description="Remove a vinculação de um membro")
+    async def remover(
+        self,
+        ctx,
+        member: Option(discord.Member, "Membro do Discord")
+    ):
+        await ctx.defer(ephemeral=True)
+
+        if not self.has_allowed_role(ctx.author):
+            return await ctx.respond("❌ Você não tem permissão para usar este comando!", ephemeral=True)
+
+        if not await async_db.unlink_aqw_account(member.id):
+            return await ctx.respond(f"⚠️ {member.mention} não possui conta vinculada!", ephemeral=True)
+
+        await ctx.respond(f"✅ Vinculação de {member.mention} removida!", ephemeral=True)
+
 def setup(bot):
     bot.add_cog(VincularCog(bot))
@@ -6,10 +6,14 @@ import json
 import random
 import os
 from typing import Optional, Tuple, List, Dict, Union
-import requests
 from discord.ext.commands import BucketType, CommandOnCooldown
 from discord import Webhook
 import aiohttp
+from database import async_db
+from aqw import aqw_client, InventoryIndex
+from cache import TTLCache
+import config
+from .ledger import AccountNotFound, EconomyLedger, InsufficientFunds, LedgerUnavailable
 
 # Adicione no topo com outros imports
 
@@ -17,10 +21,11 @@ import aiohttp
 class Economy(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.BANK_FILE = "./data/economy/mainbank.json"
         self.SHOP_FILE = "./data/economy/shop.json"
-        self.ensure_bank_file()
         self.mainshop = self.load_shop()
+        self.ledger = EconomyLedger(async_db, config.ECONOMY_SNAPSHOT_INTERVAL)
+        self.ledger_task = self.bot.loop.create_task(self.ledger.run())
+        self.user_cache = TTLCache(maxsize=512, ttl=3600)
         with open(os.path.join(os.path.dirname(__file__), "beg.json"), "r", encoding="utf-8") as f:
             self.beg_messages = json.load(f)
         with open(os.path.join(os.path.dirname(__file__), "rob.json"), "r", encoding="utf-8") as f:
@@ -29,12 +34,9 @@ class Economy(commands.Cog):
     # Cria o grupo de comandos de economia
     economy = SlashCommandGroup("economia", "Comandos relacionados ao sistema econômico")
 
-    def ensure_bank_file(self):
-        """Garante que o arquivo de banco e diretório existam"""
-        os.makedirs(os.path.dirname(self.BANK_FILE), exist_ok=True)
-        if not os.path.exists(self.BANK_FILE):
-            with open(self.BANK_FILE, 'w') as f:
-                json.dump({}, f, indent=4)
+    def cog_unload(self):
+        # O cancelamento grava um último snapshot antes de encerrar
+        self.ledger_task.cancel()
 
     def load_shop(self):
         if not os.path.exists(self.SHOP_FILE):
@@ -52,9 +54,9 @@ class Economy(commands.Cog):
         user = ctx.author
         await self.open_account(user)
         
-        users = await self.get_bank_data()
-        wallet = users[str(user.id)]["wallet"]
-        bank = users[str(user.id)]["bank"]
+        account = await self.get_account(user)
+        wallet = account["wallet"]
+        bank = account["bank"]
         
         embed = discord.Embed(
             title=f'Saldo de {user.display_name}',
@@ -91,8 +93,8 @@ class Economy(commands.Cog):
         user = ctx.author
         await self.open_account(user)
         
-        users = await self.get_bank_data()
-        bank_amt = users[str(user.id)]["bank"]
+        account = await self.get_account(user)
+        bank_amt = account["bank"]
         
         if amount.lower() == "all":
             amount = bank_amt
@@ -102,13 +104,13 @@ class Economy(commands.Cog):
             except ValueError:
                 return await ctx.respond("Por favor insira um número válido ou 'all'")
         
-        if amount > bank_amt:
-            return await ctx.respond("Você não tem tanto dinheiro no banco!")
         if amount < 0:
             return await ctx.respond("Valor deve ser positivo!")
-            
-        await self.update_bank(user, amount)
-        await self.update_bank(user, -amount, "bank")
+
+        try:
+            await self.ledger.move(user.id, amount, "bank", "wallet")
+        except InsufficientFunds:
+            return await ctx.respond("Você não tem tanto dinheiro no banco!")
         await ctx.respond(f"💵 {user.mention} sacou `{amount} 🪙` do banco!")
 
     @economy.command(name="depositar", description="Deposita dinheiro no banco")
@@ -121,8 +123,8 @@ class Economy(commands.Cog):
         user = ctx.author
         await self.open_account(user)
         
-        users = await self.get_bank_data()
-        wallet_amt = users[str(user.id)]["wallet"]
+        account = await self.get_account(user)
+        wallet_amt = account["wallet"]
         
         if amount.lower() == "all":
             amount = wallet_amt
@@ -132,13 +134,13 @@ class Economy(commands.Cog):
             except ValueError:
                 return await ctx.respond("Por favor insira um número válido ou 'all'")
         
-        if amount > wallet_amt:
-            return await ctx.respond("Você não tem tanto dinheiro na carteira!")
         if amount < 0:
             return await ctx.respond("Valor deve ser positivo!")
-            
-        await self.update_bank(user, -amount)
-        await self.update_bank(user, amount, "bank")
+
+        try:
+            await self.ledger.move(user.id, amount, "wallet", "bank")
+        except InsufficientFunds:
+            return await ctx.respond("Você não tem tanto dinheiro na carteira!")
         await ctx.respond(f"🏦 {user.mention} depositou `{amount} 🪙` no banco!")
 
     @economy.command(name="enviar", description="Envia dinheiro para outro usuário")
@@ -153,13 +155,10 @@ class Economy(commands.Cog):
         await self.open_account(sender)
         await self.open_account(member)
         
-        users = await self.get_bank_data()
-        
-        if users[str(sender.id)]["wallet"] < amount:
+        try:
+            await self.ledger.transfer(sender.id, member.id, amount)
+        except InsufficientFunds:
             return await ctx.respond("Você não tem dinheiro suficiente!")
-            
-        await self.update_bank(sender, -amount)
-        await self.update_bank(member, amount)
         await ctx.respond(f"💸 {sender.mention} enviou `{amount} 🪙` para {member.mention}!")
 
     @economy.command(name="roubar", description="Tenta roubar dinheiro de outro usuário")
@@ -173,16 +172,15 @@ class Economy(commands.Cog):
         await self.open_account(thief)
         await self.open_account(victim)
 
-        users = await self.get_bank_data()
-        victim_bal = users[str(victim.id)]["wallet"]
+        victim_account = await self.get_account(victim)
+        victim_bal = victim_account["wallet"]
         if victim_bal < 100:
             return await ctx.respond("Vítima é muito pobre para valer o roubo!")
 
         # Verifica se a vítima tem o item "Amulet of Thorns"
-        victim_bag = users[str(victim.id)].get("bag", [])
+        victim_bag = victim_account["bag"]
         if any(item["item"].lower() == "amulet of thorns" for item in victim_bag):
-            fine = random.randint(100, 300)
-            await self.update_bank(thief, -fine)
+            fine = await self.charge(thief, random.randint(100, 300))
 
             return await ctx.respond(
                 f"🌵 {victim.mention} estava usando um **Amulet of Thorns**! "
@@ -192,16 +190,17 @@ class Economy(commands.Cog):
         success = random.random() < 0.4  # 40% de chance
         if success:
             stolen = min(random.randint(1, victim_bal), victim_bal)
-            await self.update_bank(thief, stolen)
-            await self.update_bank(victim, -stolen)
+            try:
+                await self.ledger.transfer(victim.id, thief.id, stolen)
+            except InsufficientFunds:
+                return await ctx.respond("Vítima é muito pobre para valer o roubo!")
 
             template = random.choice(self.rob_messages["success"])
             msg = template.format(thief=thief.mention, victim=victim.mention, amount=stolen)
             return await ctx.respond(msg)
 
         else:
-            fine = random.randint(50, 200)
-            await self.update_bank(thief, -fine)
+            fine = await self.charge(thief, random.randint(50, 200))
 
             template = random.choice(self.rob_messages["failure"])
             msg = template.format(thief=thief.mention, victim=victim.mention, fine=fine)
@@ -218,11 +217,12 @@ class Economy(commands.Cog):
         user = ctx.author
         await self.open_account(user)
         
-        users = await self.get_bank_data()
-        
-        if users[str(user.id)]["wallet"] < amount:
+        # A aposta sai da carteira antes do giro e o prêmio volta depois
+        try:
+            await self.update_bank(user, -amount)
+        except InsufficientFunds:
             return await ctx.respond("Dinheiro insuficiente!")
-            
+
         emojis = "🍎🍊🍇🍒🍋🍉🍓🍍"
         slots = [random.choice(emojis) for _ in range(3)]
         
@@ -230,14 +230,13 @@ class Economy(commands.Cog):
         
         if slots[0] == slots[1] == slots[2]:
             win = amount * 5
-            await self.update_bank(user, win)
+            await self.update_bank(user, win + amount)
             await ctx.respond(f"🎉 JACKPOT! Você ganhou {win} 🪙!")
         elif slots[0] == slots[1] or slots[1] == slots[2]:
             win = amount * 2
-            await self.update_bank(user, win)
+            await self.update_bank(user, win + amount)
             await ctx.respond(f"✨ Você ganhou {win} 🪙!")
         else:
-            await self.update_bank(user, -amount)
             await ctx.respond(f"😢 Você perdeu {amount} 🪙...")
 
     @economy.command(name="loja", description="Mostra os itens disponíveis na loja")
@@ -291,23 +290,24 @@ class Economy(commands.Cog):
 
         total_cost = shop_item['price'] * amount
 
-        users = await self.get_bank_data()
-        if users[str(user.id)]["wallet"] < total_cost:
+        account = await self.get_account(user)
+        if account["wallet"] < total_cost:
             return await ctx.respond("Dinheiro insuficiente!")
 
         # Verificação de requisitos
         missing = []
 
-        ccid = users[str(user.id)].get("ccid")
-        inventory = []
+        link = await async_db.get_aqw_link(user.id)
+        ccid = link["ccid"] if link else None
+        inventory = InventoryIndex([])
         badges = []
 
         # Requisições APENAS se necessário
         if ccid:
             if shop_item.get("aqwItemRequired"):
-                inventory = requests.get(f"https://account.aq.com/CharPage/Inventory?ccid={ccid}").json()
+                inventory = await aqw_client.inventory(ccid)
             if shop_item.get("aqwBadgeRequired"):
-                badges = requests.get(f"https://account.aq.com/CharPage/Badges?ccid={ccid}").json()
+                badges = await aqw_client.badges(ccid)
 
         # Verificar roles exigidas
         for role_id in shop_item.get("roleRequired", []):
@@ -316,15 +316,15 @@ class Economy(commands.Cog):
                 missing.append(f"📛 {role.name}")
 
         # Verificar itens do AQW
+        totals = inventory.count_matching(shop_item.get("aqwItemRequired", []))
         for aqw_item in shop_item.get("aqwItemRequired", []):
-            found = [i for i in inventory if aqw_item.lower() in i["strName"].lower()]
-            total = sum(i["intCount"] for i in found)
-            if total == 0:
+            if totals[aqw_item] == 0:
                 missing.append(f"🪙 {aqw_item}")
 
         # Verificar badges do AQW
+        badge_ids = {b["badgeID"] for b in badges}
         for badge_id in shop_item.get("aqwBadgeRequired", []):
-            if not any(b["badgeID"] == badge_id for b in badges):
+            if badge_id not in badge_ids:
                 missing.append(f"🎖️ Badge ID {badge_id} não encontrada")
 
         if missing:
@@ -333,23 +333,17 @@ class Economy(commands.Cog):
                 "\n".join(missing)
             )
 
-        # Atualizar carteira
-        await self.update_bank(user, -total_cost)
-        users = await self.get_bank_data()
-        bag = users[str(user.id)].get("bag", [])
-
-        existing_item = next(
-            (i for i in bag if i['item'].lower() == item), 
-            None
-        )
-
-        if existing_item:
-            existing_item['amount'] += amount
-        else:
-            bag.append({"item": shop_item['name'], "amount": amount})
-
-        users[str(user.id)]["bag"] = bag
-        await self.save_bank_data(users)
+        # Atualizar carteira (o saldo pode ter mudado durante as verificações)
+        try:
+            await self.update_bank(user, -total_cost)
+        except InsufficientFunds:
+            return await ctx.respond("Dinheiro insuficiente!")
+        try:
+            await async_db.add_bag_item(user.id, shop_item['name'], amount)
+        except Exception:
+            # O item não foi entregue: devolve o dinheiro
+            await self.update_bank(user, total_cost)
+            raise
 
         # Aplicar/Remover cargos
         roles_to_add = [ctx.guild.get_role(int(rid)) for rid in shop_item.get("roleGive", [])]
@@ -384,27 +378,18 @@ class Economy(commands.Cog):
         if not shop_item:
             return await ctx.respond("Item não pode ser vendido na loja!")
             
-        users = await self.get_bank_data()
-        bag = users[str(user.id)].get("bag", [])
-        
-        existing_item = next(
-            (i for i in bag if i['item'].lower() == item), 
-            None
-        )
-        
-        if not existing_item or existing_item['amount'] < amount:
+        if not await async_db.remove_bag_item(user.id, shop_item['name'], amount):
             return await ctx.respond(f"Você não tem {amount}x {item} no inventário!")
             
         sell_price = int(shop_item['price'] * 0.8)
         total = sell_price * amount
         
-        existing_item['amount'] -= amount
-        if existing_item['amount'] <= 0:
-            bag.remove(existing_item)
-            
-        users[str(user.id)]["bag"] = bag
-        await self.save_bank_data(users)
-        await self.update_bank(user, total)
+        try:
+            await self.update_bank(user, total)
+        except Exception:
+            # O pagamento falhou: devolve os itens
+            await async_db.add_bag_item(user.id, shop_item['name'], amount)
+            raise
         
         await ctx.respond(
             f"💰 {user.mention} vendeu {amount}x {shop_item['name']} por {total} 🪙!"
@@ -416,8 +401,8 @@ class Economy(commands.Cog):
         user = ctx.author
         await self.open_account(user)
         
-        users = await self.get_bank_data()
-        bag = users[str(user.id)].get("bag", [])
+        account = await self.get_account(user)
+        bag = account["bag"]
         
         if not bag:
             return await ctx.respond("Seu inventário está vazio!")
@@ -443,19 +428,21 @@ class Economy(commands.Cog):
         limit: Option(int, "Número de usuários para mostrar", default=10, min_value=1, max_value=25)
     ):
         """Mostra os usuários mais ricos"""
-        users = await self.get_bank_data()
         rankings = []
-        
-        for user_id, data in users.items():
-            try:
-                user = await self.bot.fetch_user(int(user_id))
-                total = data['wallet'] + data['bank']
-                rankings.append((user, total))
-            except:
-                continue
-                
-        rankings.sort(key=lambda x: x[1], reverse=True)
-        
+
+        offset = 0
+
+        # Contas de usuários que não existem mais são puladas
+        while len(rankings) < limit:
+            page = await self.ledger.richest(limit, offset)
+            if not page:
+                break
+            offset += len(page)
+            for discord_id, total in page:
+                user = await self.resolve_user(ctx.guild, discord_id)
+                if user:
+                    rankings.append((user, total))
+
         embed = discord.Embed(
             title=f"🏆 Top {len(rankings[:limit])} Usuários Mais Ricos",
             color=discord.Color.gold()
@@ -475,30 +462,12 @@ class Economy(commands.Cog):
     
     async def open_account(self, user) -> bool:
         """Abre uma conta para um usuário se não existir"""
-        users = await self.get_bank_data()
-        
-        if str(user.id) not in users:
-            users[str(user.id)] = {
-                "wallet": 100,  # Saldo inicial
-                "bank": 0,
-                "bag": []
-            }
-            await self.save_bank_data(users)
-            return True
-        return False
-
-    async def get_bank_data(self) -> Dict:
-        """Carrega os dados do banco"""
-        try:
-            with open(self.BANK_FILE, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+        return await self.ledger.open_account(user.id)
 
-    async def save_bank_data(self, data: Dict) -> None:
-        """Salva os dados no arquivo do banco"""
-        with open(self.BANK_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
+    async def get_account(self, user) -> Dict:
+        """Carrega a conta do usuário (wallet, bank e bag)"""
+        wallet, bank = await self.ledger.get(user.id) or (0, 0)
+        return {"wallet": wallet, "bank": bank, "bag": await async_db.get_bag(user.id)}
 
     async def update_bank(
         self, 
@@ -507,18 +476,33 @@ class Economy(commands.Cog):
         mode: str = 'wallet'
     ) -> Tuple[int, int]:
         """Atualiza o saldo do usuário"""
-        users = await self.get_bank_data()
-        users[str(user.id)][mode] += amount
-        await self.save_bank_data(users)
-        return (
-            users[str(user.id)]['wallet'], 
-            users[str(user.id)]['bank']
-        )
+        return await self.ledger.update(user.id, amount, mode)
+
+    async def resolve_user(self, guild, discord_id: int):
+        """Busca o membro no cache do bot antes de recorrer à API"""
+        member = guild.get_member(discord_id) if guild else None
+        user = member or self.bot.get_user(discord_id) or self.user_cache.get(discord_id)
+        if user is None and discord_id not in self.user_cache:
+            try:
+                user = await self.bot.fetch_user(discord_id)
+            except discord.HTTPException:
+                user = None
+            # Falhas também ficam em cache para não repetir a requisição
+            self.user_cache.set(discord_id, user)
+        return user
+
+    async def charge(self, user, fine: int) -> int:
+        """Cobra uma multa da carteira, limitada ao saldo disponível"""
+        return await self.ledger.charge(user.id, fine)
 
     @commands.Cog.listener()
     async def on_application_command_error(self, ctx, error):
         if isinstance(error, CommandOnCooldown):
             await ctx.respond(f"⏳ Este comando está em cooldown. Tente novamente em `{error.retry_after:.1f}` segundos.", ephemeral=True)
+        elif isinstance(getattr(error, "original", None), LedgerUnavailable):
+            await ctx.respond("❌ A economia está indisponível no momento. Tente novamente mais tarde.", ephemeral=True)
+        elif isinstance(getattr(error, "original", None), AccountNotFound):
+            await ctx.respond("❌ Conta não encontrada. Use `/economia saldo` para abrir a sua.", ephemeral=True)
 
 
 def setup(bot):
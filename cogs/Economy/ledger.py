@@ -0,0 +1,287 @@
+# cogs/Economy/ledger.py
+import asyncio
+import contextlib
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from sortedcontainers import SortedList
+
+
+# Saldo inicial da carteira ao abrir uma conta
+STARTING_WALLET = 100
+
+# Campo de saldo -> posição na tupla (wallet, bank)
+FIELDS = {"wallet": 0, "bank": 1}
+
+# Tentativas de carregar o ledger na inicialização (espera de 5s, 10s, ...)
+LOAD_ATTEMPTS = 3
+LOAD_RETRY_DELAY = 5
+
+
+class InsufficientFunds(Exception):
+    """Uma transação deixaria algum saldo negativo."""
+
+    def __init__(self, discord_id: int, field: str, balance: int, needed: int):
+        super().__init__(f"Account {discord_id} has {balance} in {field}, needs {needed}")
+        self.discord_id = discord_id
+        self.field = field
+        self.balance = balance
+        self.needed = needed
+
+
+class AccountNotFound(KeyError):
+    """A conta não existe no ledger."""
+
+    def __init__(self, discord_id: int):
+        super().__init__(discord_id)
+        self.discord_id = discord_id
+
+    def __str__(self) -> str:
+        return f"Account {self.discord_id} does not exist"
+
+
+class LedgerUnavailable(Exception):
+    """O ledger não carregou; nenhuma operação pode ser feita."""
+
+
+class EconomyLedger:
+    """
+    Saldos da economia mantidos em memória.
+
+    Cada transação trava as contas envolvidas (sempre na mesma ordem, para
+    não haver deadlock), grava uma linha no journal e só então altera os
+    saldos em memória. Periodicamente os saldos alterados são gravados em
+    'economy_accounts' e as linhas do journal já incluídas são apagadas. Na
+    inicialização, o último snapshot é carregado e o journal é reaplicado.
+
+    O ranking de riqueza (wallet + bank) é mantido em uma SortedList
+    atualizada a cada transação, então o top N não percorre todas as contas.
+    """
+
+    def __init__(self, db, snapshot_interval: float = 300):
+        self.db = db
+        self.snapshot_interval = snapshot_interval
+        self.logger = logging.getLogger(__name__)
+        self._balances: Dict[int, Tuple[int, int]] = {}
+        # (-total, discord_id): o mais rico primeiro, empate pelo menor ID
+        self._ranking = SortedList()
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._dirty: set = set()
+        self._applied: List[int] = []
+        self._ready = asyncio.Event()
+        self._failed = False
+        self._snapshot_lock = asyncio.Lock()
+
+    # ============= INICIALIZAÇÃO =============
+
+    async def load(self):
+        """Carrega o último snapshot e reaplica o journal pendente"""
+        balances = {
+            account["discord_id"]: (account["wallet"], account["bank"])
+            for account in await self.db.list_accounts()
+        }
+        dirty = set()
+        applied = []
+
+        journal = await self.db.load_ledger_journal()
+        for seq, changes in journal:
+            for discord_id, wallet, bank in changes:
+                current = balances.get(discord_id, (0, 0))
+                balances[discord_id] = (current[0] + wallet, current[1] + bank)
+                dirty.add(discord_id)
+            applied.append(seq)
+
+        self._balances = balances
+        self._dirty = dirty
+        self._applied = applied
+        self._ranking = SortedList(
+            (-(wallet + bank), discord_id) for discord_id, (wallet, bank) in self._balances.items()
+        )
+
+        self._ready.set()
+        self.logger.info(
+            f"Economy ledger loaded: {len(self._balances)} accounts, "
+            f"{len(journal)} journal entries replayed"
+        )
+
+    async def run(self):
+        """Carrega o ledger e grava snapshots periódicos até ser cancelado"""
+        for attempt in range(1, LOAD_ATTEMPTS + 1):
+            try:
+                await self.load()
+                break
+            except Exception as e:
+                self.logger.error(f"Failed to load economy ledger (attempt {attempt}/{LOAD_ATTEMPTS}): {e}")
+                if attempt == LOAD_ATTEMPTS:
+                    # Libera quem está esperando; as operações passam a falhar
+                    self._failed = True
+                    self._ready.set()
+                    return
+                await asyncio.sleep(LOAD_RETRY_DELAY * attempt)
+
+        try:
+            while True:
+                await asyncio.sleep(self.snapshot_interval)
+                await self.snapshot()
+        finally:
+            await self.snapshot()
+
+    # ============= CONSULTAS =============
+
+    async def get(self, discord_id: int) -> Optional[Tuple[int, int]]:
+        """Retorna (wallet, bank) da conta, ou None se ela não existir"""
+        await self._wait_ready()
+        return self._balances.get(discord_id)
+
+    async def accounts(self) -> Dict[int, Tuple[int, int]]:
+        """Retorna uma cópia de todos os saldos"""
+        await self._wait_ready()
+        return dict(self._balances)
+
+    async def richest(self, limit: int, offset: int = 0) -> List[Tuple[int, int]]:
+        """
+        Retorna (discord_id, wallet + bank) do mais rico para o mais pobre.
+
+        Custa O(log n + limit), independente do total de contas.
+        """
+        await self._wait_ready()
+        return [
+            (discord_id, -total)
+            for total, discord_id in self._ranking.islice(offset, offset + limit)
+        ]
+
+    # ============= TRANSAÇÕES =============
+
+    async def open_account(self, discord_id: int) -> bool:
+        """Abre a conta com o saldo inicial. Retorna False se ela já existir"""
+        await self._wait_ready()
+        if discord_id in self._balances:
+            return False
+        async with self._locked([discord_id]):
+            if discord_id in self._balances:
+                return False
+            await self._commit([(discord_id, STARTING_WALLET, 0)], create=True)
+            return True
+
+    async def apply(self, changes: Iterable[Tuple[int, int, int]]) -> Dict[int, Tuple[int, int]]:
+        """
+        Aplica atomicamente uma transação.
+
+        Args:
+            changes: (discord_id, variação da carteira, variação do banco)
+                para cada conta envolvida.
+
+        Returns:
+            Dict[int, Tuple[int, int]]: Novo (wallet, bank) de cada conta.
+
+        Raises:
+            AccountNotFound: Alguma conta não existe.
+            LedgerUnavailable: O ledger não carregou.
+            InsufficientFunds: Algum saldo ficaria negativo. Nada é alterado.
+        """
+        changes = list(changes)
+        await self._wait_ready()
+        async with self._locked(discord_id for discord_id, _, _ in changes):
+            return await self._commit(changes)
+
+    async def update(self, discord_id: int, amount: int, mode: str = "wallet") -> Tuple[int, int]:
+        """Soma amount à carteira ou ao banco e retorna o novo (wallet, bank)"""
+        delta = [0, 0]
+        delta[FIELDS[mode]] = amount
+        result = await self.apply([(discord_id, *delta)])
+        return result[discord_id]
+
+    async def move(self, discord_id: int, amount: int, source: str, target: str) -> Tuple[int, int]:
+        """Move amount entre a carteira e o banco de uma mesma conta"""
+        delta = [0, 0]
+        delta[FIELDS[source]] -= amount
+        delta[FIELDS[target]] += amount
+        result = await self.apply([(discord_id, *delta)])
+        return result[discord_id]
+
+    async def transfer(self, sender_id: int, receiver_id: int, amount: int, mode: str = "wallet"):
+        """Transfere amount de uma conta para outra no mesmo campo"""
+        sent = [0, 0]
+        sent[FIELDS[mode]] = -amount
+        received = [0, 0]
+        received[FIELDS[mode]] = amount
+        return await self.apply([(sender_id, *sent), (receiver_id, *received)])
+
+    async def charge(self, discord_id: int, amount: int, mode: str = "wallet") -> int:
+        """Debita até amount, limitado ao saldo, e retorna o valor cobrado"""
+        await self._wait_ready()
+        async with self._locked([discord_id]):
+            if discord_id not in self._balances:
+                raise AccountNotFound(discord_id)
+            charged = min(amount, self._balances[discord_id][FIELDS[mode]])
+            if charged > 0:
+                delta = [0, 0]
+                delta[FIELDS[mode]] = -charged
+                await self._commit([(discord_id, *delta)])
+            return max(charged, 0)
+
+    # ============= PERSISTÊNCIA =============
+
+    async def snapshot(self) -> int:
+        """Grava os saldos alterados e descarta o journal já incluído"""
+        async with self._snapshot_lock:
+            if not self._applied:
+                return 0
+            # Capturado sem await: só entram transações já aplicadas em memória
+            balances = {discord_id: self._balances[discord_id] for discord_id in self._dirty}
+            seqs = self._applied
+            self._dirty = set()
+            self._applied = []
+            try:
+                await self.db.write_ledger_snapshot(balances, seqs)
+            except Exception:
+                self._dirty.update(balances)
+                self._applied = seqs + self._applied
+                raise
+            return len(balances)
+
+    # ============= INTERNOS =============
+
+    async def _wait_ready(self):
+        await self._ready.wait()
+        if self._failed:
+            raise LedgerUnavailable("Economy ledger failed to load")
+
+    @contextlib.asynccontextmanager
+    async def _locked(self, discord_ids: Iterable[int]):
+        async with contextlib.AsyncExitStack() as stack:
+            for discord_id in sorted(set(discord_ids)):
+                lock = self._locks.setdefault(discord_id, asyncio.Lock())
+                await stack.enter_async_context(lock)
+            yield
+
+    async def _commit(
+        self,
+        changes: List[Tuple[int, int, int]],
+        create: bool = False
+    ) -> Dict[int, Tuple[int, int]]:
+        # Chamado com as travas de todas as contas envolvidas
+        result: Dict[int, Tuple[int, int]] = {}
+        for discord_id, wallet, bank in changes:
+            current = result.get(discord_id) or self._balances.get(discord_id)
+            if current is None:
+                if not create:
+                    raise AccountNotFound(discord_id)
+                current = (0, 0)
+            updated = (current[0] + wallet, current[1] + bank)
+            for field, index in FIELDS.items():
+                if updated[index] < 0:
+                    # Saldo antes da transação e quanto ela retira do campo no total
+                    balance = self._balances.get(discord_id, (0, 0))[index]
+                    raise InsufficientFunds(discord_id, field, balance, balance - updated[index])
+            result[discord_id] = updated
+
+        seq = await self.db.append_ledger_entry(changes)
+        for discord_id, (wallet, bank) in result.items():
+            previous = self._balances.get(discord_id)
+            if previous is not None:
+                self._ranking.remove((-sum(previous), discord_id))
+            self._ranking.add((-(wallet + bank), discord_id))
+        self._balances.update(result)
+        self._dirty.update(result)
+        self._applied.append(seq)
+        return result
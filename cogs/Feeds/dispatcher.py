@@ -0,0 +1,115 @@
+# cogs/Feeds/dispatcher.py
+import asyncio
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, List, Optional
+import aiohttp
+import discord
+from ratelimit import PriorityRateLimiter
+
+# Limites do Discord por mensagem
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+# Tentativas de envio de cada mensagem (espera de 5s, 10s, ... entre elas)
+SEND_ATTEMPTS = 3
+RETRY_DELAY = 5
+
+
+class NotificationDispatcher:
+    """
+    Fila de notificações enviadas em segundo plano.
+
+    enqueue() só coloca o embed na fila do canal e retorna, então a checagem
+    dos feeds não espera o Discord. Cada canal tem um envio próprio, que
+    aguarda 'batch_delay' segundos para a rajada de uma checagem chegar,
+    junta até MAX_EMBEDS embeds pendentes por mensagem (sem passar de
+    MAX_EMBED_CHARS) e passa por um token bucket do canal, abaixo do limite
+    da rota de envio de mensagens, em vez de depender dos 429. Erros
+    temporários (5xx, rede) são repetidos até SEND_ATTEMPTS vezes.
+    """
+
+    def __init__(
+        self,
+        get_channel: Callable[[int], Optional[discord.abc.Messageable]],
+        rate: float,
+        burst: int,
+        batch_delay: float = 0
+    ):
+        self.get_channel = get_channel
+        self.rate = rate
+        self.burst = burst
+        self.batch_delay = batch_delay
+        self._pending: Dict[int, Deque[discord.Embed]] = {}
+        self._limiters: Dict[int, PriorityRateLimiter] = {}
+        self._senders: Dict[int, asyncio.Task] = {}
+        # queued, messages, sent, retries, failed, dropped
+        self.counters = Counter()
+
+    def enqueue(self, channel_id: int, embed: discord.Embed):
+        """Agenda o envio do embed no canal"""
+        self._pending.setdefault(channel_id, deque()).append(embed)
+        self.counters["queued"] += 1
+        sender = self._senders.get(channel_id)
+        if sender is None or sender.done():
+            self._senders[channel_id] = asyncio.create_task(self._send_loop(channel_id))
+
+    @staticmethod
+    def _take_batch(pending: Deque[discord.Embed]) -> List[discord.Embed]:
+        batch, chars = [], 0
+        while pending and len(batch) < MAX_EMBEDS:
+            size = len(pending[0])
+            if batch and chars + size > MAX_EMBED_CHARS:
+                break
+            batch.append(pending.popleft())
+            chars += size
+        return batch
+
+    async def _send_loop(self, channel_id: int):
+        pending = self._pending[channel_id]
+        limiter = self._limiters.setdefault(channel_id, PriorityRateLimiter(self.rate, self.burst))
+        if self.batch_delay:
+            await asyncio.sleep(self.batch_delay)
+        while pending:
+            await limiter.acquire()
+            batch = self._take_batch(pending)
+            channel = self.get_channel(channel_id)
+            if channel is None:
+                self.counters["dropped"] += len(batch) + len(pending)
+                pending.clear()
+                print(f"Canal de notificações {channel_id} não encontrado.")
+                return
+            await self._send(channel, batch, limiter)
+
+    async def _send(self, channel: discord.abc.Messageable, batch: List[discord.Embed], limiter: PriorityRateLimiter):
+        for attempt in range(1, SEND_ATTEMPTS + 1):
+            try:
+                await channel.send(embeds=batch)
+            except (discord.HTTPException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # 4xx (permissão, embed inválido) não muda ao repetir; 429 a biblioteca já trata
+                status = getattr(e, "status", None)
+                retryable = status is None or status >= 500
+                if not retryable or attempt == SEND_ATTEMPTS:
+                    self.counters["failed"] += len(batch)
+                    print(f"Erro ao enviar {len(batch)} notificação(ões) após {attempt} tentativa(s): {e}")
+                    return
+                self.counters["retries"] += 1
+                await asyncio.sleep(RETRY_DELAY * attempt)
+                await limiter.acquire()
+            else:
+                self.counters["messages"] += 1
+                self.counters["sent"] += len(batch)
+                return
+
+    def pending(self) -> int:
+        """Notificações ainda na fila"""
+        return sum(len(pending) for pending in self._pending.values())
+
+    async def join(self):
+        """Espera a fila esvaziar"""
+        while any(not sender.done() for sender in self._senders.values()):
+            await asyncio.gather(*self._senders.values(), return_exceptions=True)
+
+    def close(self) -> int:
+        """Cancela os envios em andamento. Retorna quantas notificações ficaram na fila."""
+        for sender in self._senders.values():
+            sender.cancel()
+        return self.pending()
@@ -1,85 +1,226 @@
 # cogs/Feeds/feeds.py
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import discord.utils
 from discord.commands import SlashCommandGroup, Option
 from discord.ext.commands import cooldown, BucketType  
 import aiohttp
 import asyncio
 import feedparser
-from datetime import datetime, timedelta
+from datetime import datetime
 import config
-import random
+import time
+import hashlib
+from collections import Counter, defaultdict
+from cache import TTLCache
+from .scheduler import FeedScheduler
+from .seen import SeenStore
+from .dispatcher import NotificationDispatcher
+from .youtube import QuotaExhausted, QuotaLedger, YouTubeEngine
+
+PLATFORM_NAMES = {"youtube": "YouTube", "twitch": "Twitch", "twitter": "Twitter", "rss": "RSS"}
+# Tweets buscados por checagem (mínimo da busca recente)
+TWITTER_MAX_RESULTS = 10
+# Logins/IDs aceitos por chamada da API Helix
+TWITCH_BATCH_SIZE = 100
+# Idade máxima do ID, nome e avatar guardados de um canal da Twitch
+TWITCH_USER_TTL = 7 * 24 * 60 * 60
 
 class FeedMonitor(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.check_interval = 1800  # 30 minutos
         self.youtube_channels = config.load_feeds("youtube")
         self.twitch_channels = config.load_feeds("twitch")
+        # login -> ID, nome de exibição e avatar, resolvidos uma vez
+        self.twitch_users = config.load_feeds("twitch_users")
         self.twitter_users = config.load_feeds("twitter")
         self.rss_feeds = config.load_feeds("rss")
+        # Últimos IDs notificados de cada feed
+        self.seen = SeenStore(config.load_feeds("seen"), config.FEEDS_SEEN_CAPACITY)
+        # ETag, Last-Modified e hash do corpo de cada feed RSS
+        self.rss_state = config.load_feeds("rss_state")
+        # Contadores por feed desde que o cog foi carregado
+        self.rss_stats = defaultdict(Counter)
         
-        # Cache para dados do YouTube
-        self.youtube_channel_cache = {}
-        self.api_request_cache = {}
-        
-        # Inicia com a primeira chave
-        self.current_api_key = random.choice(config.YOUTUBE_API_KEYS) if hasattr(config, 'YOUTUBE_API_KEYS') else config.YOUTUBE_API_KEY
+        # Respostas da API do YouTube, com limite de tamanho e validade
+        self.api_request_cache = TTLCache(maxsize=config.FEEDS_API_CACHE_SIZE, ttl=config.FEEDS_API_CACHE_TTL)
+
+        # Cota gasta por chave da API do YouTube hoje
+        self.youtube_quota = QuotaLedger(
+            config.YOUTUBE_API_KEYS,
+            config.YOUTUBE_DAILY_QUOTA,
+            config.YOUTUBE_QUOTA_RESERVE,
+            config.load_feeds("youtube_quota")
+        )
+        # URL -> ID, título, playlist de uploads e inscritos, resolvidos uma vez
+        self.youtube = YouTubeEngine(
+            self._get_session,
+            self.youtube_quota,
+            config.load_feeds("youtube_info"),
+            self.api_request_cache
+        )
+
+        # Uma sessão (e um pool de conexões) para todas as plataformas
+        self.session = None
+        # Limite de feeds checados ao mesmo tempo em cada plataforma
+        self.semaphores = {
+            platform: asyncio.Semaphore(limit) for platform, limit in config.FEEDS_CONCURRENCY.items()
+        }
+        self.feed_timeout = config.FEEDS_TIMEOUT
+        self.last_cycle = None
+        # Notificações saem por uma fila, sem segurar a checagem dos feeds
+        self.dispatcher = NotificationDispatcher(
+            self.bot.get_channel,
+            config.FEEDS_NOTIFY_RATE,
+            config.FEEDS_NOTIFY_BURST,
+            config.FEEDS_NOTIFY_BATCH_DELAY
+        )
+
+        # Cada feed tem seu próprio intervalo, ajustado à frequência de publicação
+        self.scheduler = FeedScheduler(
+            config.FEEDS_MIN_INTERVAL,
+            config.FEEDS_MAX_INTERVAL,
+            config.FEEDS_DEFAULT_INTERVAL,
+            history=config.load_feeds("schedule")
+        )
+        for platform, feeds in self.feeds.items():
+            for target in feeds:
+                self.scheduler.add(platform, target)
+        self.monitor_task = self.bot.loop.create_task(self.monitor_loop())
+        self.sweep_task = self.bot.loop.create_task(self.sweep_caches())
+
+    @property
+    def feeds(self):
+        return {
+            "youtube": self.youtube_channels,
+            "twitch": self.twitch_channels,
+            "twitter": self.twitter_users,
+            "rss": self.rss_feeds
+        }
 
     monitor = SlashCommandGroup("monitor", "Gerencia feeds do bot")
 
+    def cog_unload(self):
+        self.monitor_task.cancel()
+        self.sweep_task.cancel()
+        pending = self.dispatcher.close()
+        if pending:
+            print(f"{pending} notificação(ões) descartada(s) ao descarregar o monitor de feeds.")
+        if self.session and not self.session.closed:
+            self.bot.loop.create_task(self.session.close())
+
     def _save_feeds(self, platform, data):
         config.save_feeds(platform, data)
 
-    # --------------------- AUXILIAR -------------------------#
-    async def get_channel_id_from_url(self, url: str) -> str:
-        if url in self.youtube_channels:
-            return self.youtube_channels[url]
-            
-        if url.startswith("https://www.youtube.com/@"):
-            username = url.split("@")[1]
-            api_url = f"https://www.googleapis.com/youtube/v3/channels?part=id&forUsername={username}&key={self.current_api_key}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url) as resp:
-                    data = await resp.json()
-                    if data.get('items'):
-                        return data['items'][0]['id']
-        elif "channel/" in url:
-            return url.split("channel/")[1]
-        return url
-
-    async def cached_api_request(self, session, url):
-        if url in self.api_request_cache:
-            cache_time = self.api_request_cache[url]['time']
-            if datetime.now() - cache_time < timedelta(minutes=30):
-                return self.api_request_cache[url]['data']
-        
-        async with session.get(url) as resp:
-            data = await resp.json()
-            self.api_request_cache[url] = {'data': data, 'time': datetime.now()}
-            return data
-
-    async def update_channel_cache(self):
-        channel_ids = [await self.get_channel_id_from_url(url) for url in self.youtube_channels.keys()]
-        valid_ids = [cid for cid in channel_ids if cid]
-        
-        if not valid_ids:
-            return
-
-        url = f"https://www.googleapis.com/youtube/v3/channels?part=snippet,statistics&id={','.join(valid_ids)}&key={self.current_api_key}"
-        async with aiohttp.ClientSession() as session:
-            data = await self.cached_api_request(session, url)
-            
-        for item in data.get('items', []):
-            channel_id = item['id']
-            self.youtube_channel_cache[channel_id] = {
-                'title': item['snippet']['title'],
-                'subs': int(item['statistics']['subscriberCount'])
-            }
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.feed_timeout))
+        return self.session
+
+    async def _run_feeds(self, platform: str, targets, check) -> list:
+        """
+        Roda check(target) para cada feed (ou lote de feeds) da plataforma em
+        paralelo, limitado pelo semáforo da plataforma e com timeout por feed.
+        Um feed lento ou com erro não atrasa os demais.
+
+        Retorna os resultados na ordem dos feeds (None onde falhou).
+        """
+        async def run(target):
+            # Lotes (APIs que aceitam vários feeds por chamada) aparecem no log pelo tamanho
+            name = target if isinstance(target, str) else f"(lote de {len(target)})"
+            async with self.semaphores[platform]:
+                try:
+                    return await asyncio.wait_for(check(target), timeout=self.feed_timeout)
+                except asyncio.TimeoutError:
+                    print(f"Timeout ao verificar {platform} {name}")
+                except Exception as e:
+                    print(f"Erro ao verificar {platform} {name}: {e}")
+                return None
 
+        return await asyncio.gather(*(run(target) for target in list(targets)))
 
+    async def monitor_loop(self):
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            due = self.scheduler.pop_due()
+            if due:
+                try:
+                    await self.check_feeds(due)
+                except Exception as e:
+                    print(f"Erro na checagem dos feeds: {e}")
+                finally:
+                    self.scheduler.reschedule(due)
+            await self.scheduler.wait()
+
+    async def sweep_caches(self):
+        """Descarta periodicamente as respostas vencidas do cache da API"""
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            await asyncio.sleep(config.FEEDS_API_CACHE_TTL)
+            self.api_request_cache.sweep()
+
+    async def check_feeds(self, due):
+        """
+        Checa os feeds de cada plataforma ao mesmo tempo e reagenda cada um
+        conforme o resultado (itens novos, nada novo ou erro).
+        """
+        started = time.monotonic()
+        checks = {
+            "youtube": self.youtube_check,
+            "twitch": self.twitch_check,
+            "twitter": self.twitter_check,
+            "rss": self.rss_check
+        }
+        platforms = list(due)
+        results = await asyncio.gather(
+            *(checks[platform](due[platform]) for platform in platforms), return_exceptions=True
+        )
+
+        history_changed = False
+        for platform, result in zip(platforms, results):
+            if isinstance(result, Exception):
+                print(f"Erro ao verificar {platform}: {result}")
+                result = {}
+            for target in due[platform]:
+                history_changed |= self.scheduler.record(platform, target, result.get(target))
+        if history_changed:
+            self._save_feeds("schedule", self.scheduler.history)
+        self.last_cycle = time.monotonic() - started
+
+    async def _notify_unseen(self, platform, target, items, get_id, build_embed):
+        """
+        Notifica, do mais antigo ao mais novo, os itens do feed que ainda não
+        foram notificados. 'items' vem do mais novo ao mais antigo.
+
+        Retorna quantos itens eram novos.
+        """
+        feeds = self.feeds[platform]
+        by_id = {str(get_id(item)): item for item in items}
+        new_ids = self.seen.unseen(platform, target, by_id, last_id=feeds.get(target))
+        try:
+            for entry_id in new_ids:
+                # O feed pode ter sido removido enquanto a checagem rodava
+                if target not in feeds:
+                    break
+                await self.send_notification(PLATFORM_NAMES[platform], embed=build_embed(by_id[entry_id]))
+                self.seen.add(platform, target, entry_id)
+                feeds[target] = entry_id
+        finally:
+            if new_ids and target in feeds:
+                self._save_feeds(platform, feeds)
+            self._save_seen()
+        return len(new_ids)
+
+    def _save_seen(self):
+        if self.seen.dirty:
+            self._save_feeds("seen", self.seen.to_dict())
+            self.seen.dirty = False
+
+    async def check_all(self):
+        """Checa todos os feeds agora, fora da agenda."""
+        await self.check_feeds({platform: list(feeds) for platform, feeds in self.feeds.items() if feeds})
 
+    # --------------------- AUXILIAR -------------------------#
     @staticmethod
     async def get_monitored_feeds(ctx: discord.AutocompleteContext):
         cog = ctx.bot.get_cog('FeedMonitor')
@@ -95,165 +236,259 @@ class FeedMonitor(commands.Cog):
         }
         return list(feeds_map.get(platform, {}).keys())
     # ---------------------- YOUTUBE ----------------------
-    async def youtube_check(self):
+    async def youtube_check(self, urls):
+        """Retorna {url: vídeos novos}; canais com erro ficam de fora."""
         try:
-            await self.update_channel_cache()
-                        
-            valid_ids = []
-            for url in self.youtube_channels.keys():
-                cid = await self.get_channel_id_from_url(url)
-                if cid:
-                    valid_ids.append(cid)            
-            #valid_ids = [cid for cid in (await self.get_channel_id_from_url(url) for url in self.youtube_channels.keys()) if cid]
-            if not valid_ids:
-                return
-
-            async with aiohttp.ClientSession() as session:
-                search_url = f"https://www.googleapis.com/youtube/v3/search?part=snippet&channelId={','.join(valid_ids)}&maxResults=1&order=date&type=video&key={self.current_api_key}"
-                data = await self.cached_api_request(session, search_url)
-
-                for item in data.get('items', []):
-                    channel_id = item['snippet']['channelId']
-                    video_id = item['id']['videoId']
-                    
-                    # Encontrar URL correspondente
-                    channel_url = next((url for url, cid in self.youtube_channels.items() if cid == channel_id), None)
-                    if not channel_url or self.youtube_channels[channel_url] == video_id:
-                        continue
-
-                    # Obter dados do cache
-                    channel_data = self.youtube_channel_cache.get(channel_id, {})
-                    
-                    embed = discord.Embed(
-                        title=item['snippet']['title'],
-                        url=f"https://youtu.be/{video_id}",
-                        description=(item['snippet']['description'][:200] + '...') if len(item['snippet']['description']) > 200 else item['snippet']['description'],
-                        color=discord.Color.red(),
-                        timestamp=datetime.utcnow()
-                    )
-                    embed.set_author(
-                        name=channel_data.get('title', 'Canal YouTube'),
-                        url=f"https://www.youtube.com/channel/{channel_id}"
-                    )
-                    embed.set_image(url=item['snippet']['thumbnails']['high']['url'])
-                    embed.set_footer(text=f"{channel_data.get('subs', 'N/A')} inscritos")
-
-                    self.youtube_channels[channel_url] = video_id
-                    self._save_feeds("youtube", self.youtube_channels)
-                    await self.send_notification("YouTube", embed=embed)
-
-        except Exception as e:
-            if "quotaExceeded" in str(e):
-                print("Cota excedida! Rotacionando chaves e aumentando intervalo.")
-                self.current_api_key = random.choice(config.YOUTUBE_API_KEYS)
-                self.monitor_loop.change_interval(seconds=3600)  # 1 hora
-            else:
-                print(f"Erro no YouTube: {e}")
+            # Título e inscritos, em lotes de 50 canais, no máximo uma vez por dia
+            await self.youtube.refresh_info(urls)
+            results = await self._run_feeds("youtube", urls, self.check_youtube_channel)
+        finally:
+            self._save_youtube_state()
+        return {url: new for url, new in zip(urls, results) if new is not None}
+
+    async def check_youtube_channel(self, url):
+        info = await self.youtube.channel(url)
+        if info is None:
+            print(f"Canal do YouTube não encontrado: {url}")
+            return 0
+        videos = await self.youtube.latest_videos(info)
+        return await self._notify_unseen(
+            "youtube", url, videos,
+            lambda video: video['id'], lambda video: self.youtube_embed(info, video)
+        )
+
+    def _save_youtube_state(self):
+        if self.youtube.dirty:
+            self._save_feeds("youtube_info", self.youtube.channels)
+            self.youtube.dirty = False
+        if self.youtube_quota.dirty:
+            self._save_feeds("youtube_quota", self.youtube_quota.to_dict())
+            self.youtube_quota.dirty = False
+
+    def youtube_embed(self, info, video):
+        description = video['description'] or ""
+        embed = discord.Embed(
+            title=video['title'],
+            url=f"https://youtu.be/{video['id']}",
+            description=(description[:200] + '...') if len(description) > 200 else description,
+            color=discord.Color.red(),
+            timestamp=datetime.utcnow()
+        )
+        embed.set_author(
+            name=info.get('title') or video.get('channel_title') or 'Canal YouTube',
+            url=f"https://www.youtube.com/channel/{info['id']}"
+        )
+        if video['thumbnail']:
+            embed.set_image(url=video['thumbnail'])
+        embed.set_footer(text=f"{info.get('subs') or 'N/A'} inscritos")
+        return embed
 
     # ---------------------- TASKS ----------------------
 
-    async def twitch_check(self):
+    async def twitch_check(self, channels):
+        """
+        Retorna {canal: streams novas}; canais com erro ficam de fora.
+
+        Os IDs dos canais são resolvidos uma vez e guardados; a checagem em si
+        custa uma chamada a /helix/streams a cada TWITCH_BATCH_SIZE canais.
+        """
         headers = {
             'Client-ID': config.TWITCH_CLIENT_ID,
             'Authorization': f'Bearer {config.TWITCH_OAUTH_TOKEN}'
         }
-        async with aiohttp.ClientSession(headers=headers) as session:
-            for channel, last_stream in self.twitch_channels.items():
-                async with session.get(f'https://api.twitch.tv/helix/users?login={channel}') as resp:
-                    user_data = await resp.json()
-                if not user_data.get('data'):
-                    continue
-
-                user = user_data['data'][0]
-                user_id = user['id']
-                display_name = user['display_name']
-                profile_image = user['profile_image_url']
-
-                async with session.get(f'https://api.twitch.tv/helix/streams?user_id={user_id}') as resp:
-                    stream_data = await resp.json()
-
-                if stream_data.get('data'):
-                    stream = stream_data['data'][0]
-                    stream_id = stream['id']
-                    if stream_id != last_stream:
-                        title = stream['title']
-                        thumbnail = stream['thumbnail_url'].replace("{width}", "640").replace("{height}", "360")
-                        url = f"https://twitch.tv/{channel}"
-
-                        embed = discord.Embed(
-                            title=title,
-                            url=url,
-                            color=discord.Color.purple(),
-                            timestamp=datetime.utcnow()
-                        )
-                        embed.set_author(name=display_name, url=url, icon_url=profile_image)
-                        embed.set_image(url=thumbnail)
-                        embed.set_footer(text="Twitch")
-
-                        self.twitch_channels[channel] = stream_id
-                        self._save_feeds("twitch", self.twitch_channels)
-                        await self.send_notification("Twitch", embed=embed)
-                        
-    async def twitter_check(self):
+        await self.resolve_twitch_users(channels, headers)
+
+        # user_id -> canal monitorado
+        user_ids = {}
+        new_items = {}
+        for channel in channels:
+            user = self.twitch_users.get(channel.lower())
+            if user and user.get("id"):
+                user_ids[user["id"]] = channel
+            elif user:
+                # Login que não existe na Twitch: nada a notificar
+                new_items[channel] = 0
+
+        batches = [list(user_ids)[i:i + TWITCH_BATCH_SIZE] for i in range(0, len(user_ids), TWITCH_BATCH_SIZE)]
+        results = await self._run_feeds(
+            "twitch", batches, lambda batch: self._twitch_get("streams", "user_id", batch, headers)
+        )
+
+        for batch, streams in zip(batches, results):
+            if streams is None:
+                continue
+            live = {stream['user_id']: stream for stream in streams}
+            for user_id in batch:
+                channel = user_ids[user_id]
+                stream = live.get(user_id)
+                new_items[channel] = await self._notify_unseen(
+                    "twitch", channel, [stream] if stream else [], lambda stream: stream['id'],
+                    lambda stream: self.twitch_embed(channel, stream)
+                )
+        return new_items
+
+    async def _twitch_get(self, endpoint, param, values, headers):
+        """GET em /helix/{endpoint} com até 100 valores de 'param' de uma vez."""
+        params = [(param, value) for value in values] + [("first", str(TWITCH_BATCH_SIZE))]
+        async with self._get_session().get(
+            f'https://api.twitch.tv/helix/{endpoint}', params=params, headers=headers
+        ) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+        return data.get('data', [])
+
+    async def resolve_twitch_users(self, channels, headers):
+        """Busca, em lotes, os canais sem ID guardado ou com dados antigos."""
+        now = time.time()
+        logins = sorted({
+            channel.lower() for channel in channels
+            if now - self.twitch_users.get(channel.lower(), {}).get("resolved_at", 0) > TWITCH_USER_TTL
+        })
+        if not logins:
+            return
+
+        batches = [logins[i:i + TWITCH_BATCH_SIZE] for i in range(0, len(logins), TWITCH_BATCH_SIZE)]
+        results = await self._run_feeds(
+            "twitch", batches, lambda batch: self._twitch_get("users", "login", batch, headers)
+        )
+        for batch, users in zip(batches, results):
+            if users is None:
+                continue
+            found = {user['login'].lower(): user for user in users}
+            for login in batch:
+                user = found.get(login, {})
+                self.twitch_users[login] = {
+                    "id": user.get('id'),
+                    "display_name": user.get('display_name', login),
+                    "profile_image_url": user.get('profile_image_url'),
+                    "resolved_at": now
+                }
+        self._save_feeds("twitch_users", self.twitch_users)
+
+    def twitch_embed(self, channel, stream):
+        user = self.twitch_users.get(channel.lower(), {})
+        thumbnail = stream['thumbnail_url'].replace("{width}", "640").replace("{height}", "360")
+        url = f"https://twitch.tv/{channel}"
+
+        embed = discord.Embed(
+            title=stream['title'],
+            url=url,
+            color=discord.Color.purple(),
+            timestamp=datetime.utcnow()
+        )
+        embed.set_author(name=stream.get('user_name') or user.get('display_name', channel), url=url, icon_url=user.get('profile_image_url'))
+        embed.set_image(url=thumbnail)
+        embed.set_footer(text="Twitch")
+        return embed
+
+    async def twitter_check(self, usernames):
+        """Retorna {usuário: tweets novos}; usuários com erro ficam de fora."""
+        results = await self._run_feeds("twitter", usernames, self.check_twitter_user)
+        return {username: result for username, result in zip(usernames, results) if result is not None}
+
+    async def check_twitter_user(self, username):
         headers = {'Authorization': f'Bearer {config.TWITTER_BEARER_TOKEN}'}
-        async with aiohttp.ClientSession(headers=headers) as session:
-            for username, last_tweet in self.twitter_users.items():
-                url = f"https://api.twitter.com/2/tweets/search/recent?query=from:{username}&max_results=1&tweet.fields=created_at,text"
-                async with session.get(url) as resp:
-                    data = await resp.json()
-
-                if 'data' in data and data['data']:
-                    tweet = data['data'][0]
-                    tweet_id = tweet['id']
-                    tweet_text = tweet['text']
-                    tweet_url = f"https://twitter.com/{username}/status/{tweet_id}"
-
-                    if tweet_id != last_tweet:
-                        embed = discord.Embed(
-                            title=f"Novo tweet de @{username}",
-                            description=(tweet_text[:200] + '...') if len(tweet_text) > 200 else tweet_text,
-                            url=tweet_url,
-                            color=discord.Color.blue(),
-                            timestamp=datetime.utcnow()
-                        )
-                        embed.set_footer(text="Twitter")
-
-                        self.twitter_users[username] = tweet_id
-                        self._save_feeds("twitter", self.twitter_users)
-                        await self.send_notification("Twitter", embed=embed)
-    async def rss_check(self):
-        async with aiohttp.ClientSession() as session:
-            for feed_url, last_entry in self.rss_feeds.items():
-                try:
-                    async with session.get(feed_url) as resp:
-                        feed_data = await resp.text()
-                        feed = feedparser.parse(feed_data)
-
-                        if not feed.entries:
-                            continue
-
-                        latest_entry = feed.entries[0]
-                        entry_id = latest_entry.get('id', latest_entry.link)
-                        title = latest_entry.get('title', 'Nova publicação')
-                        link = latest_entry.get('link')
-                        summary = latest_entry.get('summary', '')
-
-                        if entry_id != last_entry:
-                            embed = discord.Embed(
-                                title=title,
-                                url=link,
-                                description=(summary[:200] + '...') if len(summary) > 200 else summary,
-                                color=discord.Color.gold(),
-                                timestamp=datetime.utcnow()
-                            )
-                            embed.set_author(name=feed.feed.get('title', 'RSS'))
-                            embed.set_footer(text="RSS")
-
-                            self.rss_feeds[feed_url] = entry_id
-                            self._save_feeds("rss", self.rss_feeds)
-                            await self.send_notification("RSS", embed=embed)
-                except Exception as e:
-                    print(f"Erro ao verificar RSS {feed_url}: {e}")
+        # 10 é o mínimo aceito pela API; os tweets vêm do mais novo ao mais antigo
+        url = f"https://api.twitter.com/2/tweets/search/recent?query=from:{username}&max_results={TWITTER_MAX_RESULTS}&tweet.fields=created_at,text"
+        # Depois da primeira checagem só vêm os tweets mais novos que o último visto
+        since_id = self.seen.newest("twitter", username)
+        if since_id:
+            url += f"&since_id={since_id}"
+        async with self._get_session().get(url, headers=headers) as resp:
+            data = await resp.json()
+
+        def build_embed(tweet):
+            tweet_text = tweet['text']
+            embed = discord.Embed(
+                title=f"Novo tweet de @{username}",
+                description=(tweet_text[:200] + '...') if len(tweet_text) > 200 else tweet_text,
+                url=f"https://twitter.com/{username}/status/{tweet['id']}",
+                color=discord.Color.blue(),
+                timestamp=datetime.utcnow()
+            )
+            embed.set_footer(text="Twitter")
+            return embed
+
+        return await self._notify_unseen(
+            "twitter", username, data.get('data') or [], lambda tweet: tweet['id'], build_embed
+        )
+
+    async def rss_check(self, feed_urls):
+        """Retorna {feed: entradas novas}; feeds com erro ficam de fora."""
+        results = await self._run_feeds("rss", feed_urls, self.check_rss_feed)
+        return {feed_url: result for feed_url, result in zip(feed_urls, results) if result is not None}
+
+    async def check_rss_feed(self, feed_url):
+        # Validadores HTTP e hash do último corpo baixado deste feed
+        state = self.rss_state.get(feed_url, {})
+        stats = self.rss_stats[feed_url]
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+
+        stats["requests"] += 1
+        async with self._get_session().get(feed_url, headers=headers) as resp:
+            if resp.status == 304:
+                # Nada mudou: nem corpo, nem parse
+                stats["not_modified"] += 1
+                stats["bytes_saved"] += state.get("length", 0)
+                stats["parse_ms_saved"] += state.get("parse_ms", 0)
+                return 0
+            resp.raise_for_status()
+            body = await resp.read()
+            new_state = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "hash": hashlib.sha256(body).hexdigest(),
+                "length": len(body),
+                "parse_ms": state.get("parse_ms", 0),
+            }
+        stats["bytes_received"] += len(body)
+
+        if new_state["hash"] == state.get("hash"):
+            # Servidor sem suporte a validadores, mas o conteúdo é o mesmo
+            stats["unchanged"] += 1
+            stats["parse_ms_saved"] += state.get("parse_ms", 0)
+            self._save_rss_state(feed_url, new_state)
+            return 0
+
+        started = time.perf_counter()
+        feed = feedparser.parse(body)
+        new_state["parse_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        stats["parsed"] += 1
+
+        entries = [entry for entry in feed.entries if entry.get('id') or entry.get('link')]
+        # A maioria dos feeds já vem do mais novo ao mais antigo; quando todos têm data, ordena por ela
+        if entries and all(entry.get('published_parsed') or entry.get('updated_parsed') for entry in entries):
+            entries.sort(key=lambda entry: entry.get('published_parsed') or entry.get('updated_parsed'), reverse=True)
+
+        def build_embed(entry):
+            summary = entry.get('summary', '')
+            embed = discord.Embed(
+                title=entry.get('title', 'Nova publicação'),
+                url=entry.get('link'),
+                description=(summary[:200] + '...') if len(summary) > 200 else summary,
+                color=discord.Color.gold(),
+                timestamp=datetime.utcnow()
+            )
+            embed.set_author(name=feed.feed.get('title', 'RSS'))
+            embed.set_footer(text="RSS")
+            return embed
+
+        new_entries = await self._notify_unseen(
+            "rss", feed_url, entries, lambda entry: entry.get('id') or entry.get('link'), build_embed
+        )
+
+        # Grava o hash depois de enfileirar as notificações; falhas de envio o dispatcher repete
+        self._save_rss_state(feed_url, new_state)
+        return new_entries
+
+    def _save_rss_state(self, feed_url, new_state):
+        if feed_url in self.rss_feeds and self.rss_state.get(feed_url) != new_state:
+            self.rss_state[feed_url] = new_state
+            self._save_feeds("rss_state", self.rss_state)
 
     @monitor.command(name="adicionar", description="Adiciona um feed ao monitoramento")
     async def add_feed(
@@ -271,6 +506,7 @@ class FeedMonitor(commands.Cog):
 
         plataformas[plataforma][target] = None
         self._save_feeds(plataforma, plataformas[plataforma])
+        self.scheduler.add(plataforma, target)
         await ctx.respond(f"✅ {target} adicionado ao monitoramento de {plataforma.title()}!", ephemeral=True)
 
 
@@ -293,6 +529,16 @@ class FeedMonitor(commands.Cog):
         if target in plataformas[plataforma]:
             del plataformas[plataforma][target]
             self._save_feeds(plataforma, plataformas[plataforma])
+            if self.scheduler.remove(plataforma, target):
+                self._save_feeds("schedule", self.scheduler.history)
+            self.seen.remove(plataforma, target)
+            self._save_seen()
+            if plataforma == "rss":
+                self.rss_stats.pop(target, None)
+                if self.rss_state.pop(target, None) is not None:
+                    self._save_feeds("rss_state", self.rss_state)
+            if plataforma == "youtube" and self.youtube.channels.pop(target, None) is not None:
+                self._save_feeds("youtube_info", self.youtube.channels)
             await ctx.respond(f"✅ {target} removido do monitoramento de {plataforma.title()}!", ephemeral=True)
         else:
             await ctx.respond("❌ Feed não encontrado!", ephemeral=True)
@@ -300,141 +546,154 @@ class FeedMonitor(commands.Cog):
 
     @monitor.command(name="testar", description="Força checagem dos feeds agora")
     async def testar(self, ctx):
-        await self.youtube_check()
-        await self.twitch_check()
-        await self.twitter_check()
-        await self.rss_check()
-        await ctx.respond("✅ Checagem manual concluída!", ephemeral=True)
+        await ctx.defer(ephemeral=True)
+        await self.check_all()
+        await ctx.respond(f"✅ Checagem manual concluída em {self.last_cycle:.1f}s!", ephemeral=True)
+
+    @monitor.command(name="estatisticas", description="Mostra quanto as checagens condicionais de RSS economizaram")
+    @commands.has_permissions(administrator=True)
+    async def estatisticas(self, ctx):
+        embed = discord.Embed(title="📡 Feeds RSS", color=discord.Color.gold())
+        cache = self.api_request_cache.stats()
+        embed.description = (
+            f"Cache da API: {cache['size']}/{cache['maxsize']} · "
+            f"acertos {cache['hit_rate']:.0%} ({cache['hits']}/{cache['hits'] + cache['misses']})"
+        )
+        if self.last_cycle is not None:
+            embed.description += f"\nÚltimo ciclo: {self.last_cycle:.1f}s"
+        sent = self.dispatcher.counters
+        embed.description += (
+            f"\nNotificações: {sent['sent']} em {sent['messages']} mensagem(ns) · "
+            f"na fila {self.dispatcher.pending()} · falhas {sent['failed'] + sent['dropped']}"
+        )
+        for feed_url in list(self.rss_feeds)[:24]:
+            stats = self.rss_stats[feed_url]
+            embed.add_field(
+                name=feed_url[:256],
+                value=(
+                    f"Requisições: {stats['requests']} · 304: {stats['not_modified']} · "
+                    f"Iguais: {stats['unchanged']} · Parses: {stats['parsed']}\n"
+                    f"Baixado: {stats['bytes_received'] / 1024:.1f} KB · "
+                    f"Economizado: {stats['bytes_saved'] / 1024:.1f} KB, {stats['parse_ms_saved']:.0f} ms de parse"
+                ),
+                inline=False
+            )
+        quota = self.youtube_quota.stats()
+        if quota:
+            embed.add_field(
+                name="🔑 Cota do YouTube hoje",
+                value="\n".join(f"`{key['key']}`: {key['used']} usadas · {key['remaining']} restantes" for key in quota),
+                inline=False
+            )
+        await ctx.respond(embed=embed, ephemeral=True)
+
+    @monitor.command(name="agenda", description="Mostra quando cada feed será checado")
+    @commands.has_permissions(administrator=True)
+    async def agenda(self, ctx):
+        lines = []
+        for platform, target, next_in, interval, errors in self.scheduler.agenda()[:20]:
+            line = f"`{platform}` {target[:60]} · em {max(0, next_in) / 60:.0f} min · a cada {interval / 60:.0f} min"
+            if errors:
+                line += f" · ⚠️ {errors} erro(s)"
+            lines.append(line)
+        embed = discord.Embed(
+            title="🗓️ Agenda dos feeds",
+            description="\n".join(lines) or "Nenhum feed agendado.",
+            color=discord.Color.blurple()
+        )
+        await ctx.respond(embed=embed, ephemeral=True)
 
     @monitor.command(name="repostar", description="Reenvia o último conteúdo conhecido de cada feed")
     async def repostar(self, ctx):
         await ctx.defer()
-        async with aiohttp.ClientSession() as session:
-            # YouTube
-            for channel_url, video_id in self.youtube_channels.items():
-                if not video_id:
-                    continue
-                video_url = f"https://www.googleapis.com/youtube/v3/videos?part=snippet&id={video_id}&key={config.YOUTUBE_API_KEY}"
-                async with session.get(video_url) as resp:
-                    data = await resp.json()
-                if 'items' not in data or not data['items']:
-                    continue
-                snippet = data['items'][0]['snippet']
-                title = snippet['title']
-                desc = snippet['description']
-                thumb = snippet['thumbnails']['high']['url']
-                channel_title = snippet['channelTitle']
-                embed = discord.Embed(
-                    title=title,
-                    url=f"https://youtu.be/{video_id}",
-                    description=(desc[:200] + "...") if len(desc) > 200 else desc,
-                    color=discord.Color.red(),
-                    timestamp=datetime.utcnow()
-                )
-                embed.set_author(name=channel_title)
-                embed.set_image(url=thumb)
-                embed.set_footer(text="YouTube (repostado)")
-                await self.send_notification("YouTube", embed=embed)
-                break  # apenas um
-
-            # Twitch
-            for channel, stream_id in self.twitch_channels.items():
-                if not stream_id:
-                    continue
-                url = f"https://twitch.tv/{channel}"
-                embed = discord.Embed(
-                    title=f"{channel} pode estar ao vivo!",
-                    url=url,
-                    description="Repost de teste do último stream conhecido.",
-                    color=discord.Color.purple(),
-                    timestamp=datetime.utcnow()
-                )
-                embed.set_footer(text="Twitch (repostado)")
-                await self.send_notification("Twitch", embed=embed)
-                break
-
-            # Twitter
-            for username, tweet_id in self.twitter_users.items():
-                if not tweet_id:
-                    continue
-                tweet_url = f"https://twitter.com/{username}/status/{tweet_id}"
-                embed = discord.Embed(
-                    title=f"Repost de @{username}",
-                    description="Último tweet repostado.",
-                    url=tweet_url,
-                    color=discord.Color.blue(),
-                    timestamp=datetime.utcnow()
-                )
-                embed.set_footer(text="Twitter (repostado)")
-                await self.send_notification("Twitter", embed=embed)
-                break
-
-            # RSS
-            for feed_url, entry_id in self.rss_feeds.items():
-                if not entry_id:
-                    continue
-                feed_data = await session.get(feed_url)
-                text = await feed_data.text()
-                import feedparser
-                feed = feedparser.parse(text)
-                if not feed.entries:
-                    continue
-                entry = feed.entries[0]
-                embed = discord.Embed(
-                    title=entry.title,
-                    url=entry.link,
-                    description=(entry.get("summary", "")[:200] + "...") if len(entry.get("summary", "")) > 200 else entry.get("summary", ""),
-                    color=discord.Color.gold(),
-                    timestamp=datetime.utcnow()
-                )
-                embed.set_author(name=feed.feed.get("title", "RSS"))
-                embed.set_footer(text="RSS (repostado)")
-                await self.send_notification("RSS", embed=embed)
+        session = self._get_session()
+        # YouTube
+        for channel_url, video_id in self.youtube_channels.items():
+            if not video_id:
+                continue
+            try:
+                video = await self.youtube.video(video_id)
+                info = await self.youtube.channel(channel_url)
+            except QuotaExhausted:
+                print("Cota do YouTube esgotada; repostagem do YouTube ignorada.")
                 break
+            finally:
+                self._save_youtube_state()
+            if video is None or info is None:
+                continue
+            embed = self.youtube_embed(info, video)
+            embed.set_footer(text="YouTube (repostado)")
+            await self.send_notification("YouTube", embed=embed)
+            break  # apenas um
+
+        # Twitch
+        for channel, stream_id in self.twitch_channels.items():
+            if not stream_id:
+                continue
+            url = f"https://twitch.tv/{channel}"
+            embed = discord.Embed(
+                title=f"{channel} pode estar ao vivo!",
+                url=url,
+                description="Repost de teste do último stream conhecido.",
+                color=discord.Color.purple(),
+                timestamp=datetime.utcnow()
+            )
+            embed.set_footer(text="Twitch (repostado)")
+            await self.send_notification("Twitch", embed=embed)
+            break
+
+        # Twitter
+        for username, tweet_id in self.twitter_users.items():
+            if not tweet_id:
+                continue
+            tweet_url = f"https://twitter.com/{username}/status/{tweet_id}"
+            embed = discord.Embed(
+                title=f"Repost de @{username}",
+                description="Último tweet repostado.",
+                url=tweet_url,
+                color=discord.Color.blue(),
+                timestamp=datetime.utcnow()
+            )
+            embed.set_footer(text="Twitter (repostado)")
+            await self.send_notification("Twitter", embed=embed)
+            break
+
+        # RSS
+        for feed_url, entry_id in self.rss_feeds.items():
+            if not entry_id:
+                continue
+            async with session.get(feed_url) as resp:
+                text = await resp.text()
+            feed = feedparser.parse(text)
+            if not feed.entries:
+                continue
+            entry = feed.entries[0]
+            embed = discord.Embed(
+                title=entry.title,
+                url=entry.link,
+                description=(entry.get("summary", "")[:200] + "...") if len(entry.get("summary", "")) > 200 else entry.get("summary", ""),
+                color=discord.Color.gold(),
+                timestamp=datetime.utcnow()
+            )
+            embed.set_author(name=feed.feed.get("title", "RSS"))
+            embed.set_footer(text="RSS (repostado)")
+            await self.send_notification("RSS", embed=embed)
+            break
 
         await ctx.respond("✅ Últimos conteúdos repostados!", ephemeral=True)
 
 
     # ---------------------- NOTIFICAÇÃO ---------------------- #
     async def send_notification(self, plataforma: str, content: str = None, embed: discord.Embed = None):
-        channel = self.bot.get_channel(config.NOTIFICATION_CHANNEL_ID)
-        if channel:
-            if embed:
-                await channel.send(embed=embed)
-            else:
-                fallback_embed = discord.Embed(
-                    title=f"Novo conteúdo na {plataforma}!",
-                    description=content or "",
-                    color=discord.Color.blurple(),
-                    timestamp=datetime.utcnow()
-                )
-                await channel.send(embed=fallback_embed)
-
-    @commands.Cog.listener()
-    async def on_ready(self):
-        if not self.monitor_loop.is_running():
-            self.monitor_loop.start()
-        print(f"✅ {self.__class__.__name__} carregado com sucesso!")
-
-    @tasks.loop(seconds=600)
-    async def monitor_loop(self):
-        await self.youtube_check()
-        await self.twitch_check()
-        await self.twitter_check()
-        await self.rss_check()
-
-    @tasks.loop(seconds=1800)
-    async def monitor_loop(self):
-        await self.youtube_check()
-        await self.twitch_check()
-        await self.twitter_check()
-        await self.rss_check()
-
-    @commands.Cog.listener()
-    async def on_ready(self):
-        if not self.monitor_loop.is_running():
-            self.monitor_loop.start()
-        print(f"✅ {self.__class__.__name__} carregado!")
+        """Coloca a notificação na fila de envio; não espera o Discord."""
+        if not embed:
+            embed = discord.Embed(
+                title=f"Novo conteúdo na {plataforma}!",
+                description=content or "",
+                color=discord.Color.blurple(),
+                timestamp=datetime.utcnow()
+            )
+        self.dispatcher.enqueue(config.NOTIFICATION_CHANNEL_ID, embed)
 
 
 def setup(bot):
@@ -0,0 +1,189 @@
+# cogs/Feeds/scheduler.py
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Checagens desejadas dentro do intervalo médio entre publicações
+CHECKS_PER_POST = 4
+# Peso de cada intervalo observado na média móvel
+GAP_WEIGHT = 0.3
+# Variação aleatória do intervalo, para os feeds não vencerem todos juntos
+JITTER = 0.1
+
+
+class FeedScheduler:
+    """
+    Agenda de checagem individual de cada feed.
+
+    Os feeds ficam em um heap ordenado pelo horário da próxima checagem, então
+    cada rodada só checa quem venceu. O intervalo de cada feed acompanha a
+    frequência com que ele publica: a média móvel do tempo entre publicações
+    (ou o tempo desde a última, se ele está parado há mais tempo que isso)
+    dividida por CHECKS_PER_POST, limitada a [min_interval, max_interval].
+    Erros seguidos dobram o intervalo, até max_interval.
+
+    A média e a última publicação de cada feed ficam em 'history', que o cog
+    persiste para sobreviver a reinícios.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        default_interval: float,
+        history: Optional[Dict[str, Dict[str, float]]] = None,
+        batch_window: float = 30
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        # Feeds que vencem dentro desta janela são checados na mesma rodada
+        self.batch_window = batch_window
+        # "plataforma:feed" -> {"avg_gap": segundos, "last_post": epoch}
+        self.history: Dict[str, Dict[str, float]] = history if history is not None else {}
+        # (horário, ordem, plataforma, feed); entradas antigas são descartadas ao sair do heap
+        self._heap: List[Tuple[float, int, str, str]] = []
+        self._order = itertools.count()
+        # (plataforma, feed) -> horário agendado atual
+        self._scheduled: Dict[Tuple[str, str], float] = {}
+        self._feeds: set = set()
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._wakeup = asyncio.Event()
+
+    @staticmethod
+    def _key(platform: str, target: str) -> str:
+        return f"{platform}:{target}"
+
+    def _schedule(self, platform: str, target: str, when: float):
+        self._scheduled[(platform, target)] = when
+        heapq.heappush(self._heap, (when, next(self._order), platform, target))
+
+    def add(self, platform: str, target: str, delay: float = 0):
+        """Passa a monitorar um feed, com a primeira checagem daqui a 'delay' segundos"""
+        self._feeds.add((platform, target))
+        self._schedule(platform, target, time.time() + delay)
+        self._wakeup.set()
+
+    def remove(self, platform: str, target: str) -> bool:
+        """Para de monitorar um feed. Retorna True se o histórico mudou."""
+        self._feeds.discard((platform, target))
+        self._scheduled.pop((platform, target), None)
+        self._errors.pop((platform, target), None)
+        return self.history.pop(self._key(platform, target), None) is not None
+
+    def interval(self, platform: str, target: str, now: Optional[float] = None) -> float:
+        """Intervalo normal (sem backoff) do feed, de acordo com o histórico"""
+        now = now or time.time()
+        history = self.history.get(self._key(platform, target))
+        if not history:
+            return self.default_interval
+        idle = now - history["last_post"]
+        if not history.get("avg_gap"):
+            # Nenhum intervalo medido ainda: parte do padrão e cresce enquanto o feed está parado
+            return min(self.max_interval, max(self.default_interval, idle / CHECKS_PER_POST))
+        expected_gap = max(history["avg_gap"], idle)
+        return min(self.max_interval, max(self.min_interval, expected_gap / CHECKS_PER_POST))
+
+    def record(self, platform: str, target: str, new_items: Optional[int], now: Optional[float] = None) -> bool:
+        """
+        Registra o resultado de uma checagem e agenda a próxima.
+
+        'new_items' é quantos itens novos o feed tinha, ou None se a checagem
+        falhou. Retorna True se o histórico mudou.
+        """
+        if (platform, target) not in self._feeds:
+            return False
+        now = now or time.time()
+        changed = False
+
+        if new_items is None:
+            errors = self._errors[(platform, target)] = self._errors.get((platform, target), 0) + 1
+            interval = min(self.max_interval, self.interval(platform, target, now) * 2 ** errors)
+        else:
+            self._errors.pop((platform, target), None)
+            key = self._key(platform, target)
+            history = self.history.get(key)
+            if history is None:
+                # Primeira checagem do feed: o tempo parado passa a contar daqui
+                self.history[key] = {"avg_gap": 0, "last_post": now}
+                changed = True
+            elif new_items:
+                gap = (now - history["last_post"]) / new_items
+                avg_gap = history.get("avg_gap")
+                history["avg_gap"] = gap if not avg_gap else avg_gap * (1 - GAP_WEIGHT) + gap * GAP_WEIGHT
+                history["last_post"] = now
+                changed = True
+            interval = self.interval(platform, target, now)
+
+        self._schedule(platform, target, now + interval * random.uniform(1 - JITTER, 1 + JITTER))
+        return changed
+
+    def reschedule(self, due: Dict[str, List[str]]):
+        """
+        Reagenda como erro os feeds de 'due' (retirados com pop_due()) que
+        não voltaram para a agenda, para uma checagem interrompida não
+        tirá-los do monitoramento.
+        """
+        for platform, targets in due.items():
+            for target in targets:
+                if (platform, target) not in self._scheduled:
+                    self.record(platform, target, None)
+
+    def _peek(self) -> Optional[Tuple[float, int, str, str]]:
+        # Descarta entradas de feeds removidos ou reagendados
+        while self._heap:
+            when, _, platform, target = self._heap[0]
+            if self._scheduled.get((platform, target)) == when:
+                return self._heap[0]
+            heapq.heappop(self._heap)
+        return None
+
+    def next_due(self) -> Optional[float]:
+        """Horário da próxima checagem, ou None se não há feeds"""
+        entry = self._peek()
+        return entry[0] if entry else None
+
+    def pop_due(self, now: Optional[float] = None) -> Dict[str, List[str]]:
+        """
+        Retira da agenda os feeds vencidos (e os que vencem dentro de
+        batch_window), agrupados por plataforma. Eles só voltam para a agenda
+        com record() ou reschedule().
+        """
+        now = now or time.time()
+        due: Dict[str, List[str]] = {}
+        entry = self._peek()
+        if entry is None or entry[0] > now:
+            return due
+        while entry is not None and entry[0] <= now + self.batch_window:
+            _, _, platform, target = heapq.heappop(self._heap)
+            del self._scheduled[(platform, target)]
+            due.setdefault(platform, []).append(target)
+            entry = self._peek()
+        return due
+
+    async def wait(self):
+        """Dorme até o próximo feed vencer ou um feed ser adicionado"""
+        self._wakeup.clear()
+        next_due = self.next_due()
+        timeout = None if next_due is None else max(0.0, next_due - time.time())
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def agenda(self) -> List[Tuple[str, str, float, float, int]]:
+        """
+        Retorna (plataforma, feed, segundos até a checagem, intervalo atual,
+        erros seguidos) de cada feed agendado, do mais próximo ao mais distante.
+        """
+        now = time.time()
+        return sorted(
+            (
+                (platform, target, when - now, self.interval(platform, target, now), self._errors.get((platform, target), 0))
+                for (platform, target), when in self._scheduled.items()
+            ),
+            key=lambda entry: entry[2]
+        )
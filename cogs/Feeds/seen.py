@@ -0,0 +1,84 @@
+# cogs/Feeds/seen.py
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set
+
+
+class SeenStore:
+    """
+    IDs já notificados de cada feed.
+
+    Cada feed guarda no máximo 'capacity' IDs, em um deque com limite (para
+    persistir em ordem e descartar os mais antigos) e um set (para consulta
+    O(1)). Só os 'capacity' itens mais recentes de cada checagem são
+    considerados, então um item que ainda aparece no feed nunca sai da
+    memória e não é notificado de novo.
+
+    Persistido como {"plataforma:feed": [IDs do mais antigo ao mais novo]}.
+    """
+
+    def __init__(self, data: Optional[Dict[str, List[str]]] = None, capacity: int = 100):
+        self.capacity = capacity
+        self._recent: Dict[str, Deque[str]] = {}
+        self._sets: Dict[str, Set[str]] = {}
+        self.dirty = False
+        for key, ids in (data or {}).items():
+            self._recent[key] = deque(ids, maxlen=capacity)
+            self._sets[key] = set(self._recent[key])
+
+    @staticmethod
+    def _key(platform: str, target: str) -> str:
+        return f"{platform}:{target}"
+
+    def _remember(self, key: str, entry_id: str):
+        recent = self._recent.setdefault(key, deque(maxlen=self.capacity))
+        seen = self._sets.setdefault(key, set())
+        if entry_id in seen:
+            return
+        if len(recent) == recent.maxlen:
+            seen.discard(recent[0])
+        recent.append(entry_id)
+        seen.add(entry_id)
+        self.dirty = True
+
+    def unseen(self, platform: str, target: str, ids: Iterable, last_id=None) -> List[str]:
+        """
+        Retorna os IDs ainda não notificados, do mais antigo ao mais novo.
+
+        'ids' vem do mais novo ao mais antigo, como as APIs retornam. Na
+        primeira checagem de um feed nada do histórico é notificado: se
+        'last_id' (o único ID que o formato antigo guardava) aparece na
+        lista, só os itens mais novos que ele são retornados; senão, só o
+        mais novo. O restante é marcado como visto.
+        """
+        key = self._key(platform, target)
+        ids = [str(entry_id) for entry_id in ids][:self.capacity]
+        if key in self._sets:
+            seen = self._sets[key]
+            return [entry_id for entry_id in reversed(ids) if entry_id not in seen]
+
+        if last_id is not None and str(last_id) in ids:
+            new = ids[:ids.index(str(last_id))]
+        else:
+            new = ids[:1]
+        for entry_id in reversed(ids[len(new):]):
+            self._remember(key, entry_id)
+        return list(reversed(new))
+
+    def add(self, platform: str, target: str, entry_id):
+        """Marca um ID como notificado"""
+        self._remember(self._key(platform, target), str(entry_id))
+
+    def newest(self, platform: str, target: str) -> Optional[str]:
+        """Último ID marcado como visto no feed, ou None se ele nunca foi checado"""
+        recent = self._recent.get(self._key(platform, target))
+        return recent[-1] if recent else None
+
+    def remove(self, platform: str, target: str):
+        """Esquece um feed"""
+        key = self._key(platform, target)
+        if self._recent.pop(key, None) is not None:
+            self._sets.pop(key, None)
+            self.dirty = True
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {key: list(recent) for key, recent in self._recent.items()}
@@ -0,0 +1,308 @@
+# cogs/Feeds/youtube.py
+import asyncio
+import hashlib
+import re
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode
+import aiohttp
+import feedparser
+import pytz
+from cache import TTLCache
+
+API_URL = "https://www.googleapis.com/youtube/v3"
+ATOM_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={}"
+# Unidades de cota de cada endpoint usado; search (100) não é mais usado
+COSTS = {"channels": 1, "playlistItems": 1, "videos": 1}
+# A cota diária do YouTube zera à meia-noite do horário do Pacífico
+QUOTA_TIMEZONE = pytz.timezone("America/Los_Angeles")
+CHANNEL_ID_PATTERN = re.compile(r"UC[\w-]{22}")
+# ID do canal no HTML da página, para resolver sem gastar cota
+PAGE_CHANNEL_ID = re.compile(r'"(?:externalId|channelId)":"(UC[\w-]{22})"')
+# Título e inscritos de cada canal são atualizados uma vez por dia
+CHANNEL_INFO_TTL = 24 * 60 * 60
+# Canais que não foram encontrados só são procurados de novo depois disso
+UNRESOLVED_TTL = 24 * 60 * 60
+# IDs aceitos por chamada de channels.list
+CHANNELS_BATCH_SIZE = 50
+# Vídeos buscados na playlist de uploads quando o feed Atom falha
+PLAYLIST_MAX_RESULTS = 10
+
+
+class QuotaExhausted(Exception):
+    """Nenhuma chave tem cota suficiente para a chamada."""
+
+
+class YouTubeAPIError(Exception):
+    """A API respondeu com erro."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(f"{reason}: {message}")
+        self.reason = reason
+
+
+class QuotaLedger:
+    """
+    Cota gasta por cada chave da API no dia (horário do Pacífico).
+
+    Cada chamada é debitada antes de sair, na chave menos usada entre as
+    que continuam abaixo de daily_quota - reserve depois dela. O consumo se
+    espalha entre as chaves e a troca acontece antes de alguma estourar; a
+    reserva cobre erros de contagem. Uma chave que mesmo assim receber
+    quotaExceeded é dada como esgotada até o fim do dia.
+
+    Persistido como {"date": "AAAA-MM-DD", "used": {hash da chave: unidades}};
+    as chaves em si não vão para o disco.
+    """
+
+    def __init__(self, keys: List[str], daily_quota: int, reserve: int = 0, state: Optional[dict] = None):
+        self.keys = list(keys)
+        self.daily_quota = daily_quota
+        self.reserve = reserve
+        state = state or {}
+        self.date = state.get("date")
+        self.used: Dict[str, int] = dict(state.get("used", {}))
+        self.dirty = False
+        self._roll()
+
+    @staticmethod
+    def key_id(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()[:12]
+
+    def _roll(self):
+        today = datetime.now(QUOTA_TIMEZONE).date().isoformat()
+        if self.date != today:
+            self.date = today
+            self.used = {}
+            self.dirty = True
+
+    def acquire(self, cost: int) -> str:
+        """
+        Debita 'cost' unidades e retorna a chave a usar.
+
+        Raises:
+            QuotaExhausted: Nenhuma chave comporta a chamada hoje.
+        """
+        self._roll()
+        limit = self.daily_quota - self.reserve
+        candidates = [key for key in self.keys if self.used.get(self.key_id(key), 0) + cost <= limit]
+        if not candidates:
+            raise QuotaExhausted(f"{len(self.keys)} chave(s) sem cota para {cost} unidade(s)")
+        key = min(candidates, key=lambda key: self.used.get(self.key_id(key), 0))
+        self.used[self.key_id(key)] = self.used.get(self.key_id(key), 0) + cost
+        self.dirty = True
+        return key
+
+    def exhaust(self, key: str):
+        """Marca a chave como esgotada até a cota zerar"""
+        self.used[self.key_id(key)] = self.daily_quota
+        self.dirty = True
+
+    def stats(self) -> List[Dict[str, int]]:
+        """Retorna [{"key": hash, "used": unidades, "remaining": unidades}] por chave"""
+        self._roll()
+        return [
+            {
+                "key": self.key_id(key),
+                "used": self.used.get(self.key_id(key), 0),
+                "remaining": max(0, self.daily_quota - self.used.get(self.key_id(key), 0)),
+            }
+            for key in self.keys
+        ]
+
+    def to_dict(self) -> dict:
+        return {"date": self.date, "used": self.used}
+
+
+class YouTubeEngine:
+    """
+    Checagem de canais do YouTube gastando o mínimo de cota.
+
+    O ID de cada canal é resolvido uma vez (channels.list por handle, nome
+    de usuário ou ID; ou a própria página do canal quando não há cota) e
+    guardado junto com título, playlist de uploads e inscritos. Os vídeos
+    vêm do feed Atom público do canal, que não gasta cota; a playlist de
+    uploads (1 unidade) só é usada se o feed falhar.
+
+    'channels' ({url: dados do canal}) é persistido pelo cog quando 'dirty'.
+    """
+
+    def __init__(
+        self,
+        get_session: Callable[[], aiohttp.ClientSession],
+        ledger: QuotaLedger,
+        channels: Dict[str, dict],
+        cache: Optional[TTLCache] = None
+    ):
+        self.get_session = get_session
+        self.ledger = ledger
+        self.channels = channels
+        # Respostas de chamadas que podem se repetir, por endpoint e parâmetros
+        self.cache = cache
+        self.dirty = False
+
+    async def _api(self, endpoint: str, params: Dict[str, str], cache: bool = False) -> dict:
+        """
+        Chama a API debitando a cota no ledger. Uma chave que responder
+        quotaExceeded é marcada como esgotada e a chamada vai para a próxima.
+        Com 'cache', a resposta é guardada sem a chave na identificação, então
+        a rotação de chaves não duplica entradas e um acerto não gasta cota.
+        """
+        cache_key = f"{endpoint}?{urlencode(sorted(params.items()))}"
+        if cache and self.cache is not None:
+            data = self.cache.get(cache_key)
+            if data is not None:
+                return data
+
+        for _ in range(len(self.ledger.keys)):
+            key = self.ledger.acquire(COSTS[endpoint])
+            url = f"{API_URL}/{endpoint}?{urlencode({**params, 'key': key})}"
+            async with self.get_session().get(url) as resp:
+                data = await resp.json()
+
+            error = data.get("error")
+            if not error:
+                if cache and self.cache is not None:
+                    self.cache.set(cache_key, data)
+                return data
+            reason = (error.get("errors") or [{}])[0].get("reason", "unknown")
+            if reason in ("quotaExceeded", "dailyLimitExceeded", "rateLimitExceeded"):
+                self.ledger.exhaust(key)
+                continue
+            raise YouTubeAPIError(reason, error.get("message", ""))
+        raise QuotaExhausted("todas as chaves responderam quotaExceeded")
+
+    async def channel(self, url: str) -> Optional[dict]:
+        """
+        Retorna os dados guardados do canal, resolvendo-o na primeira vez.
+        Um canal não encontrado também é guardado (com "id" None) e só é
+        procurado de novo depois de UNRESOLVED_TTL, para não gastar cota
+        a cada ciclo.
+        """
+        info = self.channels.get(url)
+        if info is not None and (info.get("id") or time.time() - info.get("resolved_at", 0) < UNRESOLVED_TTL):
+            return info if info.get("id") else None
+
+        info = await self._resolve(url)
+        self.channels[url] = info if info is not None else {"id": None, "resolved_at": time.time()}
+        self.dirty = True
+        return info
+
+    async def _resolve(self, url: str) -> Optional[dict]:
+        url = url.strip()
+        match = CHANNEL_ID_PATTERN.search(url)
+        if match and ("/channel/" in url or url.startswith("UC")):
+            params = {"id": match.group(0)}
+        elif "/@" in url:
+            params = {"forHandle": "@" + url.split("/@", 1)[1].split("/")[0].split("?")[0]}
+        elif "/user/" in url:
+            params = {"forUsername": url.split("/user/", 1)[1].split("/")[0]}
+        else:
+            # URLs personalizadas (/c/...) não têm busca na API
+            params = None
+
+        if params:
+            try:
+                data = await self._api("channels", {"part": "snippet,statistics,contentDetails", **params})
+                items = data.get("items") or []
+                return self._channel_info(items[0]) if items else None
+            except QuotaExhausted:
+                pass
+            if "id" in params:
+                return self._channel_from_id(params["id"])
+
+        if not url.startswith("http"):
+            return None
+        async with self.get_session().get(url) as resp:
+            html = await resp.text()
+        match = PAGE_CHANNEL_ID.search(html)
+        return self._channel_from_id(match.group(1)) if match else None
+
+    @staticmethod
+    def _channel_info(item: dict) -> dict:
+        return {
+            "id": item["id"],
+            "title": item.get("snippet", {}).get("title"),
+            "uploads": item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads", "UU" + item["id"][2:]),
+            "subs": item.get("statistics", {}).get("subscriberCount"),
+            "updated_at": time.time(),
+        }
+
+    @staticmethod
+    def _channel_from_id(channel_id: str) -> dict:
+        # Sem a API: título e inscritos ficam para o próximo refresh_info
+        return {"id": channel_id, "title": None, "uploads": "UU" + channel_id[2:], "subs": None, "updated_at": 0}
+
+    async def refresh_info(self, urls: List[str]):
+        """Atualiza título e inscritos dos canais com dados de mais de um dia, em lotes"""
+        now = time.time()
+        stale = {
+            info["id"]: url for url in urls
+            if (info := self.channels.get(url)) and info.get("id") and now - info.get("updated_at", 0) > CHANNEL_INFO_TTL
+        }
+        ids = list(stale)
+        for i in range(0, len(ids), CHANNELS_BATCH_SIZE):
+            try:
+                data = await self._api("channels", {"part": "snippet,statistics", "id": ",".join(ids[i:i + CHANNELS_BATCH_SIZE])})
+            except QuotaExhausted:
+                return
+            for item in data.get("items", []):
+                info = self.channels.get(stale.get(item["id"]))
+                if info is not None:
+                    info["title"] = item["snippet"]["title"]
+                    info["subs"] = item.get("statistics", {}).get("subscriberCount")
+                    info["updated_at"] = now
+                    self.dirty = True
+
+    async def latest_videos(self, info: dict) -> List[dict]:
+        """
+        Retorna os vídeos mais recentes do canal, do mais novo ao mais antigo,
+        como dicts com id, title, description, thumbnail e channel_title.
+        """
+        try:
+            async with self.get_session().get(ATOM_URL.format(info["id"])) as resp:
+                resp.raise_for_status()
+                body = await resp.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return await self._playlist_videos(info)
+
+        feed = feedparser.parse(body)
+        videos = []
+        for entry in feed.entries:
+            if not entry.get("yt_videoid"):
+                continue
+            thumbnails = entry.get("media_thumbnail") or [{}]
+            videos.append({
+                "id": entry["yt_videoid"],
+                "title": entry.get("title", ""),
+                "description": entry.get("summary", ""),
+                "thumbnail": thumbnails[0].get("url"),
+                "channel_title": entry.get("author") or feed.feed.get("title"),
+            })
+        return videos
+
+    async def _playlist_videos(self, info: dict) -> List[dict]:
+        data = await self._api(
+            "playlistItems", {"part": "snippet", "playlistId": info["uploads"], "maxResults": PLAYLIST_MAX_RESULTS}
+        )
+        items = sorted(data.get("items", []), key=lambda item: item["snippet"].get("publishedAt", ""), reverse=True)
+        return [self._snippet_video(item["snippet"]["resourceId"]["videoId"], item["snippet"]) for item in items]
+
+    @staticmethod
+    def _snippet_video(video_id: str, snippet: dict) -> dict:
+        thumbnails = snippet.get("thumbnails", {})
+        thumbnail = (thumbnails.get("high") or thumbnails.get("default") or {}).get("url")
+        return {
+            "id": video_id,
+            "title": snippet.get("title", ""),
+            "description": snippet.get("description", ""),
+            "thumbnail": thumbnail,
+            "channel_title": snippet.get("channelTitle"),
+        }
+
+    async def video(self, video_id: str) -> Optional[dict]:
+        """Busca um vídeo pelo ID (1 unidade de cota)"""
+        data = await self._api("videos", {"part": "snippet", "id": video_id}, cache=True)
+        items = data.get("items") or []
+        return self._snippet_video(video_id, items[0]["snippet"]) if items else None
@@ -2,63 +2,43 @@ import discord
 from discord.ext import commands
 from discord import Option
 import json
-import os
-import requests
-import config
+import asyncio
+from database import async_db
+from aqw import aqw_client
 
 class InsigniaCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.insignias_file = config.INSIGNIAS_FILE  # Usando config
-        self.load_insignias()
-
-    def load_insignias(self):
-        """Carrega os dados das insígnias do arquivo JSON"""
-        os.makedirs(os.path.dirname(self.insignias_file), exist_ok=True)
-        try:
-            with open(self.insignias_file, "r") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
-    def save_insignias(self, data):
-        """Salva os dados atualizados no arquivo JSON"""
-        with open(self.insignias_file, "w") as f:
-            json.dump(data, f, indent=4)
 
     @discord.slash_command(name="insignia", description="Verifica requisitos para um cargo")
     async def insignia(self, ctx, role: Option(discord.Role, "Cargo para verificar")):
         await ctx.defer()
         
         # Verifica vinculação do usuário
-        try:
-            with open(config.USERS_FILE, "r") as f:  # Usando config
-                users = json.load(f)
-        except FileNotFoundError:
-            return await ctx.respond("❌ Arquivo de usuários não encontrado!", ephemeral=True)
-        
-        if str(ctx.author.id) not in users:
+        link = await async_db.get_aqw_link(ctx.author.id)
+        if not link:
             return await ctx.respond("❌ Você não está vinculado a uma conta!", ephemeral=True)
 
         # Carrega requisitos
-        insignias = self.load_insignias()
-        requirements = insignias.get(str(role.id))
+        requirements = await async_db.get_insignia(role.id)
 
         if not requirements:
             return await ctx.respond("⚠️ Este cargo não possui requisitos configurados!", ephemeral=True)
 
         # Verificação de progresso
-        ccid = users[str(ctx.author.id)]["ccid"]
-        inventory = requests.get(f"https://account.aq.com/CharPage/Inventory?ccid={ccid}").json()
-        badges = requests.get(f"https://account.aq.com/CharPage/Badges?ccid={ccid}").json()
+        ccid = link["ccid"]
+        inventory, badges = await asyncio.gather(
+            aqw_client.inventory(ccid),
+            aqw_client.badges(ccid)
+        )
         
         missing = []
         
         # Verificação de itens
         if "items" in requirements:
+            totals = inventory.count_matching(item["name"] for item in requirements["items"])
             for item in requirements["items"]:
-                found = [i for i in inventory if item["name"].lower() in i["strName"].lower()]
-                total = sum(i["intCount"] for i in found)
+                total = totals[item["name"]]
                 
                 if item.get("min", 0) > total:
                     missing.append(
@@ -68,8 +48,9 @@ class InsigniaCog(commands.Cog):
 
         # Verificação de badges
         if "badges" in requirements:
+            badge_ids = {b["badgeID"] for b in badges}
             for badge_id in requirements["badges"]:
-                if not any(b["badgeID"] == badge_id for b in badges):
+                if badge_id not in badge_ids:
                     missing.append(f"🎖️ Badge ID {badge_id} não encontrada")
 
         # Verificação de cargos
@@ -99,7 +80,6 @@ class InsigniaCog(commands.Cog):
         badges: Option(str, "IDs separados por vírgula", required=False),
         roles: Option(str, "IDs de cargos separados por vírgula", required=False)
     ):
-        insignias = self.load_insignias()
         new_requirements = {}
 
         # Processamento de itens
@@ -120,8 +100,7 @@ class InsigniaCog(commands.Cog):
         if roles:
             new_requirements["required_roles"] = [int(r.strip()) for r in roles.split(",")]
 
-        insignias[str(role.id)] = new_requirements
-        self.save_insignias(insignias)
+        await async_db.set_insignia(role.id, new_requirements)
         
         await ctx.respond(
             f"✅ Requisitos para **{role.name}** atualizados:\n" +
@@ -132,11 +111,7 @@ class InsigniaCog(commands.Cog):
     @discord.slash_command(name="remover_insignia", description="Remove requisitos de um cargo (Admin)")
     @commands.has_permissions(administrator=True)
     async def remover_insignia(self, ctx, role: Option(discord.Role, "Cargo alvo")):
-        insignias = self.load_insignias()
-        
-        if str(role.id) in insignias:
-            del insignias[str(role.id)]
-            self.save_insignias(insignias)
+        if await async_db.delete_insignia(role.id):
             await ctx.respond(f"❌ Requisitos de **{role.name}** removidos.", ephemeral=True)
         else:
             await ctx.respond("ℹ️ Este cargo não possui requisitos cadastrados.", ephemeral=True)
@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord.commands import slash_command, SlashCommandGroup
 from discord.commands import Option
 import datetime
-import json
+from database import async_db
 
 
 class Moderation(commands.Cog):
@@ -90,9 +90,7 @@ class Moderation(commands.Cog):
 
     @mod.command(description="Mostra o número de advertências de um membro")
     async def warnings(self, ctx, member: Option(discord.Member, "Membro para ver advertências")):
-        await self.open_account(member)
-        users = await self.get_user_data()
-        warns = users[str(member.id)]["warns"]
+        warns = await async_db.get_warns(member.id)
         await ctx.respond(f"ℹ️ {member.display_name} tem {warns} advertências.", ephemeral=True)
 
     @mod.command(description="Adverte um membro (adiciona um warn ao histórico)")
@@ -100,42 +98,11 @@ class Moderation(commands.Cog):
         if not await self.is_moderator(ctx):
             return await ctx.respond("❌ Você não tem permissão para usar este comando.", ephemeral=True)
             
-        await self.open_account(member)
         warns = await self.update_warns(member)
         await ctx.respond(f"⚠️ {member.display_name} foi advertido. Total de advertências: {warns}.", ephemeral=True)
 
-    async def open_account(self, user):
-        try:
-            with open("./Cogs/Moderation/reports.json", "r") as f:
-                users = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            users = {}
-
-        if str(user.id) not in users:
-            users[str(user.id)] = {"warns": 0}
-            with open("./Cogs/Moderation/reports.json", "w") as f:
-                json.dump(users, f, indent=4)
-
-    async def get_user_data(self):
-        try:
-            with open("./Cogs/Moderation/reports.json", "r") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
     async def update_warns(self, user, change=1):
-        users = await self.get_user_data()
-        user_id = str(user.id)
-        
-        if user_id not in users:
-            users[user_id] = {"warns": 0}
-            
-        users[user_id]["warns"] += change
-        
-        with open("./Cogs/Moderation/reports.json", "w") as f:
-            json.dump(users, f, indent=4)
-            
-        return users[user_id]["warns"]
+        return await async_db.add_warns(user.id, change)
 
 def setup(bot):
     bot.add_cog(Moderation(bot))
\ No newline at end of file
@@ -6,11 +6,12 @@ from discord import ButtonStyle
 import json
 import asyncio
 import time
-import requests
 import random
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Set, Optional, TypedDict, Literal
+from database import db, async_db
+from aqw import aqw_client, InventoryIndex
 
 
 class BossData(TypedDict):
@@ -105,12 +106,10 @@ class RaidSystem(commands.Cog):
         ]
 
     def load_raids(self) -> None:
-        for file in self.raids_dir.glob("*.json"):
-            with open(file, "r", encoding="utf-8") as f:
-                raid: RaidData = json.load(f)
-                self.active_raids[file.stem] = raid
-                # Apenas marca as raids que precisam ser reconstruídas
-                raid["needs_rebuild"] = raid["status"] in ["recruiting", "confirming"]
+        for raid_id, raid in db.list_raids().items():
+            self.active_raids[raid_id] = raid
+            # Apenas marca as raids que precisam ser reconstruídas
+            raid["needs_rebuild"] = raid["status"] in ["recruiting", "confirming"]
 
     async def autocomplete_classes(self, ctx: discord.AutocompleteContext):
         boss = ctx.options.get("boss")
@@ -187,15 +186,12 @@ class RaidSystem(commands.Cog):
 
     def save_raid(self, raid_id: str) -> None:
         if raid_id in self.active_raids:
-            with open(self.raids_dir / f"{raid_id}.json", "w", encoding="utf-8") as f:
-                json.dump(self.active_raids[raid_id], f, indent=4)
+            db.save_raid(raid_id, self.active_raids[raid_id])
 
     def delete_raid(self, raid_id: str) -> None:
         if raid_id in self.active_raids:
             del self.active_raids[raid_id]
-        path = self.raids_dir / f"{raid_id}.json"
-        if path.exists():
-            path.unlink()
+        db.delete_raid(raid_id)
 
     async def log_raid(self, raid_id: str, status: Literal["completed", "canceled", "deleted"]) -> None:
         if raid_id not in self.active_raids:
@@ -220,34 +216,22 @@ class RaidSystem(commands.Cog):
             json.dump(log_data, f, indent=4)
 
     async def get_user_data(self, user_id: int) -> Optional[Dict]:
-        users_file = self.data_dir / "users.json"
-        if not users_file.exists():
-            return None
-            
-        with open(users_file, "r") as f:
-            users_data = json.load(f)
-            return users_data.get(str(user_id))
+        return await async_db.get_aqw_link(user_id)
 
-    async def get_user_inventory(self, ccid: str) -> List[Dict]:
+    async def get_user_inventory(self, ccid: str) -> InventoryIndex:
         try:
-            response = requests.get(
-                f"https://account.aq.com/CharPage/Inventory?ccid={ccid}",
-                timeout=10
-            )
-            return response.json()
+            return await aqw_client.inventory(ccid)
         except Exception as e:
             print(f"Erro ao obter inventário: {e}")
-            return []
+            return InventoryIndex([])
 
-    def check_available_classes(self, required_classes: List[str], inventory: List[Dict]) -> List[str]:
+    def check_available_classes(self, required_classes: List[str], inventory: InventoryIndex) -> List[str]:
         # Modo Livre/Juggernaut
         if not required_classes:
-            return [item["strName"] for item in inventory 
-                    if item.get("strType", "").lower() == "class"]
+            return inventory.class_names()
         
         # Resto da lógica original para Meta/Composições
-        user_classes = [item["strName"].lower() for item in inventory 
-                    if item.get("strType", "").lower() == "class"]
+        user_classes = inventory.classes
         
         equivalent_map = {
             "stonecrusher": ["infinity titan"],
@@ -731,11 +715,7 @@ class RaidSystem(commands.Cog):
             return await ctx.respond("❌ Você precisa se vincular primeiro!", ephemeral=True)
             
         inventory = await self.get_user_inventory(user_data["ccid"])
-        user_classes = [
-            item["strName"].lower() 
-            for item in inventory 
-            if item.get("strType", "").lower() == "class"
-        ]
+        user_classes = inventory.classes
 
         matching_raids = []
         for rid, raid in self.active_raids.items():
@@ -12,7 +12,7 @@ import random
 import aiohttp
 # Add this to your UniversalTemplate class in template.py
 
-from database import db
+from database import async_db
 from models import UserInfo
 
 # ============================
@@ -132,14 +132,14 @@ class UniversalTemplate(commands.Cog):
         target_user = user or ctx.author
         
         # Try to get user from database
-        user_data = db.get_user_info(target_user.id)
+        user_data = await async_db.get_user_info(target_user.id)
         
         if not hasattr(user_data, 'ID'):  # If user doesn't exist in database
             # Add user to database with complete info
-            db.add_user(target_user)
+            await async_db.add_user(target_user)
             
             # Get the newly created user info
-            user_data = db.get_user_info(target_user.id)
+            user_data = await async_db.get_user_info(target_user.id)
             
             # Create embed for new user
             embed = discord.Embed(
@@ -1,8 +1,11 @@
 # cogs/Template/users.py
 import discord
+import sqlite3
+import time
+import traceback
 from discord.ext import commands
 from discord.commands import SlashCommandGroup, Option
-from database import db
+from database import async_db
 from models import UserInfo
 
 class UserCog(commands.Cog):
@@ -27,16 +30,11 @@ class UserCog(commands.Cog):
         target_user = user or ctx.author
         
         try:
-            # Verificação DEBUG - Verifica o banco de dados diretamente
-            conn = db._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE Discord_ID = ?", (target_user.id,))
-            raw_data = cursor.fetchone()
-            conn.close()
+            # Verificação DEBUG - Verifica o banco de dados
+            raw_data = await async_db.get_user(target_user.id)
             
             print(f"\n=== DEBUG DATABASE CHECK ===")
-            print(f"Raw SQL result: {raw_data}")
-            print(f"db.get_user() result: {db.get_user(target_user.id)}")
+            print(f"db.get_user() result: {raw_data}")
             
             if raw_data:  # Se existe no banco de dados
                 await ctx.respond(
@@ -51,7 +49,7 @@ class UserCog(commands.Cog):
             
             # Tentativa de adição com tratamento de erro explícito
             try:
-                success = db.add_user(target_user)
+                success = await async_db.add_user(target_user)
             except sqlite3.IntegrityError as e:
                 print(f"SQLite IntegrityError: {e}")
                 await ctx.respond(
@@ -64,7 +62,7 @@ class UserCog(commands.Cog):
             
             if success:
                 # Verificação pós-inserção
-                new_user = db.get_user(target_user.id)
+                new_user = await async_db.get_user(target_user.id)
                 embed = discord.Embed(
                     title="✅ Usuário Adicionado",
                     description=f"{target_user.mention} foi registrado no banco de dados",
@@ -101,11 +99,7 @@ class UserCog(commands.Cog):
         
         try:
             # Verificação direta no banco
-            conn = db._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM users WHERE Discord_ID = ?", (target_user.id,))
-            exists = cursor.fetchone() is not None
-            conn.close()
+            exists = await async_db.get_user(target_user.id) is not None
             
             if not exists:
                 await ctx.respond(
@@ -114,7 +108,7 @@ class UserCog(commands.Cog):
                 )
                 return
                 
-            if db.delete_user(target_user.id):
+            if await async_db.delete_user(target_user.id):
                 embed = discord.Embed(
                     title="✅ User Removed",
                     description=f"Removed {target_user.mention} from the database.",
@@ -165,7 +159,7 @@ class UserCog(commands.Cog):
                 await ctx.respond("⚠️ No fields to update provided!", ephemeral=True)
                 return
                 
-            if db.update_user(target_user.id, **updates):
+            if await async_db.update_user(target_user.id, **updates):
                 embed = discord.Embed(
                     title="✅ User Updated",
                     description=f"Updated {target_user.mention}'s information.",
@@ -207,7 +201,7 @@ class UserCog(commands.Cog):
         target_user = user or ctx.author
         
         try:
-            user_data = db.get_user_info(target_user.id)
+            user_data = await async_db.get_user_info(target_user.id)
             
             if not hasattr(user_data, 'ID'):
                 await ctx.respond(
@@ -250,7 +244,7 @@ class UserCog(commands.Cog):
     async def list_users(self, ctx: discord.ApplicationContext):
         """Lists all users in the database."""
         try:
-            users = db.list_users()
+            users = await async_db.list_users()
             
             if not users:
                 await ctx.respond("⚠️ No users found in the database!", ephemeral=True)
@@ -285,5 +279,59 @@ class UserCog(commands.Cog):
                 ephemeral=True
             )
 
+    @user_group.command(name="sync", description="Syncs every guild member into the database")
+    @commands.has_permissions(administrator=True)
+    async def sync_users(self, ctx: discord.ApplicationContext):
+        """
+        Registers new guild members and refreshes changed Discord info in a
+        single transaction, leaving unchanged rows untouched.
+
+        Args:
+            ctx: Command context
+        """
+        await ctx.defer(ephemeral=True)
+        try:
+            start = time.perf_counter()
+            inserted, updated = await async_db.bulk_upsert_users(
+                ctx.guild.members, only_changed=True
+            )
+            elapsed = time.perf_counter() - start
+
+            embed = discord.Embed(
+                title="🔄 Users Synced",
+                description=f"Synced {len(ctx.guild.members)} members of **{ctx.guild.name}**.",
+                color=discord.Color.green()
+            )
+            embed.add_field(name="➕ Added", value=str(inserted), inline=True)
+            embed.add_field(name="✏️ Updated", value=str(updated), inline=True)
+            embed.add_field(
+                name="✅ Unchanged",
+                value=str(len(ctx.guild.members) - inserted - updated),
+                inline=True
+            )
+            embed.set_footer(text=f"Finished in {elapsed:.2f}s")
+            await ctx.respond(embed=embed, ephemeral=True)
+        except Exception as e:
+            await ctx.respond(
+                f"❌ Error syncing users: {str(e)}",
+                ephemeral=True
+            )
+
+    @user_group.command(name="cache", description="Shows user lookup cache statistics")
+    @commands.has_permissions(administrator=True)
+    async def cache_stats(self, ctx: discord.ApplicationContext):
+        """Displays hit/miss counters of the database user cache."""
+        stats = async_db.handler.user_cache.stats()
+        embed = discord.Embed(
+            title="🗃️ User Cache",
+            color=discord.Color.blurple()
+        )
+        embed.add_field(name="✅ Hits", value=str(stats["hits"]), inline=True)
+        embed.add_field(name="❌ Misses", value=str(stats["misses"]), inline=True)
+        embed.add_field(name="📈 Hit Rate", value=f"{stats['hit_rate']:.1%}", inline=True)
+        embed.add_field(name="📦 Size", value=f"{stats['size']}/{stats['maxsize']}", inline=True)
+        embed.add_field(name="🧹 Evictions", value=str(stats["evictions"]), inline=True)
+        await ctx.respond(embed=embed, ephemeral=True)
+
 def setup(bot):
     bot.add_cog(UserCog(bot))
\ No newline at end of file
@@ -47,6 +47,80 @@ PREFIX = get_setting("PREFIX", "!")
 BKP_DATA = get_setting("BKP_DATA", "./data")
 BKP_DAYS = get_setting("BKP_DAYS", 30, int)
 
+# ==================================================================================================
+# 🗄 BANCO DE DADOS
+# ==================================================================================================
+DB_NAME = get_setting("DB_NAME", "uh.db")
+DB_TUNING = {
+    "journal_mode": get_setting("DB_JOURNAL_MODE", "WAL"),
+    "synchronous": get_setting("DB_SYNCHRONOUS", "NORMAL"),
+    "cache_size_kb": get_setting("DB_CACHE_SIZE_KB", 8192, int),
+    "mmap_size": get_setting("DB_MMAP_SIZE", 134217728, int),
+    "statement_cache": get_setting("DB_STATEMENT_CACHE", 256, int),
+    "busy_timeout_ms": get_setting("DB_BUSY_TIMEOUT_MS", 5000, int),
+    "user_cache_size": get_setting("DB_USER_CACHE_SIZE", 1024, int),
+    "user_cache_ttl": get_setting("DB_USER_CACHE_TTL", 300, int),
+}
+
+# ==================================================================================================
+# 🌐 AQW HTTP
+# ==================================================================================================
+AQW_HTTP = {
+    "account_url": get_setting("AQW_ACCOUNT_URL", "https://account.aq.com"),
+    "game_url": get_setting("AQW_GAME_URL", "https://game.aq.com"),
+    "timeout": get_setting("AQW_HTTP_TIMEOUT", 10, float),
+    "retries": get_setting("AQW_HTTP_RETRIES", 3, int),
+    "pool_size": get_setting("AQW_HTTP_POOL_SIZE", 32, int),
+    "per_host_limit": get_setting("AQW_HTTP_PER_HOST_LIMIT", 8, int),
+    "dns_ttl": get_setting("AQW_HTTP_DNS_TTL", 300, int),
+    "cache_size": get_setting("AQW_CACHE_SIZE", 512, int),
+    "cache_ttl": get_setting("AQW_CACHE_TTL", 120, float),
+    "cache_stale_ttl": get_setting("AQW_CACHE_STALE_TTL", 600, float),
+    "rate_limit": get_setting("AQW_RATE_LIMIT", 5, float),
+    "rate_burst": get_setting("AQW_RATE_BURST", 10, int),
+}
+
+AQW_SERVERS_POLL_INTERVAL = get_setting("AQW_SERVERS_POLL_INTERVAL", 300, int)
+
+# ==================================================================================================
+# 📡 FEEDS
+# ==================================================================================================
+# Várias chaves separadas por vírgula; YOUTUBE_API_KEY (uma chave só) continua aceita
+YOUTUBE_API_KEYS = [
+    key.strip() for key in (os.getenv("YOUTUBE_API_KEYS") or os.getenv("YOUTUBE_API_KEY", "")).split(",")
+    if key.strip()
+]
+TWITCH_CLIENT_ID = os.getenv("TWITCH_CLIENT_ID")
+TWITCH_OAUTH_TOKEN = os.getenv("TWITCH_OAUTH_TOKEN")
+TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
+
+# Checagens simultâneas por plataforma e tempo máximo de cada feed
+FEEDS_CONCURRENCY = {
+    "youtube": get_setting("FEEDS_YOUTUBE_CONCURRENCY", 4, int),
+    "twitch": get_setting("FEEDS_TWITCH_CONCURRENCY", 4, int),
+    "twitter": get_setting("FEEDS_TWITTER_CONCURRENCY", 2, int),
+    "rss": get_setting("FEEDS_RSS_CONCURRENCY", 8, int),
+}
+FEEDS_TIMEOUT = get_setting("FEEDS_TIMEOUT", 20, float)
+
+# Intervalo de checagem de cada feed: começa no padrão e se ajusta à frequência de publicação
+FEEDS_MIN_INTERVAL = get_setting("FEEDS_MIN_INTERVAL", 120, int)
+FEEDS_DEFAULT_INTERVAL = get_setting("FEEDS_DEFAULT_INTERVAL", 600, int)
+FEEDS_MAX_INTERVAL = get_setting("FEEDS_MAX_INTERVAL", 10800, int)
+# IDs já notificados guardados por feed (precisa cobrir quantos itens um feed lista de uma vez)
+FEEDS_SEEN_CAPACITY = get_setting("FEEDS_SEEN_CAPACITY", 100, int)
+# Respostas da API guardadas pelo monitor de feeds (entradas e segundos)
+FEEDS_API_CACHE_SIZE = get_setting("FEEDS_API_CACHE_SIZE", 256, int)
+FEEDS_API_CACHE_TTL = get_setting("FEEDS_API_CACHE_TTL", 1800, int)
+# Envio das notificações: mensagens por segundo e rajada por canal (o Discord aceita 5 a cada 5s)
+# e quanto esperar para juntar os itens de uma checagem na mesma mensagem
+FEEDS_NOTIFY_RATE = get_setting("FEEDS_NOTIFY_RATE", 1.0, float)
+FEEDS_NOTIFY_BURST = get_setting("FEEDS_NOTIFY_BURST", 5, int)
+FEEDS_NOTIFY_BATCH_DELAY = get_setting("FEEDS_NOTIFY_BATCH_DELAY", 2, float)
+# Cota diária de cada chave da API do YouTube e quanto dela fica de reserva
+YOUTUBE_DAILY_QUOTA = get_setting("YOUTUBE_DAILY_QUOTA", 10000, int)
+YOUTUBE_QUOTA_RESERVE = get_setting("YOUTUBE_QUOTA_RESERVE", 500, int)
+
 # ==================================================================================================
 # ⚙️ CONFIGURAÇÕES GERAIS
 # ==================================================================================================
@@ -64,6 +138,9 @@ RULES_CHANNEL_ID = get_setting("RULES_CHANNEL_ID", cast_type=int)
 VERIFY_CHANNEL_ID = get_setting("VERIFY_CHANNEL_ID", cast_type=int)
 WELCOME_CHANNEL_ID = get_setting("WELCOME_CHANNEL_ID", cast_type=int)
 
+# 💰 ECONOMIA
+ECONOMY_SNAPSHOT_INTERVAL = get_setting("ECONOMY_SNAPSHOT_INTERVAL", 300, int)
+
 # 🛡 RAIDS
 RAID_CHANNEL_ID = get_setting("RAID_CHANNEL_ID", cast_type=int)
 RAID_DATA_DIR = get_setting("RAID_DATA_DIR", "./data")
@@ -90,6 +167,8 @@ GUILD_LOG_CHANNEL_ID = get_setting("GUILD_LOG_CHANNEL_ID", cast_type=int)
 VERIFY_STORAGE = Path("data/verification.json")  
 INSIGNIAS_FILE = Path("data/insignias.json")
 USERS_FILE = Path("data/users.json")
+BANK_FILE = Path("data/economy/mainbank.json")
+REPORTS_FILE = Path("cogs/Moderation/reports.json")
 FEEDS_PATH = Path("data/feeds")
 FEEDS_PATH.mkdir(parents=True, exist_ok=True)
 
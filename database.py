@@ -1,63 +1,118 @@
 # database.py
 import sqlite3
+import asyncio
+import functools
+import threading
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 import logging
 from typing import Optional, List, Dict, Tuple
 from models import UserInfo
+from cache import TTLCache
+from migrations import apply_migrations
+import config
+
+# execute_query statements that can't modify rows and so keep user_cache
+READ_ONLY_PREFIXES = ("SELECT", "PRAGMA", "EXPLAIN")
+
+_MISSING = object()
+
+# Columns taken from the Discord member object, in the order of _member_row
+MEMBER_COLUMNS = (
+    "Discord_ID",
+    "Discord_Username",
+    "Discord_Mention",
+    "Discord_IsBot",
+    "Discord_CreatedAt",
+    "Name",
+)
 
 class DatabaseHandler:
     """Simple SQLite database handler for Discord bot operations."""
 
-    def __init__(self, db_name: str = "uh.db"):
+    def __init__(self, db_name: str = "uh.db", tuning: Optional[Dict] = None):
         """
         Initializes the DatabaseHandler and creates the database if it doesn't exist.
 
         Args:
             db_name (str): Name of the SQLite database file.
+            tuning (Optional[Dict]): Connection tuning profile. Missing keys
+                fall back to config.DB_TUNING, which holds the defaults and
+                the DB_* settings.
         """
         self.db_path = Path("database") / db_name
         self.db_path.parent.mkdir(exist_ok=True)
         self.logger = logging.getLogger("database")
+        self.tuning = {**config.DB_TUNING, **(tuning or {})}
+        self.user_cache = TTLCache(
+            maxsize=self.tuning["user_cache_size"],
+            ttl=self.tuning["user_cache_ttl"]
+        )
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self._initialize_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens a new SQLite connection and applies the tuning profile.
+
+        Returns:
+            sqlite3.Connection: Configured SQLite connection object.
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.tuning["busy_timeout_ms"] / 1000,
+            cached_statements=self.tuning["statement_cache"]
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA journal_mode={self.tuning['journal_mode']}")
+        conn.execute(f"PRAGMA synchronous={self.tuning['synchronous']}")
+        # Negative values are interpreted by SQLite as KiB instead of pages
+        conn.execute(f"PRAGMA cache_size=-{int(self.tuning['cache_size_kb'])}")
+        conn.execute(f"PRAGMA mmap_size={int(self.tuning['mmap_size'])}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
     def _get_connection(self) -> sqlite3.Connection:
         """
-        Creates and returns a new SQLite connection.
+        Returns the calling thread's long-lived SQLite connection, opening it
+        on first use.
 
         Returns:
             sqlite3.Connection: SQLite connection object.
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
         return conn
 
+    def close(self):
+        """
+        Closes every connection opened by this handler.
+        """
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
     def _initialize_db(self):
         """
-        Initializes the database and creates the 'users' table if it does not exist.
+        Initializes the database and applies any pending schema migrations.
         """
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    ID INTEGER NOT NULL UNIQUE PRIMARY KEY AUTOINCREMENT,
-                    Name TEXT NOT NULL DEFAULT 'Name',
-                    Admin INTEGER NOT NULL DEFAULT 0,
-                    Discord_ID INTEGER NOT NULL DEFAULT 0,
-                    Discord_Username TEXT NOT NULL DEFAULT 'Discord Name',
-                    Discord_Mention TEXT NOT NULL DEFAULT 'Discord Mention',
-                    Discord_IsBot INTEGER NOT NULL DEFAULT 0,
-                    Discord_CreatedAt TEXT NOT NULL DEFAULT 'Discord_Created_At',
-                    AQW_ID INTEGER NOT NULL DEFAULT 0 UNIQUE,
-                    AQW_Username TEXT NOT NULL DEFAULT 'AQW_Username'
-                )
-            """)
-            conn.commit()
+            version = apply_migrations(conn, self.logger)
+            self.logger.debug(f"Database schema at version {version}")
         except Exception as e:
             self.logger.error(f"Error initializing database: {e}")
             raise
-        finally:
-            conn.close()
 
     # ==========================================================
     # ================= USER OPERATIONS ========================
@@ -76,26 +131,11 @@ class DatabaseHandler:
         """
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                """INSERT INTO users (
-                    Discord_ID, 
-                    Discord_Username,
-                    Discord_Mention,
-                    Discord_IsBot,
-                    Discord_CreatedAt,
-                    Name
-                ) VALUES (?, ?, ?, ?, ?, ?)""",
-                (
-                    discord_user.id,
-                    str(discord_user),
-                    discord_user.mention,
-                    int(discord_user.bot),
-                    discord_user.created_at.isoformat(),
-                    getattr(discord_user, 'display_name', str(discord_user))
+            with conn:
+                conn.execute(
+                    f"INSERT INTO users ({', '.join(MEMBER_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                    self._member_row(discord_user)
                 )
-            )
-            conn.commit()
             return True
         except sqlite3.IntegrityError:
             self.logger.warning(f"User {discord_user.id} already exists")
@@ -104,11 +144,98 @@ class DatabaseHandler:
             self.logger.error(f"Error adding user: {e}")
             return False
         finally:
-            conn.close()             
+            self.user_cache.invalidate(discord_user.id)
+
+    @staticmethod
+    def _member_row(discord_user) -> Tuple:
+        """
+        Builds the MEMBER_COLUMNS values for a Discord user.
+
+        Args:
+            discord_user: Discord User or Member object
+
+        Returns:
+            Tuple: Column values in MEMBER_COLUMNS order.
+        """
+        return (
+            discord_user.id,
+            str(discord_user),
+            discord_user.mention,
+            int(discord_user.bot),
+            discord_user.created_at.isoformat(),
+            getattr(discord_user, 'display_name', str(discord_user))
+        )
+
+    def bulk_upsert_users(self, members, only_changed: bool = False) -> Tuple[int, int]:
+        """
+        Inserts or updates many Discord members in a single transaction.
+
+        Args:
+            members: Iterable of Discord User or Member objects.
+            only_changed (bool): Skip members whose stored Discord fields
+                already match, so only new or changed rows are written.
+
+        Returns:
+            Tuple[int, int]: Number of inserted and updated users.
+
+        Raises:
+            sqlite3.Error: The sync failed and nothing was written.
+        """
+        rows = {row[0]: row for row in map(self._member_row, members)}
+        if not rows:
+            return 0, 0
+        conn = self._get_connection()
+        try:
+            with conn:
+                # Takes the write lock before reading, so no other writer can
+                # change the stored rows between the comparison and the write
+                conn.execute("BEGIN IMMEDIATE")
+                stored = {
+                    row[0]: tuple(row)
+                    for row in conn.execute(f"SELECT {', '.join(MEMBER_COLUMNS)} FROM users")
+                }
+                inserts = [row for discord_id, row in rows.items() if discord_id not in stored]
+                updates = [
+                    row[1:] + row[:1]
+                    for discord_id, row in rows.items()
+                    if discord_id in stored and not (only_changed and stored[discord_id] == row)
+                ]
+                conn.executemany(
+                    f"INSERT INTO users ({', '.join(MEMBER_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                    inserts
+                )
+                conn.executemany(
+                    f"UPDATE users SET {', '.join(f'{c} = ?' for c in MEMBER_COLUMNS[1:])} "
+                    "WHERE Discord_ID = ?",
+                    updates
+                )
+            return len(inserts), len(updates)
+        except Exception as e:
+            self.logger.error(f"Error bulk upserting users: {e}")
+            raise
+        finally:
+            for discord_id in rows:
+                self.user_cache.invalidate(discord_id)
 
     def get_user(self, discord_id: int) -> Optional[Dict]:
         """
-        Retrieves a user from the database by Discord ID.
+        Retrieves a user from the database by Discord ID, served from
+        user_cache when possible.
+
+        Args:
+            discord_id (int): Discord user ID.
+
+        Returns:
+            Optional[Dict]: User data as a dictionary, or None if not found.
+        """
+        cached = self.user_cache.get(discord_id, _MISSING)
+        if cached is not _MISSING:
+            return dict(cached) if cached else None
+        return self._load_user(discord_id)
+
+    def _load_user(self, discord_id: int) -> Optional[Dict]:
+        """
+        Reads a user from SQLite and stores the result in user_cache.
 
         Args:
             discord_id (int): Discord user ID.
@@ -118,18 +245,17 @@ class DatabaseHandler:
         """
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
+            cursor = conn.execute(
                 "SELECT * FROM users WHERE discord_id = ?",
                 (discord_id,)
             )
             result = cursor.fetchone()
-            return dict(result) if result else None
+            user = dict(result) if result else None
+            self.user_cache.set(discord_id, user)
+            return dict(user) if user else None
         except Exception as e:
             self.logger.error(f"Error getting user: {e}")
             return None
-        finally:
-            conn.close()
 
     def update_user(self, discord_id: int, **kwargs) -> bool:
         """
@@ -146,20 +272,19 @@ class DatabaseHandler:
             return False
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
             set_clause = ", ".join(f"{k} = ?" for k in kwargs)
             values = list(kwargs.values()) + [discord_id]
-            cursor.execute(
-                f"UPDATE users SET {set_clause} WHERE discord_id = ?",
-                values
-            )
-            conn.commit()
+            with conn:
+                cursor = conn.execute(
+                    f"UPDATE users SET {set_clause} WHERE discord_id = ?",
+                    values
+                )
             return cursor.rowcount > 0
         except Exception as e:
             self.logger.error(f"Error updating user: {e}")
             return False
         finally:
-            conn.close()
+            self.user_cache.invalidate(discord_id)
 
     def delete_user(self, discord_id: int) -> bool:
         """
@@ -173,18 +298,17 @@ class DatabaseHandler:
         """
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "DELETE FROM users WHERE discord_id = ?",
-                (discord_id,)
-            )
-            conn.commit()
+            with conn:
+                cursor = conn.execute(
+                    "DELETE FROM users WHERE discord_id = ?",
+                    (discord_id,)
+                )
             return cursor.rowcount > 0
         except Exception as e:
             self.logger.error(f"Error deleting user: {e}")
             return False
         finally:
-            conn.close()
+            self.user_cache.invalidate(discord_id)
             
     def list_users(self) -> List[Dict]:
         """
@@ -195,14 +319,11 @@ class DatabaseHandler:
         """
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users")
+            cursor = conn.execute("SELECT * FROM users")
             return [dict(row) for row in cursor.fetchall()]
         except Exception as e:
             self.logger.error(f"Error listing users: {e}")
             return []
-        finally:
-            conn.close()
 
     def get_user_info(self, discord_id: int) -> UserInfo:  # Added self parameter
         """
@@ -221,6 +342,533 @@ class DatabaseHandler:
                 setattr(user_info, key, value)        
         return user_info
 
+    # ==========================================================
+    # =================== AQW ACCOUNT LINKS ====================
+    # ==========================================================
+
+    @staticmethod
+    def _aqw_link(user: Optional[Dict]) -> Optional[Dict]:
+        """
+        Converts a users row into the link shape used by the AQW cogs.
+
+        Args:
+            user (Optional[Dict]): Row returned by get_user.
+
+        Returns:
+            Optional[Dict]: discord_id, ccid and nickname, or None if the
+            user has no linked AQW account.
+        """
+        if not user or not user["AQW_ID"]:
+            return None
+        nickname = user["AQW_Username"]
+        return {
+            "discord_id": user["Discord_ID"],
+            "ccid": user["AQW_ID"],
+            "nickname": None if nickname == "AQW_Username" else nickname,
+        }
+
+    def get_aqw_link(self, discord_id: int) -> Optional[Dict]:
+        """
+        Returns the AQW account linked to a Discord user.
+
+        Args:
+            discord_id (int): Discord user ID.
+
+        Returns:
+            Optional[Dict]: discord_id, ccid and nickname, or None if not linked.
+        """
+        return self._aqw_link(self.get_user(discord_id))
+
+    def get_aqw_link_by_ccid(self, ccid: int) -> Optional[Dict]:
+        """
+        Returns the link that owns an AQW character ID.
+
+        Args:
+            ccid (int): AQW character ID.
+
+        Returns:
+            Optional[Dict]: discord_id, ccid and nickname, or None if unused.
+        """
+        try:
+            conn = self._get_connection()
+            row = conn.execute(
+                "SELECT * FROM users WHERE AQW_ID = ?",
+                (ccid,)
+            ).fetchone()
+            return self._aqw_link(dict(row) if row else None)
+        except Exception as e:
+            self.logger.error(f"Error getting link for ccid {ccid}: {e}")
+            return None
+
+    def get_aqw_link_by_nickname(self, nickname: str) -> Optional[Dict]:
+        """
+        Returns the link that owns an AQW character, by nickname (case-insensitive).
+
+        Args:
+            nickname (str): AQW character name.
+
+        Returns:
+            Optional[Dict]: discord_id, ccid and nickname, or None if unused.
+        """
+        ccid = self.get_ccid_by_nickname(nickname)
+        return self.get_aqw_link_by_ccid(ccid) if ccid else None
+
+    def get_ccid_by_nickname(self, nickname: str) -> Optional[int]:
+        """
+        Returns the CCID previously resolved for a nickname (case-insensitive).
+
+        Args:
+            nickname (str): AQW character name.
+
+        Returns:
+            Optional[int]: The CCID, or None if the nickname was never resolved.
+        """
+        try:
+            conn = self._get_connection()
+            row = conn.execute(
+                "SELECT CCID FROM aqw_characters WHERE Nickname = ?",
+                (nickname.strip(),)
+            ).fetchone()
+            return row["CCID"] if row else None
+        except Exception as e:
+            self.logger.error(f"Error resolving nickname {nickname}: {e}")
+            return None
+
+    def get_nickname_by_ccid(self, ccid: int) -> Optional[str]:
+        """
+        Returns the last known nickname of an AQW character.
+
+        Args:
+            ccid (int): AQW character ID.
+
+        Returns:
+            Optional[str]: The nickname, or None if unknown.
+        """
+        try:
+            conn = self._get_connection()
+            row = conn.execute(
+                "SELECT Nickname FROM aqw_characters WHERE CCID = ?",
+                (ccid,)
+            ).fetchone()
+            return row["Nickname"] if row else None
+        except Exception as e:
+            self.logger.error(f"Error getting nickname for ccid {ccid}: {e}")
+            return None
+
+    @staticmethod
+    def _remember_character(conn: sqlite3.Connection, ccid: int, nickname: str):
+        # A nickname belongs to one character at a time: drop whichever
+        # character held it before (renamed or deleted) and store the new pair
+        nickname = nickname.strip()
+        conn.execute("DELETE FROM aqw_characters WHERE Nickname = ? AND CCID != ?", (nickname, ccid))
+        conn.execute(
+            """INSERT INTO aqw_characters (CCID, Nickname, Resolved_At) VALUES (?, ?, ?)
+               ON CONFLICT (CCID) DO UPDATE SET
+                   Nickname = excluded.Nickname,
+                   Resolved_At = excluded.Resolved_At""",
+            (ccid, nickname, datetime.now(timezone.utc).isoformat())
+        )
+
+    def remember_character(self, ccid: int, nickname: str) -> bool:
+        """
+        Stores a resolved nickname/CCID pair so later lookups skip the network.
+
+        Args:
+            ccid (int): AQW character ID.
+            nickname (str): AQW character name.
+
+        Returns:
+            bool: True if stored, False on error.
+        """
+        try:
+            conn = self._get_connection()
+            with conn:
+                self._remember_character(conn, ccid, nickname)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error storing character {ccid}: {e}")
+            return False
+
+    def link_aqw_account(self, discord_id: int, ccid: int, nickname: Optional[str] = None) -> bool:
+        """
+        Links an AQW character to a Discord user, creating the user row if needed.
+
+        Args:
+            discord_id (int): Discord user ID.
+            ccid (int): AQW character ID.
+            nickname (Optional[str]): AQW character name, if known. Defaults
+                to the last nickname resolved for this ccid.
+
+        Returns:
+            bool: True if linked, False if the ccid belongs to someone else or on error.
+        """
+        try:
+            conn = self._get_connection()
+            with conn:
+                if nickname:
+                    self._remember_character(conn, ccid, nickname)
+                else:
+                    nickname = self.get_nickname_by_ccid(ccid)
+                conn.execute(
+                    """INSERT INTO users (Discord_ID, AQW_ID, AQW_Username) VALUES (?, ?, ?)
+                       ON CONFLICT (Discord_ID) DO UPDATE SET
+                           AQW_ID = excluded.AQW_ID,
+                           AQW_Username = excluded.AQW_Username""",
+                    (discord_id, ccid, nickname or "AQW_Username")
+                )
+            return True
+        except sqlite3.IntegrityError:
+            self.logger.warning(f"AQW ID {ccid} is already linked")
+            return False
+        except Exception as e:
+            self.logger.error(f"Error linking AQW account: {e}")
+            return False
+        finally:
+            self.user_cache.invalidate(discord_id)
+
+    def unlink_aqw_account(self, discord_id: int) -> bool:
+        """
+        Removes the AQW character linked to a Discord user. The nickname/CCID
+        pair stays known for future lookups.
+
+        Args:
+            discord_id (int): Discord user ID.
+
+        Returns:
+            bool: True if a link was removed, False otherwise.
+        """
+        try:
+            conn = self._get_connection()
+            with conn:
+                cursor = conn.execute(
+                    """UPDATE users SET AQW_ID = 0, AQW_Username = 'AQW_Username'
+                       WHERE Discord_ID = ? AND AQW_ID != 0""",
+                    (discord_id,)
+                )
+            return cursor.rowcount > 0
+        except Exception as e:
+            self.logger.error(f"Error unlinking AQW account: {e}")
+            return False
+        finally:
+            self.user_cache.invalidate(discord_id)
+
+    # ==========================================================
+    # ======================= ECONOMY ==========================
+    # ==========================================================
+
+    def list_accounts(self) -> List[Dict]:
+        """
+        Lists every economy account balance from the last ledger snapshot.
+
+        Returns:
+            List[Dict]: discord_id, wallet and bank for each account.
+        """
+        try:
+            conn = self._get_connection()
+            rows = conn.execute("SELECT Discord_ID, Wallet, Bank FROM economy_accounts").fetchall()
+            return [
+                {"discord_id": row["Discord_ID"], "wallet": row["Wallet"], "bank": row["Bank"]}
+                for row in rows
+            ]
+        except Exception as e:
+            self.logger.error(f"Error listing accounts: {e}")
+            return []
+
+    def append_ledger_entry(self, changes: List[Tuple[int, int, int]]) -> int:
+        """
+        Appends one economy transaction to the ledger journal.
+
+        Args:
+            changes (List[Tuple[int, int, int]]): (discord_id, wallet_delta,
+                bank_delta) for every account touched by the transaction.
+
+        Returns:
+            int: Sequence number of the journal entry.
+        """
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO economy_journal (Changes, Created_At) VALUES (?, ?)",
+                (json.dumps(changes), datetime.now(timezone.utc).isoformat())
+            )
+        return cursor.lastrowid
+
+    def load_ledger_journal(self) -> List[Tuple[int, List[Tuple[int, int, int]]]]:
+        """
+        Returns the journal entries written since the last snapshot.
+
+        Returns:
+            List[Tuple[int, List]]: (sequence, changes) in write order.
+        """
+        conn = self._get_connection()
+        rows = conn.execute("SELECT Seq, Changes FROM economy_journal ORDER BY Seq").fetchall()
+        return [(row["Seq"], [tuple(change) for change in json.loads(row["Changes"])]) for row in rows]
+
+    def write_ledger_snapshot(self, balances: Dict[int, Tuple[int, int]], seqs: List[int]):
+        """
+        Persists account balances and drops the journal entries they include.
+
+        Args:
+            balances (Dict[int, Tuple[int, int]]): (wallet, bank) per changed account.
+            seqs (List[int]): Journal sequences already reflected in balances.
+        """
+        conn = self._get_connection()
+        with conn:
+            conn.executemany(
+                """INSERT INTO economy_accounts (Discord_ID, Wallet, Bank) VALUES (?, ?, ?)
+                   ON CONFLICT (Discord_ID) DO UPDATE SET
+                       Wallet = excluded.Wallet,
+                       Bank = excluded.Bank""",
+                [(discord_id, wallet, bank) for discord_id, (wallet, bank) in balances.items()]
+            )
+            conn.executemany("DELETE FROM economy_journal WHERE Seq = ?", [(seq,) for seq in seqs])
+
+    def get_bag(self, discord_id: int) -> List[Dict]:
+        """
+        Returns the items in a user's bag.
+
+        Args:
+            discord_id (int): Discord user ID.
+
+        Returns:
+            List[Dict]: {"item", "amount"} entries in insertion order.
+        """
+        try:
+            conn = self._get_connection()
+            rows = conn.execute(
+                "SELECT Item, Amount FROM economy_bag WHERE Discord_ID = ? ORDER BY rowid",
+                (discord_id,)
+            ).fetchall()
+            return [{"item": row["Item"], "amount": row["Amount"]} for row in rows]
+        except Exception as e:
+            self.logger.error(f"Error getting bag: {e}")
+            return []
+
+    def add_bag_item(self, discord_id: int, item: str, amount: int) -> int:
+        """
+        Adds amount of an item to a user's bag. Item names are case-insensitive.
+
+        Args:
+            discord_id (int): Discord user ID.
+            item (str): Item name.
+            amount (int): Quantity to add.
+
+        Returns:
+            int: Quantity held after the update.
+        """
+        conn = self._get_connection()
+        with conn:
+            row = conn.execute(
+                """INSERT INTO economy_bag (Discord_ID, Item, Amount) VALUES (?, ?, ?)
+                   ON CONFLICT (Discord_ID, Item) DO UPDATE SET Amount = Amount + excluded.Amount
+                   RETURNING Amount""",
+                (discord_id, item, amount)
+            ).fetchone()
+        return row["Amount"]
+
+    def remove_bag_item(self, discord_id: int, item: str, amount: int) -> bool:
+        """
+        Removes amount of an item from a user's bag, deleting emptied entries.
+
+        Args:
+            discord_id (int): Discord user ID.
+            item (str): Item name.
+            amount (int): Quantity to remove.
+
+        Returns:
+            bool: False if the user doesn't hold that many.
+        """
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.execute(
+                "UPDATE economy_bag SET Amount = Amount - ? "
+                "WHERE Discord_ID = ? AND Item = ? AND Amount >= ?",
+                (amount, discord_id, item, amount)
+            )
+            if cursor.rowcount == 0:
+                return False
+            conn.execute(
+                "DELETE FROM economy_bag WHERE Discord_ID = ? AND Item = ? AND Amount <= 0",
+                (discord_id, item)
+            )
+        return True
+
+    # ==========================================================
+    # ====================== WARNINGS ==========================
+    # ==========================================================
+
+    def get_warns(self, discord_id: int) -> int:
+        """
+        Returns how many warnings a user has.
+
+        Args:
+            discord_id (int): Discord user ID.
+        """
+        try:
+            conn = self._get_connection()
+            row = conn.execute(
+                "SELECT Warns FROM warnings WHERE Discord_ID = ?",
+                (discord_id,)
+            ).fetchone()
+            return row["Warns"] if row else 0
+        except Exception as e:
+            self.logger.error(f"Error getting warns: {e}")
+            return 0
+
+    def add_warns(self, discord_id: int, change: int = 1) -> int:
+        """
+        Adds change to a user's warning count.
+
+        Args:
+            discord_id (int): Discord user ID.
+            change (int): Warnings to add (may be negative).
+
+        Returns:
+            int: Warning count after the update.
+        """
+        conn = self._get_connection()
+        with conn:
+            row = conn.execute(
+                """INSERT INTO warnings (Discord_ID, Warns) VALUES (?, ?)
+                   ON CONFLICT (Discord_ID) DO UPDATE SET Warns = Warns + excluded.Warns
+                   RETURNING Warns""",
+                (discord_id, change)
+            ).fetchone()
+        return row["Warns"]
+
+    # ==========================================================
+    # ====================== INSIGNIAS =========================
+    # ==========================================================
+
+    def get_insignia(self, role_id: int) -> Optional[Dict]:
+        """
+        Returns the requirements configured for a role.
+
+        Args:
+            role_id (int): Discord role ID.
+
+        Returns:
+            Optional[Dict]: items, badges and required_roles, or None.
+        """
+        try:
+            conn = self._get_connection()
+            row = conn.execute(
+                "SELECT Requirements FROM insignias WHERE Role_ID = ?",
+                (role_id,)
+            ).fetchone()
+            return json.loads(row["Requirements"]) if row else None
+        except Exception as e:
+            self.logger.error(f"Error getting insignia {role_id}: {e}")
+            return None
+
+    def set_insignia(self, role_id: int, requirements: Dict) -> bool:
+        """
+        Creates or replaces the requirements of a role.
+
+        Args:
+            role_id (int): Discord role ID.
+            requirements (Dict): items, badges and required_roles.
+
+        Returns:
+            bool: True if saved.
+        """
+        try:
+            conn = self._get_connection()
+            with conn:
+                conn.execute(
+                    """INSERT INTO insignias (Role_ID, Requirements) VALUES (?, ?)
+                       ON CONFLICT (Role_ID) DO UPDATE SET Requirements = excluded.Requirements""",
+                    (role_id, json.dumps(requirements))
+                )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error saving insignia {role_id}: {e}")
+            return False
+
+    def delete_insignia(self, role_id: int) -> bool:
+        """
+        Removes the requirements of a role.
+
+        Args:
+            role_id (int): Discord role ID.
+
+        Returns:
+            bool: True if the role had requirements.
+        """
+        try:
+            conn = self._get_connection()
+            with conn:
+                cursor = conn.execute("DELETE FROM insignias WHERE Role_ID = ?", (role_id,))
+            return cursor.rowcount > 0
+        except Exception as e:
+            self.logger.error(f"Error deleting insignia {role_id}: {e}")
+            return False
+
+    # ==========================================================
+    # ======================== RAIDS ===========================
+    # ==========================================================
+
+    def save_raid(self, raid_id: str, raid: Dict) -> bool:
+        """
+        Creates or replaces the stored state of a raid.
+
+        Args:
+            raid_id (str): Raid identifier.
+            raid (Dict): Raid state.
+
+        Returns:
+            bool: True if saved.
+        """
+        try:
+            conn = self._get_connection()
+            with conn:
+                conn.execute(
+                    """INSERT INTO raids (Raid_ID, Status, Data, Updated_At) VALUES (?, ?, ?, ?)
+                       ON CONFLICT (Raid_ID) DO UPDATE SET
+                           Status = excluded.Status,
+                           Data = excluded.Data,
+                           Updated_At = excluded.Updated_At""",
+                    (raid_id, raid.get("status", ""), json.dumps(raid), datetime.now(timezone.utc).isoformat())
+                )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error saving raid {raid_id}: {e}")
+            return False
+
+    def delete_raid(self, raid_id: str) -> bool:
+        """
+        Removes a raid.
+
+        Args:
+            raid_id (str): Raid identifier.
+
+        Returns:
+            bool: True if the raid existed.
+        """
+        try:
+            conn = self._get_connection()
+            with conn:
+                cursor = conn.execute("DELETE FROM raids WHERE Raid_ID = ?", (raid_id,))
+            return cursor.rowcount > 0
+        except Exception as e:
+            self.logger.error(f"Error deleting raid {raid_id}: {e}")
+            return False
+
+    def list_raids(self) -> Dict[str, Dict]:
+        """
+        Returns every stored raid.
+
+        Returns:
+            Dict[str, Dict]: Raid state keyed by raid ID.
+        """
+        try:
+            conn = self._get_connection()
+            rows = conn.execute("SELECT Raid_ID, Data FROM raids ORDER BY Raid_ID").fetchall()
+            return {row["Raid_ID"]: json.loads(row["Data"]) for row in rows}
+        except Exception as e:
+            self.logger.error(f"Error listing raids: {e}")
+            return {}
+
     # ==========================================================
     # ================ GENERAL QUERY METHODS ===================
     # ==========================================================
@@ -238,14 +886,16 @@ class DatabaseHandler:
         """
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            with conn:
+                cursor = conn.execute(query, params)
+                return [dict(row) for row in cursor.fetchall()]
         except Exception as e:
             self.logger.error(f"Error executing query: {e}")
             return []
         finally:
-            conn.close()
+            if not query.lstrip().upper().startswith(READ_ONLY_PREFIXES):
+                # Custom statements may touch any user row
+                self.user_cache.clear()
 
     def get_table_columns(self, table_name: str) -> List[str]:
         """
@@ -259,15 +909,216 @@ class DatabaseHandler:
         """
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(f"PRAGMA table_info({table_name})")
+            cursor = conn.execute(f"PRAGMA table_info({table_name})")
             columns = [row["name"] for row in cursor.fetchall()]
             return columns
         except Exception as e:
             self.logger.error(f"Error getting columns for table {table_name}: {e}")
             return []
-        finally:
-            conn.close()
+
+
+class AsyncDatabaseHandler:
+    """Awaitable counterpart of DatabaseHandler for use inside cogs."""
+
+    def __init__(self, handler: DatabaseHandler, max_workers: int = 1):
+        """
+        Wraps a DatabaseHandler and runs its calls on a dedicated worker pool,
+        so SQLite disk I/O never blocks the bot's event loop.
+
+        Args:
+            handler (DatabaseHandler): Synchronous handler to delegate to.
+            max_workers (int): Number of worker threads. SQLite serializes
+                writes, so a single worker is usually enough.
+        """
+        self.handler = handler
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="database"
+        )
+
+    async def _run(self, func, *args, **kwargs):
+        """
+        Runs a blocking handler method on the worker pool.
+
+        Args:
+            func: Bound method of the wrapped DatabaseHandler.
+
+        Returns:
+            The method's return value.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(func, *args, **kwargs)
+        )
+
+    # ==========================================================
+    # ================= USER OPERATIONS ========================
+    # ==========================================================
+
+    async def add_user(self, discord_user) -> bool:
+        """Awaitable version of DatabaseHandler.add_user."""
+        return await self._run(self.handler.add_user, discord_user)
+
+    async def bulk_upsert_users(self, members, only_changed: bool = False) -> Tuple[int, int]:
+        """Awaitable version of DatabaseHandler.bulk_upsert_users."""
+        return await self._run(self.handler.bulk_upsert_users, list(members), only_changed)
+
+    async def get_user(self, discord_id: int) -> Optional[Dict]:
+        """Awaitable version of DatabaseHandler.get_user. Cache hits skip the worker thread."""
+        cached = self.handler.user_cache.get(discord_id, _MISSING)
+        if cached is not _MISSING:
+            return dict(cached) if cached else None
+        return await self._run(self.handler._load_user, discord_id)
+
+    async def update_user(self, discord_id: int, **kwargs) -> bool:
+        """Awaitable version of DatabaseHandler.update_user."""
+        return await self._run(self.handler.update_user, discord_id, **kwargs)
+
+    async def delete_user(self, discord_id: int) -> bool:
+        """Awaitable version of DatabaseHandler.delete_user."""
+        return await self._run(self.handler.delete_user, discord_id)
+
+    async def list_users(self) -> List[Dict]:
+        """Awaitable version of DatabaseHandler.list_users."""
+        return await self._run(self.handler.list_users)
+
+    async def get_user_info(self, discord_id: int) -> UserInfo:
+        """Awaitable version of DatabaseHandler.get_user_info."""
+        return UserInfo(**(await self.get_user(discord_id) or {}))
+
+    # ==========================================================
+    # =================== AQW ACCOUNT LINKS ====================
+    # ==========================================================
+
+    async def get_aqw_link(self, discord_id: int) -> Optional[Dict]:
+        """Awaitable version of DatabaseHandler.get_aqw_link."""
+        return await self._run(self.handler.get_aqw_link, discord_id)
+
+    async def get_aqw_link_by_ccid(self, ccid: int) -> Optional[Dict]:
+        """Awaitable version of DatabaseHandler.get_aqw_link_by_ccid."""
+        return await self._run(self.handler.get_aqw_link_by_ccid, ccid)
+
+    async def get_aqw_link_by_nickname(self, nickname: str) -> Optional[Dict]:
+        """Awaitable version of DatabaseHandler.get_aqw_link_by_nickname."""
+        return await self._run(self.handler.get_aqw_link_by_nickname, nickname)
+
+    async def get_ccid_by_nickname(self, nickname: str) -> Optional[int]:
+        """Awaitable version of DatabaseHandler.get_ccid_by_nickname."""
+        return await self._run(self.handler.get_ccid_by_nickname, nickname)
+
+    async def get_nickname_by_ccid(self, ccid: int) -> Optional[str]:
+        """Awaitable version of DatabaseHandler.get_nickname_by_ccid."""
+        return await self._run(self.handler.get_nickname_by_ccid, ccid)
+
+    async def remember_character(self, ccid: int, nickname: str) -> bool:
+        """Awaitable version of DatabaseHandler.remember_character."""
+        return await self._run(self.handler.remember_character, ccid, nickname)
+
+    async def link_aqw_account(self, discord_id: int, ccid: int, nickname: Optional[str] = None) -> bool:
+        """Awaitable version of DatabaseHandler.link_aqw_account."""
+        return await self._run(self.handler.link_aqw_account, discord_id, ccid, nickname)
+
+    async def unlink_aqw_account(self, discord_id: int) -> bool:
+        """Awaitable version of DatabaseHandler.unlink_aqw_account."""
+        return await self._run(self.handler.unlink_aqw_account, discord_id)
+
+    # ==========================================================
+    # ======================= ECONOMY ==========================
+    # ==========================================================
+
+    async def list_accounts(self) -> List[Dict]:
+        """Awaitable version of DatabaseHandler.list_accounts."""
+        return await self._run(self.handler.list_accounts)
+
+    async def append_ledger_entry(self, changes: List[Tuple[int, int, int]]) -> int:
+        """Awaitable version of DatabaseHandler.append_ledger_entry."""
+        return await self._run(self.handler.append_ledger_entry, changes)
+
+    async def load_ledger_journal(self) -> List[Tuple[int, List[Tuple[int, int, int]]]]:
+        """Awaitable version of DatabaseHandler.load_ledger_journal."""
+        return await self._run(self.handler.load_ledger_journal)
+
+    async def write_ledger_snapshot(self, balances: Dict[int, Tuple[int, int]], seqs: List[int]):
+        """Awaitable version of DatabaseHandler.write_ledger_snapshot."""
+        return await self._run(self.handler.write_ledger_snapshot, balances, seqs)
+
+    async def get_bag(self, discord_id: int) -> List[Dict]:
+        """Awaitable version of DatabaseHandler.get_bag."""
+        return await self._run(self.handler.get_bag, discord_id)
+
+    async def add_bag_item(self, discord_id: int, item: str, amount: int) -> int:
+        """Awaitable version of DatabaseHandler.add_bag_item."""
+        return await self._run(self.handler.add_bag_item, discord_id, item, amount)
+
+    async def remove_bag_item(self, discord_id: int, item: str, amount: int) -> bool:
+        """Awaitable version of DatabaseHandler.remove_bag_item."""
+        return await self._run(self.handler.remove_bag_item, discord_id, item, amount)
+
+    # ==========================================================
+    # ====================== WARNINGS ==========================
+    # ==========================================================
+
+    async def get_warns(self, discord_id: int) -> int:
+        """Awaitable version of DatabaseHandler.get_warns."""
+        return await self._run(self.handler.get_warns, discord_id)
+
+    async def add_warns(self, discord_id: int, change: int = 1) -> int:
+        """Awaitable version of DatabaseHandler.add_warns."""
+        return await self._run(self.handler.add_warns, discord_id, change)
+
+    # ==========================================================
+    # ====================== INSIGNIAS =========================
+    # ==========================================================
+
+    async def get_insignia(self, role_id: int) -> Optional[Dict]:
+        """Awaitable version of DatabaseHandler.get_insignia."""
+        return await self._run(self.handler.get_insignia, role_id)
+
+    async def set_insignia(self, role_id: int, requirements: Dict) -> bool:
+        """Awaitable version of DatabaseHandler.set_insignia."""
+        return await self._run(self.handler.set_insignia, role_id, requirements)
+
+    async def delete_insignia(self, role_id: int) -> bool:
+        """Awaitable version of DatabaseHandler.delete_insignia."""
+        return await self._run(self.handler.delete_insignia, role_id)
+
+    # ==========================================================
+    # ======================== RAIDS ===========================
+    # ==========================================================
+
+    async def save_raid(self, raid_id: str, raid: Dict) -> bool:
+        """Awaitable version of DatabaseHandler.save_raid."""
+        return await self._run(self.handler.save_raid, raid_id, raid)
+
+    async def delete_raid(self, raid_id: str) -> bool:
+        """Awaitable version of DatabaseHandler.delete_raid."""
+        return await self._run(self.handler.delete_raid, raid_id)
+
+    async def list_raids(self) -> Dict[str, Dict]:
+        """Awaitable version of DatabaseHandler.list_raids."""
+        return await self._run(self.handler.list_raids)
+
+    # ==========================================================
+    # ================ GENERAL QUERY METHODS ===================
+    # ==========================================================
+
+    async def execute_query(self, query: str, params: Tuple = ()) -> List[Dict]:
+        """Awaitable version of DatabaseHandler.execute_query."""
+        return await self._run(self.handler.execute_query, query, params)
+
+    async def get_table_columns(self, table_name: str) -> List[str]:
+        """Awaitable version of DatabaseHandler.get_table_columns."""
+        return await self._run(self.handler.get_table_columns, table_name)
+
+    def close(self):
+        """
+        Waits for pending operations, stops the worker pool and closes the
+        wrapped handler's connections.
+        """
+        self._executor.shutdown(wait=True)
+        self.handler.close()
 
 # Initialize a global database instance
-db = DatabaseHandler()
\ No newline at end of file
+db = DatabaseHandler(config.DB_NAME, config.DB_TUNING)
+async_db = AsyncDatabaseHandler(db)
\ No newline at end of file
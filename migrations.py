@@ -0,0 +1,315 @@
+# migrations.py
+"""
+Versioned schema migrations applied by DatabaseHandler at startup.
+
+Each migration is a function that receives an open sqlite3 connection and
+runs inside its own transaction. Applied versions are recorded in the
+'schema_version' table, so every step runs exactly once per database.
+
+To change the schema, append a new step with the next version number:
+
+    @migration(<next version>, "create guilds table")
+    def _create_guilds(conn):
+        conn.execute("CREATE TABLE guilds (...)")
+"""
+import sqlite3
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, NamedTuple
+import config
+
+logger = logging.getLogger("database")
+# config paths are relative to the project root, not the working directory
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, description: str):
+    """
+    Registers a migration step.
+
+    Args:
+        version (int): Schema version reached after this step. Must be unique.
+        description (str): Short description stored in 'schema_version'.
+    """
+    def register(func: Callable[[sqlite3.Connection], None]):
+        if any(m.version == version for m in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version {version}")
+        MIGRATIONS.append(Migration(version, description, func))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return func
+    return register
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """
+    Returns the highest applied schema version, or 0 for a new database.
+
+    Args:
+        conn (sqlite3.Connection): Database connection.
+    """
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn: sqlite3.Connection, logger: logging.Logger) -> int:
+    """
+    Applies every pending migration in version order.
+
+    Args:
+        conn (sqlite3.Connection): Database connection.
+        logger (logging.Logger): Logger for progress messages.
+
+    Returns:
+        int: Schema version after all migrations ran.
+    """
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER NOT NULL PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TEXT NOT NULL
+            )
+        """)
+
+    version = current_version(conn)
+    for step in MIGRATIONS:
+        if step.version <= version:
+            continue
+        logger.info(f"Applying migration {step.version}: {step.description}")
+        try:
+            conn.execute("BEGIN")
+            step.apply(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (step.version, step.description, datetime.now(timezone.utc).isoformat())
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = step.version
+    return version
+
+
+# ==========================================================
+# ====================== MIGRATIONS ========================
+# ==========================================================
+
+USERS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS users (
+        ID INTEGER NOT NULL UNIQUE PRIMARY KEY AUTOINCREMENT,
+        Name TEXT NOT NULL DEFAULT 'Name',
+        Admin INTEGER NOT NULL DEFAULT 0,
+        Discord_ID INTEGER NOT NULL DEFAULT 0,
+        Discord_Username TEXT NOT NULL DEFAULT 'Discord Name',
+        Discord_Mention TEXT NOT NULL DEFAULT 'Discord Mention',
+        Discord_IsBot INTEGER NOT NULL DEFAULT 0,
+        Discord_CreatedAt TEXT NOT NULL DEFAULT 'Discord_Created_At',
+        AQW_ID INTEGER NOT NULL DEFAULT 0,
+        AQW_Username TEXT NOT NULL DEFAULT 'AQW_Username'
+    )
+"""
+
+
+@migration(1, "create users table")
+def _create_users(conn: sqlite3.Connection):
+    conn.execute(USERS_TABLE_SQL)
+
+
+@migration(2, "allow several users without a linked AQW account")
+def _relax_aqw_id_unique(conn: sqlite3.Connection):
+    # Databases created before the migrations declared AQW_ID UNIQUE with a
+    # default of 0, so only one unlinked member could exist. That inline
+    # constraint can only be dropped by rebuilding the table.
+    for index in conn.execute("PRAGMA index_list(users)").fetchall():
+        if index["origin"] != "u":
+            continue
+        columns = [row["name"] for row in conn.execute(f"PRAGMA index_info({index['name']})")]
+        if columns == ["AQW_ID"]:
+            conn.execute("ALTER TABLE users RENAME TO users_legacy")
+            conn.execute(USERS_TABLE_SQL)
+            conn.execute("INSERT INTO users SELECT * FROM users_legacy")
+            conn.execute("DROP TABLE users_legacy")
+            break
+
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_aqw_id "
+        "ON users (AQW_ID) WHERE AQW_ID != 0"
+    )
+
+
+@migration(3, "unique index on users.Discord_ID")
+def _index_discord_id(conn: sqlite3.Connection):
+    # For Discord IDs registered twice, keep the linked row, then the newest
+    conn.execute("""
+        DELETE FROM users
+        WHERE ID NOT IN (
+            SELECT ID FROM (
+                SELECT ID, ROW_NUMBER() OVER (
+                    PARTITION BY Discord_ID
+                    ORDER BY AQW_ID != 0 DESC, ID DESC
+                ) AS position
+                FROM users
+            )
+            WHERE position = 1
+        )
+    """)
+    conn.execute("CREATE UNIQUE INDEX idx_users_discord_id ON users (Discord_ID)")
+
+
+@migration(4, "economy, warnings, insignia and raid tables")
+def _create_json_store_tables(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE economy_accounts (
+            Discord_ID INTEGER NOT NULL PRIMARY KEY,
+            Wallet INTEGER NOT NULL DEFAULT 100,
+            Bank INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE economy_bag (
+            Discord_ID INTEGER NOT NULL,
+            Item TEXT NOT NULL COLLATE NOCASE,
+            Amount INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (Discord_ID, Item)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE warnings (
+            Discord_ID INTEGER NOT NULL PRIMARY KEY,
+            Warns INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE insignias (
+            Role_ID INTEGER NOT NULL PRIMARY KEY,
+            Requirements TEXT NOT NULL DEFAULT '{}'
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE raids (
+            Raid_ID TEXT NOT NULL PRIMARY KEY,
+            Status TEXT NOT NULL,
+            Data TEXT NOT NULL,
+            Updated_At TEXT NOT NULL
+        )
+    """)
+
+
+def _project_path(path) -> Path:
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def _load_json(path: Path):
+    path = _project_path(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+@migration(5, "import legacy JSON stores")
+def _import_json_stores(conn: sqlite3.Connection):
+    # One-shot import of the files the cogs used before moving to SQLite.
+    # The files are left in place as a backup; nothing reads them anymore.
+    links = _load_json(config.USERS_FILE) or {}
+    for discord_id, link in links.items():
+        ccid = int(link.get("ccid") or 0)
+        if not ccid:
+            continue
+        # A CCID linked to several Discord IDs keeps its first link
+        owner = conn.execute("SELECT Discord_ID FROM users WHERE AQW_ID = ?", (ccid,)).fetchone()
+        if owner is not None and owner[0] != int(discord_id):
+            logger.warning(
+                f"Skipping legacy link {discord_id} -> {ccid}: CCID already linked to {owner[0]}"
+            )
+            continue
+        conn.execute(
+            """INSERT INTO users (Discord_ID, AQW_ID, AQW_Username) VALUES (?, ?, ?)
+               ON CONFLICT (Discord_ID) DO UPDATE SET
+                   AQW_ID = excluded.AQW_ID,
+                   AQW_Username = excluded.AQW_Username""",
+            (int(discord_id), ccid, link.get("nickname") or "AQW_Username")
+        )
+
+    bank = _load_json(config.BANK_FILE) or {}
+    for discord_id, account in bank.items():
+        conn.execute(
+            "INSERT INTO economy_accounts (Discord_ID, Wallet, Bank) VALUES (?, ?, ?)",
+            (int(discord_id), int(account.get("wallet", 0)), int(account.get("bank", 0)))
+        )
+        conn.executemany(
+            """INSERT INTO economy_bag (Discord_ID, Item, Amount) VALUES (?, ?, ?)
+               ON CONFLICT (Discord_ID, Item) DO UPDATE SET Amount = Amount + excluded.Amount""",
+            [
+                (int(discord_id), entry["item"], int(entry.get("amount", 1)))
+                for entry in account.get("bag", []) if entry.get("item")
+            ]
+        )
+
+    reports = _load_json(config.REPORTS_FILE) or {}
+    conn.executemany(
+        "INSERT INTO warnings (Discord_ID, Warns) VALUES (?, ?)",
+        [(int(discord_id), int(data.get("warns", 0))) for discord_id, data in reports.items()]
+    )
+
+    insignias = _load_json(config.INSIGNIAS_FILE) or {}
+    conn.executemany(
+        "INSERT INTO insignias (Role_ID, Requirements) VALUES (?, ?)",
+        [(int(role_id), json.dumps(requirements)) for role_id, requirements in insignias.items()]
+    )
+
+    now = datetime.now(timezone.utc).isoformat()
+    for raid_file in sorted((_project_path(config.RAID_DATA_DIR) / "raids").glob("*.json")):
+        raid = _load_json(raid_file)
+        if raid:
+            conn.execute(
+                "INSERT INTO raids (Raid_ID, Status, Data, Updated_At) VALUES (?, ?, ?, ?)",
+                (raid_file.stem, raid.get("status", "recruiting"), json.dumps(raid), now)
+            )
+
+
+@migration(6, "economy ledger journal")
+def _create_economy_journal(conn: sqlite3.Connection):
+    # Append-only log of balance changes since the last snapshot into
+    # economy_accounts; replayed at startup by the economy ledger.
+    conn.execute("""
+        CREATE TABLE economy_journal (
+            Seq INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+            Changes TEXT NOT NULL,
+            Created_At TEXT NOT NULL
+        )
+    """)
+
+
+@migration(7, "AQW nickname to CCID index")
+def _create_aqw_characters(conn: sqlite3.Connection):
+    # Nicknames resolved from the CharPage, linked or not, so a nickname is
+    # only looked up on account.aq.com once.
+    conn.execute("""
+        CREATE TABLE aqw_characters (
+            CCID INTEGER NOT NULL PRIMARY KEY,
+            Nickname TEXT NOT NULL COLLATE NOCASE,
+            Resolved_At TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE UNIQUE INDEX idx_aqw_characters_nickname ON aqw_characters (Nickname)")
+    conn.execute(
+        """INSERT OR IGNORE INTO aqw_characters (CCID, Nickname, Resolved_At)
+           SELECT AQW_ID, AQW_Username, ? FROM users
+           WHERE AQW_ID != 0 AND AQW_Username != 'AQW_Username'""",
+        (datetime.now(timezone.utc).isoformat(),)
+    )
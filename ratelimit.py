@@ -0,0 +1,108 @@
+# ratelimit.py
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Lower value is served first
+LANES = {"interactive": 0, "background": 1}
+
+
+class PriorityRateLimiter:
+    """
+    Token bucket shared by several priority lanes.
+
+    Tokens refill at a constant rate up to the burst size. Callers that find
+    the bucket empty queue up, and as tokens become available they are handed
+    out to the highest-priority lane first (FIFO within a lane), so a
+    background sweep never delays an interactive command by more than one
+    token.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            burst (int): Bucket capacity, i.e. how many requests may go out
+                back to back after an idle period.
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._drainer: Optional[asyncio.Task] = None
+        self._metrics = {lane: self._new_metrics() for lane in LANES}
+
+    @staticmethod
+    def _new_metrics() -> Dict[str, Any]:
+        return {"waiting": 0, "max_waiting": 0, "acquired": 0, "total_wait": 0.0, "max_wait": 0.0}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, lane: str = "interactive"):
+        """
+        Waits until a token is available for lane and takes it.
+
+        Args:
+            lane (str): One of LANES.
+        """
+        metrics = self._metrics[lane]
+        started = time.monotonic()
+        self._refill()
+        if not self._queue and self._tokens >= 1:
+            self._tokens -= 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._queue, (LANES[lane], next(self._order), future))
+            metrics["waiting"] += 1
+            metrics["max_waiting"] = max(metrics["max_waiting"], metrics["waiting"])
+            if self._drainer is None or self._drainer.done():
+                self._drainer = asyncio.create_task(self._drain())
+            try:
+                await future
+            finally:
+                metrics["waiting"] -= 1
+
+        waited = time.monotonic() - started
+        metrics["acquired"] += 1
+        metrics["total_wait"] += waited
+        metrics["max_wait"] = max(metrics["max_wait"], waited)
+
+    async def _drain(self):
+        while self._queue:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+            _, _, future = heapq.heappop(self._queue)
+            # Waiters cancelled while queued don't consume a token
+            if not future.done():
+                self._tokens -= 1
+                future.set_result(None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns queue and wait-time metrics per lane.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each lane: waiting (queue depth
+                now), max_waiting, acquired, avg_wait and max_wait in seconds.
+        """
+        return {
+            lane: {
+                "waiting": m["waiting"],
+                "max_waiting": m["max_waiting"],
+                "acquired": m["acquired"],
+                "avg_wait": m["total_wait"] / m["acquired"] if m["acquired"] else 0.0,
+                "max_wait": m["max_wait"],
+            }
+            for lane, m in self._metrics.items()
+        }